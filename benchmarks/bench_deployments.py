@@ -0,0 +1,100 @@
+"""
+Completion latency (p50/p95/p99) and success rate with one pinned deployment vs a DeploymentPool of two:
+deployments with a latency tail (with and without hedging) and a deployment failing half of its requests.
+
+Run: python -m benchmarks.bench_deployments [--requests 200] [--warmup 20]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.stand_in_server import StandInServer
+from task.client import DialClient
+from task.deployments import Deployment, DeploymentPool
+from task.models.message import Message
+from task.models.role import Role
+from task.resilience import Resilience, RetryPolicy
+from task.stats import percentile
+from task.transport import HttpTransport
+
+
+def run(
+        label: str,
+        servers: list[StandInServer],
+        requests: int,
+        warmup: int,
+        pinned: bool,
+        hedge_percentile: float | None = None
+):
+    transport = HttpTransport(resilience=Resilience(RetryPolicy(base_delay=0.05), failure_threshold=10_000))
+    pool = DeploymentPool(
+        [Deployment(server.url, "gpt-4o") for server in servers[:1 if pinned else None]],
+        failure_cooldown=1.0,
+        hedge_percentile=hedge_percentile
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        dial_client = DialClient(
+            endpoint=servers[0].url,
+            deployment_name="gpt-4o",
+            api_key="benchmark",
+            transport=transport,
+            deployment_pool=pool,
+            hedge_requests=hedge_percentile is not None
+        )
+
+    latencies = []
+    # hedging starts once the pool has observed enough latencies
+    for _ in range(warmup):
+        with contextlib.suppress(Exception):
+            dial_client.get_completion([Message(role=Role.USER, content="Hi")], print_request=False)
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        try:
+            dial_client.get_completion([Message(role=Role.USER, content="Hi")], print_request=False)
+            latencies.append(time.perf_counter() - started_at)
+        except Exception:
+            pass
+
+    shares = ", ".join(
+        f"{stats.requests} requests/{stats.hedges} hedges" for stats in pool.stats.values()
+    )
+    print(
+        f"{label:>28}: {len(latencies)}/{requests} ok, "
+        f"p50 {percentile(latencies, 50) * 1000:6.1f} ms, p95 {percentile(latencies, 95) * 1000:6.1f} ms, "
+        f"p99 {percentile(latencies, 99) * 1000:6.1f} ms ({shares})"
+    )
+    dial_client.close()
+    transport.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--slow-rate", type=float, default=0.1)
+    parser.add_argument("--slow-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    tail = dict(tool_rounds=0, latency=args.latency, slow_rate=args.slow_rate, slow_latency=args.slow_latency)
+    print(f"Latency tail: {args.slow_rate:.0%} of requests take +{args.slow_latency * 1000:.0f} ms")
+    for label, pinned, hedge_percentile in [
+        ("pinned deployment", True, None),
+        ("pool of 2", False, None),
+        ("pool of 2, hedging at p75", False, 75),
+    ]:
+        with StandInServer(**tail) as first, StandInServer(**tail) as second:
+            run(label, [first, second], args.requests, args.warmup, pinned, hedge_percentile)
+
+    print("First deployment fails 50% of requests (429/502)")
+    for label, pinned in [("pinned deployment", True), ("pool of 2", False)]:
+        with (
+            StandInServer(tool_rounds=0, latency=args.latency, error_rate=0.5) as failing,
+            StandInServer(tool_rounds=0, latency=args.latency) as healthy,
+        ):
+            run(label, [failing, healthy], args.requests, args.warmup, pinned)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Memory per message of long conversation histories: a plain dataclass Message with tool calls as nested dicts
+(the previous model) vs the slotted Message with ToolCall records, and what keeping the wire encoding adds.
+
+Run: python -m benchmarks.bench_message_memory [--sizes 1000 10000 100000]
+"""
+import argparse
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+
+
+@dataclass
+class PlainMessage:
+    role: Role
+    content: str
+    tool_call_id: str | None = None
+    name: str | None = None
+    tool_calls: list[dict[str, Any]] | None = None
+
+
+def build_history(size: int, message: Callable[..., Any], tool_call: Callable[[str, str], Any]) -> list[Any]:
+    # user question, assistant tool call and tool result, like a tool round of the agent
+    history = [message(role=Role.SYSTEM, content="You are a User Management Agent.")]
+    while len(history) < size:
+        index = len(history)
+        tool_call_id = f"call_{index}"
+        history.append(message(role=Role.USER, content=f"Show me user {index}"))
+        history.append(message(role=Role.AI, content="", tool_calls=[tool_call(tool_call_id, f'{{"id": {index}}}')]))
+        history.append(message(
+            role=Role.TOOL, name="get_user_by_id", tool_call_id=tool_call_id,
+            content=f"id: {index}\nname: John\nsurname: Smith\nemail: john.smith{index}@example.com"
+        ))
+    return history[:size]
+
+
+def plain_tool_call(tool_call_id: str, arguments: str) -> dict[str, Any]:
+    return {"id": tool_call_id, "type": "function", "function": {"name": "get_user_by_id", "arguments": arguments}}
+
+
+def slotted_tool_call(tool_call_id: str, arguments: str) -> ToolCall:
+    return ToolCall(id=tool_call_id, name="get_user_by_id", arguments=arguments)
+
+
+def encode_history(history: list[Message]) -> list[bytes]:
+    return [message.to_json() for message in history]
+
+
+def measure(build: Callable[..., Any], *args: Any) -> tuple[Any, int]:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build(*args)
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        _, plain = measure(build_history, size, PlainMessage, plain_tool_call)
+        slotted_history, slotted = measure(build_history, size, Message, slotted_tool_call)
+        _, encoded = measure(encode_history, slotted_history)
+
+        if any(Message.from_json(message.to_json()) != message for message in slotted_history):
+            raise AssertionError("decoded messages differ from the encoded ones")
+        wire = sum(len(message.to_json()) for message in slotted_history)
+        print(
+            f"{size:7d} messages, bytes per message: plain dataclass {plain / size:6.0f}, "
+            f"slotted {slotted / size:6.0f} ({1 - slotted / plain:.0%} less), "
+            f"+ cached wire encoding {encoded / size:4.0f} (JSON itself {wire / size:4.0f})"
+        )
+        del slotted_history
+
+
+if __name__ == "__main__":
+    main()
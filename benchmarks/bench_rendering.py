@@ -0,0 +1,53 @@
+"""
+Render time and estimated tokens of user lists: the previous string concatenation vs the renderers of
+`task.tools.users.rendering` (fenced blocks, TSV table, compact JSON).
+
+Run: python -m benchmarks.bench_rendering [--users 1000 10000] [--repeat 5]
+"""
+import argparse
+import timeit
+from typing import Any, Callable
+
+from benchmarks.stand_in_server import generate_users
+from task.models.context_window import CHARS_PER_TOKEN
+from task.tools.users.rendering import BlockRenderer, JsonRenderer, TableRenderer
+
+
+def concatenate(users: list[dict[str, Any]]) -> str:
+    """Reproduces the previous `UserClient.__users_to_string`"""
+    users_str = ""
+    for user in users:
+        user_str = "```\n"
+        for key, value in user.items():
+            user_str += f"  {key}: {value}\n"
+        user_str += "```\n"
+        users_str += user_str
+    users_str += "\n"
+    return users_str
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    renderers: list[tuple[str, Callable[[list[dict[str, Any]]], str]]] = [
+        ("concatenation (previous)", concatenate),
+        ("blocks", BlockRenderer().render),
+        ("blocks, flattened", BlockRenderer(flatten=True).render),
+        ("table (TSV)", TableRenderer().render),
+        ("compact JSON", JsonRenderer().render),
+        ("compact JSON, flattened", JsonRenderer(flatten=True).render),
+    ]
+    for count in args.users:
+        users = generate_users(count)
+        print(f"{count} users:")
+        for label, render in renderers:
+            tokens = len(render(users)) // CHARS_PER_TOKEN
+            seconds = min(timeit.repeat(lambda: render(users), number=1, repeat=args.repeat))
+            print(f"  {label:26s} {seconds * 1e3:8.1f} ms, ~{tokens * 1000 // count:5d} tokens per 1000 users")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Conversation success rate and throughput when ai-proxy rate-limits (429 + Retry-After) or fails (502):
+no retries vs the default retry policy of HttpTransport.
+
+Run: python -m benchmarks.bench_resilience [--conversations 50] [--error-rate 0.2]
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.stand_in_server import StandInServer
+from task.client import DialClient
+from task.models.message import Message
+from task.models.role import Role
+from task.resilience import Resilience, RetryPolicy
+from task.tools.users.get_user_by_id_tool import GetUserByIdTool
+from task.tools.users.user_client import UserClient
+from task.transport import HttpTransport
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--tool-rounds", type=int, default=3)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    policies = [
+        ("no retries", Resilience(RetryPolicy(max_attempts=1), failure_threshold=10_000)),
+        ("retry policy", Resilience(RetryPolicy(base_delay=0.05), failure_threshold=10_000)),
+    ]
+    for label, resilience in policies:
+        with StandInServer(tool_rounds=args.tool_rounds, error_rate=args.error_rate) as server:
+            transport = HttpTransport(resilience=resilience)
+            with contextlib.redirect_stdout(io.StringIO()):
+                dial_client = DialClient(
+                    endpoint=server.url,
+                    deployment_name="gpt-4o",
+                    api_key="benchmark",
+                    tools=[GetUserByIdTool(UserClient(endpoint=server.url, transport=transport, cache_size=0))],
+                    transport=transport
+                )
+
+            succeeded = 0
+            started_at = time.perf_counter()
+            for _ in range(args.conversations):
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        dial_client.get_completion([Message(role=Role.USER, content="Hi")], print_request=False)
+                    succeeded += 1
+                except Exception:
+                    pass
+            elapsed = time.perf_counter() - started_at
+
+            print(
+                f"{label:>12}: {succeeded}/{args.conversations} conversations succeeded, "
+                f"{succeeded / elapsed:6.1f} successful conversations/s, {server.errors_injected} injected errors"
+            )
+            dial_client.close()
+            transport.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Request body encoding per round for growing conversations: full re-encoding (as `requests.post(json=...)` does)
+vs incremental RequestEncoder.
+
+Run: python -m benchmarks.bench_serialization [--sizes 50 200 1000] [--rounds 20]
+"""
+import argparse
+import json
+import timeit
+
+from benchmarks.stand_in_server import generate_users
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+from task.serialization import RequestEncoder, orjson
+from task.tools.users.create_user_tool import CreateUserTool
+from task.tools.users.delete_user_tool import DeleteUserTool
+from task.tools.users.get_user_by_id_tool import GetUserByIdTool
+from task.tools.users.search_users_tool import SearchUsersTool
+from task.tools.users.update_user_tool import UpdateUserTool
+from task.tools.users.user_client import UserClient
+
+
+def build_history(size: int) -> list[Message]:
+    users = generate_users(max(size // 3, 1))
+    messages = [Message(role=Role.SYSTEM, content="You are a User Management Agent.")]
+    while len(messages) < size:
+        index = len(messages)
+        user = users[index % len(users)]
+        tool_call_id = f"call_{index}"
+        messages.append(Message(role=Role.USER, content=f"Show me user {user['id']}"))
+        messages.append(Message(role=Role.AI, content="", tool_calls=(
+            ToolCall(id=tool_call_id, name="get_user_by_id", arguments=json.dumps({"id": user["id"]})),
+        )))
+        messages.append(Message(role=Role.TOOL, name="get_user_by_id", tool_call_id=tool_call_id, content=str(user)))
+    return messages[:size]
+
+
+def full_encode(messages: list[Message], tools: list[dict]) -> bytes:
+    # what `requests` does with `json=request_data` every round
+    return json.dumps({"messages": [msg.to_dict() for msg in messages], "tools": tools}).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--rounds", type=int, default=20, help="rounds appended on top of the initial history")
+    args = parser.parse_args()
+
+    user_client = UserClient()
+    tools = [
+        tool.schema for tool in [
+            GetUserByIdTool(user_client), SearchUsersTool(user_client), CreateUserTool(user_client),
+            UpdateUserTool(user_client), DeleteUserTool(user_client),
+        ]
+    ]
+    print(f"orjson backend: {'available' if orjson is not None else 'not installed'}")
+
+    for size in args.sizes:
+        results = {}
+        for label, fast_json in [("incremental", False), ("incremental+orjson", True)]:
+            if fast_json and orjson is None:
+                continue
+            # messages keep their encoding, so every encoder gets a history of its own
+            history = build_history(size + args.rounds * 2)
+            encoder = RequestEncoder(tools, fast_json=fast_json)
+            encoder.encode(history[:size])
+            results[label] = timeit.timeit(
+                lambda: [encoder.encode(history[:size + 2 * i]) for i in range(1, args.rounds + 1)], number=1
+            )
+        results["full re-encode"] = timeit.timeit(
+            lambda: [full_encode(history[:size + 2 * i], tools) for i in range(1, args.rounds + 1)], number=1
+        )
+
+        line = ", ".join(f"{label} {elapsed / args.rounds * 1000:7.3f} ms" for label, elapsed in results.items())
+        print(f"{size:5d} messages, per round: {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Time to first token and time to first tool dispatch: buffered vs streamed completions.
+
+The stand-in server streams every chunk with `--chunk-delay` pause, the model asks for `--tool-calls` tool calls
+in each of `--tool-rounds` rounds.
+
+Run: python -m benchmarks.bench_streaming [--turns 10] [--chunk-delay 0.005]
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+from typing import Any
+
+from benchmarks.stand_in_server import StandInServer
+from task.client import DialClient
+from task.models.message import Message
+from task.models.role import Role
+from task.tools.base import BaseTool
+from task.tools.users.get_user_by_id_tool import GetUserByIdTool
+from task.tools.users.user_client import UserClient
+
+
+class FirstCallRecorder(BaseTool):
+    """Delegates to the wrapped tool and remembers when it was first called"""
+
+    def __init__(self, tool: BaseTool):
+        self.__tool = tool
+        self.first_call_at: float | None = None
+
+    @property
+    def name(self) -> str:
+        return self.__tool.name
+
+    @property
+    def description(self) -> str:
+        return self.__tool.description
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return self.__tool.input_schema
+
+    def execute(self, arguments: dict[str, Any]) -> str:
+        if self.first_call_at is None:
+            self.first_call_at = time.monotonic()
+        return self.__tool.execute(arguments)
+
+
+def run(server: StandInServer, turns: int, stream: bool) -> tuple[list[float], list[float], list[float]]:
+    first_token, first_dispatch, total = [], [], []
+    for _ in range(turns):
+        tool = FirstCallRecorder(GetUserByIdTool(UserClient(endpoint=server.url, cache_size=0)))
+        with contextlib.redirect_stdout(io.StringIO()):
+            dial_client = DialClient(endpoint=server.url, deployment_name="gpt-4o", api_key="benchmark", tools=[tool])
+            messages = [Message(role=Role.USER, content="Hi")]
+            started_at = time.monotonic()
+            dial_client.get_completion(messages, print_request=False, stream=stream)
+        finished_at = time.monotonic()
+
+        if stream:
+            first_token.append(dial_client.last_stream_metrics.time_to_first_token)
+        else:
+            # buffered content is only available once the whole turn is done
+            first_token.append(finished_at - started_at)
+        first_dispatch.append(tool.first_call_at - started_at)
+        total.append(finished_at - started_at)
+        dial_client.close()
+    return first_token, first_dispatch, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--tool-rounds", type=int, default=2)
+    parser.add_argument("--tool-calls", type=int, default=3)
+    parser.add_argument("--chunk-delay", type=float, default=0.005, help="pause between streamed chunks, seconds")
+    args = parser.parse_args()
+
+    with StandInServer(
+            tool_rounds=args.tool_rounds,
+            tool_calls_per_round=args.tool_calls,
+            chunk_delay=args.chunk_delay
+    ) as server:
+        for label, stream in [("buffered", False), ("streamed", True)]:
+            first_token, first_dispatch, total = run(server, args.turns, stream)
+            print(
+                f"{label:>9}: first token {statistics.mean(first_token) * 1000:7.1f} ms, "
+                f"first tool dispatch {statistics.mean(first_dispatch) * 1000:7.1f} ms, "
+                f"turn {statistics.mean(total) * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
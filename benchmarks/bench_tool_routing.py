@@ -0,0 +1,67 @@
+"""
+First-round request size (bytes and estimated prompt tokens) with all tool schemas vs the subset picked by
+KeywordToolRouter, for the queries of test.py, plus routing time per round.
+
+Run: python -m benchmarks.bench_tool_routing
+"""
+import timeit
+
+from task.models.context_window import CHARS_PER_TOKEN
+from task.models.message import Message
+from task.models.role import Role
+from task.prompts import SYSTEM_PROMPT
+from task.serialization import RequestEncoder
+from task.tools.routing import KeywordToolRouter
+from task.tools.users.create_user_tool import CreateUserTool
+from task.tools.users.delete_user_tool import DeleteUserTool
+from task.tools.users.get_user_by_id_tool import GetUserByIdTool
+from task.tools.users.get_users_by_ids_tool import GetUsersByIdsTool
+from task.tools.users.search_users_tool import SearchUsersTool
+from task.tools.users.update_user_tool import UpdateUserTool
+from task.tools.users.user_client import UserClient
+from task.tools.web_search import WebSearchTool
+
+QUERIES = [
+    "Who is Andrej Karpathy? Please search the web for information about him.",
+    "Search for users with the name John",
+    "Add Andrej Karpathy as a new user. Use web search to find information about him. "
+    "His email should be andrej.karpathy@example.com, and include relevant details from your search "
+    "in the about_me field.",
+    "Search for users with the surname Karpathy",
+    "Get the user information for user ID 1",
+    "Update user ID 1's company to 'EPAM Systems'",
+    "Find all male users in the system",
+    "Search for users with surname 'Adams' and provide additional context about any notable person "
+    "with that name using web search",
+]
+
+
+def main():
+    user_client = UserClient()
+    tools = [
+        WebSearchTool(api_key="benchmark", endpoint="http://localhost"), GetUserByIdTool(user_client),
+        GetUsersByIdsTool(user_client), SearchUsersTool(user_client), CreateUserTool(user_client),
+        UpdateUserTool(user_client), DeleteUserTool(user_client),
+    ]
+    encoder = RequestEncoder([tool.schema for tool in tools])
+    router = KeywordToolRouter()
+
+    total_full = total_routed = 0
+    for query in QUERIES:
+        messages = [Message(role=Role.SYSTEM, content=SYSTEM_PROMPT), Message(role=Role.USER, content=query)]
+        selected = [tool.name for tool in router.select(messages, tools)]
+        full = len(encoder.encode(messages))
+        routed = len(encoder.encode(messages, tool_names=selected))
+        routing_time = timeit.timeit(lambda: router.select(messages, tools), number=1000) / 1000
+        total_full += full
+        total_routed += routed
+        print(
+            f"{full:6d} -> {routed:6d} bytes (~{(full - routed) // CHARS_PER_TOKEN:4d} tokens saved, "
+            f"routing {routing_time * 1e6:5.1f} us) {selected} <- {query[:40]!r}"
+        )
+
+    print(f"Total: {total_full} -> {total_routed} bytes ({1 - total_routed / total_full:.0%} smaller requests)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Per-round latency of a multi-round tool conversation: bare `requests` calls vs pooled HttpTransport.
+
+Run: python -m benchmarks.bench_transport [--conversations 20] [--tool-rounds 3] [--latency 0.0] [--tls]
+"""
+import argparse
+import contextlib
+import io
+import statistics
+import time
+from typing import Any
+
+import requests
+
+from benchmarks.stand_in_server import StandInServer, generate_self_signed_cert
+from task.client import DialClient
+from task.models.message import Message
+from task.models.role import Role
+from task.tools.users.get_user_by_id_tool import GetUserByIdTool
+from task.tools.users.user_client import UserClient
+from task.transport import HttpTransport
+
+
+class NoKeepAliveTransport(HttpTransport):
+    """Reproduces the previous behaviour: every call is a bare `requests.<method>` with a fresh connection"""
+
+    def request(self, method: str, url: str, retry: bool | None = None, deadline: float | None = None,
+                **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        kwargs.setdefault("verify", self.verify)
+        return requests.request(method=method, url=url, **kwargs)
+
+
+def run(transport: HttpTransport, server: StandInServer, conversations: int) -> list[float]:
+    user_client = UserClient(endpoint=server.url, transport=transport, cache_size=0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        dial_client = DialClient(
+            endpoint=server.url,
+            deployment_name="gpt-4o",
+            api_key="benchmark",
+            tools=[GetUserByIdTool(user_client)],
+            transport=transport
+        )
+    per_round = []
+    for _ in range(conversations):
+        messages = [Message(role=Role.SYSTEM, content="You are a benchmark."), Message(role=Role.USER, content="Hi")]
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            dial_client.get_completion(messages, print_request=False)
+        # every round is one completion request plus one user service call
+        per_round.append((time.perf_counter() - start) / (server.tool_rounds + 1))
+    return per_round
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--conversations", type=int, default=20)
+    parser.add_argument("--tool-rounds", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial server latency per request, seconds")
+    parser.add_argument("--tls", action="store_true", help="serve over HTTPS with a self-signed certificate")
+    args = parser.parse_args()
+
+    cert_path = generate_self_signed_cert() if args.tls else None
+    for label, transport_cls in [("bare requests", NoKeepAliveTransport), ("pooled transport", HttpTransport)]:
+        server = StandInServer(tool_rounds=args.tool_rounds, latency=args.latency, cert_path=cert_path)
+        with server, transport_cls(verify=cert_path or True) as transport:
+            per_round = run(transport, server, args.conversations)
+            print(
+                f"{label:>16}: mean {statistics.mean(per_round) * 1000:7.2f} ms/round, "
+                f"median {statistics.median(per_round) * 1000:7.2f} ms/round, "
+                f"{server.connections_opened} connections for {server.requests_served} requests"
+            )
+
+
+if __name__ == "__main__":
+    main()
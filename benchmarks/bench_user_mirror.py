@@ -0,0 +1,65 @@
+"""
+search_users latency with concurrent agents: every search sent to the user service vs answered by UserMirror
+(search cache disabled in both, so every call really searches).
+
+Run: python -m benchmarks.bench_user_mirror [--users 1000] [--agents 8] [--searches 50] [--latency 0.0]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stand_in_server import StandInServer
+from task.stats import percentile
+from task.tools.users.mirror import UserMirror
+from task.tools.users.user_client import UserClient, UserSearchCache
+from task.transport import HttpTransport
+
+QUERIES = [
+    {"name": "John"}, {"surname": "Smith"}, {"gender": "female"}, {"email": "example.com"},
+    {"name": "an", "gender": "male"}, {"surname": "kov"}, {"email": "jane.smith1@example.com"},
+]
+
+
+def run(user_client: UserClient, agents: int, searches: int) -> tuple[list[float], float]:
+    def agent(index: int) -> list[float]:
+        latencies = []
+        for i in range(searches):
+            start = time.perf_counter()
+            user_client.search_users(**QUERIES[(index + i) % len(QUERIES)], limit=10)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=agents) as pool:
+        latencies = [latency for result in pool.map(agent, range(agents)) for latency in result]
+    return latencies, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--agents", type=int, default=8)
+    parser.add_argument("--searches", type=int, default=50, help="searches per agent")
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial server latency per request, seconds")
+    args = parser.parse_args()
+
+    with StandInServer(user_count=args.users, latency=args.latency) as server, HttpTransport() as transport:
+        start = time.perf_counter()
+        mirror = UserMirror(server.url, transport=transport, refresh_interval=None).start()
+        print(f"Mirror of {len(mirror)} users loaded in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        for label, client_mirror in [("remote search", None), ("UserMirror", mirror)]:
+            user_client = UserClient(
+                endpoint=server.url, transport=transport, search_cache=UserSearchCache(max_entries=0),
+                mirror=client_mirror
+            )
+            latencies, elapsed = run(user_client, args.agents, args.searches)
+            print(
+                f"{label:14s} p50 {percentile(latencies, 50) * 1e3:8.3f} ms, "
+                f"p99 {percentile(latencies, 99) * 1e3:8.3f} ms, {len(latencies) / elapsed:8.0f} searches/s"
+            )
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
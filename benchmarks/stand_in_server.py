@@ -0,0 +1,314 @@
+"""
+Local stand-in for ai-proxy and the user service, used by benchmarks.
+
+DIAL completions answer with `tool_rounds` rounds of `get_user_by_id` tool calls and then a final message,
+user service endpoints serve a generated in-memory dataset.
+"""
+import json
+import random
+import re
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qsl
+
+_COMPLETIONS_PATH = re.compile(r"^/openai/deployments/(?P<deployment>[^/]+)/chat/completions$")
+_USER_PATH = re.compile(r"^/v1/users/(?P<id>\d+)$")
+
+_NAMES = ["John", "Jane", "Andrej", "Maria", "Oleh", "Anna", "Peter", "Olga", "Ivan", "Sofia"]
+_SURNAMES = ["Smith", "Adams", "Karpathy", "Johnson", "Brown", "Kovalenko", "Miller", "Davis", "Wilson", "Moore"]
+
+
+def generate_users(count: int, seed: int = 42) -> list[dict[str, Any]]:
+    rnd = random.Random(seed)
+    users = []
+    for user_id in range(1, count + 1):
+        name = rnd.choice(_NAMES)
+        surname = rnd.choice(_SURNAMES)
+        users.append({
+            "id": user_id,
+            "name": name,
+            "surname": surname,
+            "email": f"{name.lower()}.{surname.lower()}{user_id}@example.com",
+            "phone": f"+1-555-{rnd.randint(1000, 9999)}",
+            "date_of_birth": f"19{rnd.randint(50, 99)}-0{rnd.randint(1, 9)}-1{rnd.randint(0, 9)}",
+            "address": {
+                "country": "United States",
+                "city": rnd.choice(["Boston", "Denver", "Austin", "Seattle"]),
+                "street": f"{rnd.randint(1, 999)} Main St",
+                "flat_house": f"Apt {rnd.randint(1, 99)}",
+            },
+            "gender": rnd.choice(["male", "female"]),
+            "company": rnd.choice(["EPAM Systems", "Acme", "Globex", "Initech"]),
+            "salary": float(rnd.randint(40, 200) * 1000),
+            "about_me": "Enjoys hiking, reading and open source. " * 3,
+            "credit_card": {
+                "num": f"4111 1111 1111 {rnd.randint(1000, 9999)}",
+                "cvv": f"{rnd.randint(100, 999)}",
+                "exp_date": f"0{rnd.randint(1, 9)}/2{rnd.randint(6, 9)}",
+            },
+            "created_at": "2025-01-01T00:00:00",
+        })
+    return users
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # clients going away mid-response (cancelled requests, deadlines) are expected in benchmarks
+        pass
+
+
+def generate_self_signed_cert() -> str:
+    """Generates a throwaway localhost certificate (key and cert in one PEM file) with the `openssl` CLI"""
+    pem_path = tempfile.NamedTemporaryFile(suffix=".pem", delete=False).name
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-addext", "subjectAltName=IP:127.0.0.1",
+            "-keyout", pem_path, "-out", pem_path,
+        ],
+        check=True,
+        capture_output=True
+    )
+    return pem_path
+
+
+class StandInServer:
+    """Threaded HTTP/1.1 (keep-alive) server running in a background thread"""
+
+    def __init__(
+            self,
+            tool_rounds: int = 3,
+            tool_calls_per_round: int = 1,
+            user_count: int = 100,
+            latency: float = 0.0,
+            chunk_delay: float = 0.0,
+            error_rate: float = 0.0,
+            slow_rate: float = 0.0,
+            slow_latency: float = 0.0,
+            cert_path: str | None = None
+    ):
+        self.tool_rounds = tool_rounds
+        self.tool_calls_per_round = tool_calls_per_round
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        # share of completion requests answered with 429 (with Retry-After) or 502
+        self.error_rate = error_rate
+        self.errors_injected = 0
+        # share of completion requests delayed by extra `slow_latency` seconds (latency tail)
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.__random = random.Random(7)
+        self.users = {user["id"]: user for user in generate_users(user_count)}
+        self.requests_served = 0
+        self.connections_opened = 0
+        self.__lock = threading.Lock()
+        self.__server = _Server(("127.0.0.1", 0), self.__make_handler())
+        self.__scheme = "http"
+        if cert_path:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(cert_path)
+            self.__server.socket = context.wrap_socket(self.__server.socket, server_side=True)
+            self.__scheme = "https"
+        self.__thread = threading.Thread(target=self.__server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.__server.server_address[:2]
+        return f"{self.__scheme}://{host}:{port}"
+
+    def __enter__(self) -> "StandInServer":
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def _count_request(self) -> None:
+        with self.__lock:
+            self.requests_served += 1
+
+    def _inject_error(self) -> int | None:
+        with self.__lock:
+            if self.__random.random() >= self.error_rate:
+                return None
+            self.errors_injected += 1
+            return self.__random.choice([429, 502])
+
+    def _tail_delay(self) -> float:
+        with self.__lock:
+            return self.slow_latency if self.__random.random() < self.slow_rate else 0.0
+
+    def _count_connection(self) -> None:
+        with self.__lock:
+            self.connections_opened += 1
+
+    def completion(self, request_data: dict[str, Any]) -> dict[str, Any]:
+        messages = request_data.get("messages", [])
+        rounds_done = sum(1 for msg in messages if msg.get("role") == "assistant" and msg.get("tool_calls"))
+        if request_data.get("tools") and rounds_done < self.tool_rounds:
+            user_ids = [(rounds_done * self.tool_calls_per_round + i) % len(self.users) + 1
+                        for i in range(self.tool_calls_per_round)]
+            message = {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "id": f"call_{rounds_done}_{user_id}",
+                        "type": "function",
+                        "function": {"name": "get_user_by_id", "arguments": json.dumps({"id": user_id})},
+                    }
+                    for user_id in user_ids
+                ],
+            }
+            finish_reason = "tool_calls"
+        else:
+            message = {"role": "assistant", "content": f"Done after {rounds_done} tool rounds."}
+            finish_reason = "stop"
+        return {
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {"prompt_tokens": 100 * (len(messages) + 1), "completion_tokens": 20, "total_tokens": 100 * (len(messages) + 1) + 20},
+        }
+
+    @staticmethod
+    def completion_chunks(completion: dict[str, Any], include_usage: bool = False) -> list[dict[str, Any]]:
+        """Splits a completion into streaming chunks: content word by word, tool call arguments in pieces"""
+        choice = completion["choices"][0]
+        message = choice["message"]
+        deltas: list[dict[str, Any]] = [{"role": "assistant"}]
+        words = (message.get("content") or "").split()
+        for position, word in enumerate(words):
+            deltas.append({"content": word if position == len(words) - 1 else word + " "})
+        for index, tool_call in enumerate(message.get("tool_calls") or []):
+            function = tool_call["function"]
+            deltas.append({"tool_calls": [{
+                "index": index, "id": tool_call["id"], "type": "function",
+                "function": {"name": function["name"], "arguments": ""},
+            }]})
+            arguments = function["arguments"]
+            for start in range(0, len(arguments), 4):
+                deltas.append({"tool_calls": [{"index": index, "function": {"arguments": arguments[start:start + 4]}}]})
+        chunks = [{"choices": [{"index": 0, "delta": delta, "finish_reason": None}]} for delta in deltas]
+        chunks.append({"choices": [{"index": 0, "delta": {}, "finish_reason": choice["finish_reason"]}]})
+        if include_usage:
+            chunks.append({"choices": [], "usage": completion["usage"]})
+        return chunks
+
+    def search(self, query: dict[str, str]) -> list[dict[str, Any]]:
+        result = []
+        for user in self.users.values():
+            if all(value.lower() in str(user.get(key, "")).lower() for key, value in query.items()):
+                result.append(user)
+        return result
+
+    def __make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                server._count_connection()
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def _read_json(self) -> Any:
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"null")
+
+            def _reply(self, status: int, payload: Any = None, headers: dict[str, str] | None = None) -> None:
+                server._count_request()
+                if server.latency:
+                    time.sleep(server.latency)
+                body = b"" if payload is None else json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _reply_stream(self, chunks: list[dict[str, Any]]) -> None:
+                server._count_request()
+                if server.latency:
+                    time.sleep(server.latency)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event in [json.dumps(chunk) for chunk in chunks] + ["[DONE]"]:
+                    data = f"data: {event}\n\n".encode()
+                    self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                    if server.chunk_delay:
+                        time.sleep(server.chunk_delay)
+                self.wfile.write(b"0\r\n\r\n")
+
+            def do_POST(self) -> None:
+                if _COMPLETIONS_PATH.match(self.path):
+                    request_data = self._read_json()
+                    if status := server._inject_error():
+                        headers = {"Retry-After": "0.05"} if status == 429 else None
+                        self._reply(status, {"error": {"message": "injected failure"}}, headers)
+                        return
+                    if delay := server._tail_delay():
+                        time.sleep(delay)
+                    completion = server.completion(request_data)
+                    if request_data.get("stream"):
+                        include_usage = (request_data.get("stream_options") or {}).get("include_usage", False)
+                        self._reply_stream(server.completion_chunks(completion, include_usage))
+                    else:
+                        # a buffered response takes as long to generate as the streamed one
+                        time.sleep(server.chunk_delay * (len(server.completion_chunks(completion)) + 1))
+                        self._reply(200, completion)
+                elif self.path == "/v1/users":
+                    user = self._read_json()
+                    user["id"] = max(server.users, default=0) + 1
+                    server.users[user["id"]] = user
+                    self._reply(201, user)
+                else:
+                    self._reply(404, {"detail": "Not Found"})
+
+            def do_GET(self) -> None:
+                path, _, query = self.path.partition("?")
+                if path == "/v1/users/search":
+                    self._reply(200, server.search(dict(parse_qsl(query))))
+                elif match := _USER_PATH.match(path):
+                    user = server.users.get(int(match["id"]))
+                    if user:
+                        self._reply(200, user)
+                    else:
+                        self._reply(404, {"detail": "User not found"})
+                elif path == "/health":
+                    self._reply(200, {"status": "ok"})
+                else:
+                    self._reply(404, {"detail": "Not Found"})
+
+            def do_PUT(self) -> None:
+                match = _USER_PATH.match(self.path)
+                if match and int(match["id"]) in server.users:
+                    user = server.users[int(match["id"])]
+                    user.update({key: value for key, value in self._read_json().items() if value is not None})
+                    self._reply(201, user)
+                else:
+                    self._reply(404, {"detail": "User not found"})
+
+            def do_DELETE(self) -> None:
+                match = _USER_PATH.match(self.path)
+                if match and server.users.pop(int(match["id"]), None):
+                    self._reply(204)
+                else:
+                    self._reply(404, {"detail": "User not found"})
+
+        return Handler
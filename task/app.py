@@ -1,20 +1,27 @@
 import os
 
 from task.client import DialClient
+from task.log import configure_logging
+from task.models.context_window import ContextWindow
 from task.models.conversation import Conversation
 from task.models.message import Message
 from task.models.role import Role
 from task.prompts import SYSTEM_PROMPT
-from task.tools.users.create_user_tool import CreateUserTool
-from task.tools.users.delete_user_tool import DeleteUserTool
-from task.tools.users.get_user_by_id_tool import GetUserByIdTool
-from task.tools.users.search_users_tool import SearchUsersTool
-from task.tools.users.update_user_tool import UpdateUserTool
+from task.tools.routing import KeywordToolRouter
+from task.tools.toolset import build_tools
+from task.tools.users.mirror import UserMirror
 from task.tools.users.user_client import UserClient
-from task.tools.web_search import WebSearchTool
+from task.tracing import JsonLinesExporter, Tracer
+from task.transport import HttpTransport
 
 DIAL_ENDPOINT = "https://ai-proxy.lab.epam.com"
 API_KEY = os.getenv('DIAL_API_KEY', 'dial-fxbasxs2h6t7brhnbqs36omhe2y')
+# Set to a file path to append spans of every turn to it (see `python -m task.tracing`)
+TRACE_FILE = os.getenv('DIAL_TRACE_FILE')
+# DEBUG also logs every request and response, WARNING silences tool results
+LOG_LEVEL = os.getenv('DIAL_LOG_LEVEL', 'INFO')
+# Set to 1 to answer user searches from an in-process mirror of the user service
+USER_MIRROR = os.getenv('DIAL_USER_MIRROR') == '1'
 
 def main():
     #TODO:
@@ -27,22 +34,23 @@ def main():
     #    - Call DialClient with conversation history
     #    - Add Assistant message to Conversation and print its content
     
-    # 1. Create UserClient
-    user_client = UserClient()
+    configure_logging(LOG_LEVEL)
+
+    # 1. Create shared HTTP transport and UserClient
+    transport = HttpTransport(host_pool_sizes={DIAL_ENDPOINT: 20})
+    mirror = UserMirror(transport=transport).start() if USER_MIRROR else None
+    user_client = UserClient(transport=transport, mirror=mirror)
     
     # 2. Create DialClient with all tools
     dial_client = DialClient(
         endpoint=DIAL_ENDPOINT,
         deployment_name="gpt-4o",
         api_key=API_KEY,
-        tools=[
-            WebSearchTool(api_key=API_KEY, endpoint=DIAL_ENDPOINT),
-            GetUserByIdTool(user_client),
-            SearchUsersTool(user_client),
-            CreateUserTool(user_client),
-            UpdateUserTool(user_client),
-            DeleteUserTool(user_client)
-        ]
+        tools=build_tools(user_client, mirror, api_key=API_KEY, endpoint=DIAL_ENDPOINT, transport=transport),
+        transport=transport,
+        context_window=ContextWindow(max_tokens=32_000),
+        tracer=Tracer([JsonLinesExporter(TRACE_FILE)] if TRACE_FILE else None),
+        tool_router=KeywordToolRouter()
     )
     
     # 3. Create Conversation and add first System message
@@ -69,16 +77,31 @@ def main():
         conversation.add_message(Message(role=Role.USER, content=user_input))
         
         try:
-            # Call DialClient with conversation history
-            assistant_response = dial_client.get_completion(conversation.get_messages(), print_request=False)
+            # Call DialClient with conversation history, content is printed as it streams
+            print("\n🤖 Assistant: ", end="", flush=True)
+            assistant_response = dial_client.get_completion(
+                conversation.get_messages(),
+                print_request=False,
+                stream=True,
+                on_token=lambda token: print(token, end="", flush=True),
+                trace_attributes={"conversation_id": conversation.id}
+            )
             
-            # Add Assistant message to Conversation and print its content
+            # Add Assistant message to Conversation
             conversation.add_message(assistant_response)
-            print(f"\n🤖 Assistant: {assistant_response.content}")
+            metrics = dial_client.last_stream_metrics
+            timings = []
+            if metrics.time_to_first_token is not None:
+                timings.append(f"first token: {metrics.time_to_first_token:.2f}s")
+            if metrics.time_to_first_tool_dispatch is not None:
+                timings.append(f"first tool dispatch: {metrics.time_to_first_tool_dispatch:.2f}s")
+            print(f"\n⏱️  {', '.join(timings)}" if timings else "")
         
         except Exception as e:
             print(f"\n❌ Error: {str(e)}")
 
+    dial_client.close()
+
 
 if __name__ == "__main__":
     main()
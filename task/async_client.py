@@ -0,0 +1,241 @@
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import Executor
+from typing import Any, Sequence
+
+from task.cache import CompletionCache
+from task.client import TurnBudgetExceeded, group_tool_calls, message_from_choice
+from task.deployments import Deployment, DeploymentPool
+from task.log import Preview
+from task.models.context_window import ContextWindow, estimate_text_tokens
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+from task.resilience import HttpStatusError
+from task.serialization import RequestEncoder
+from task.tools.base import AsyncBaseTool, BaseTool, SyncToolAdapter
+from task.tools.routing import ToolRouter
+from task.tracing import Span, Tracer, annotate, tool_error, usage_attributes
+from task.transport import AsyncHttpTransport
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDialClient:
+    """
+    Asyncio counterpart of DialClient: one event loop can drive many conversations (and their tool calls)
+    concurrently. Blocking `BaseTool`s are wrapped with `SyncToolAdapter` and run in `tool_executor`
+    (the loop's default thread pool if not provided).
+    """
+
+    def __init__(
+            self,
+            endpoint: str,
+            deployment_name: str,
+            api_key: str,
+            tools: list[BaseTool | AsyncBaseTool] | None = None,
+            transport: AsyncHttpTransport | None = None,
+            max_tool_rounds: int = 10,
+            turn_timeout: float | None = 120.0,
+            tool_concurrency_limits: dict[str, int] | None = None,
+            serialize_mutating_tools: bool = True,
+            tool_executor: Executor | None = None,
+            fast_json: bool = True,
+            context_window: ContextWindow | None = None,
+            completion_cache: CompletionCache | None = None,
+            deployment_pool: DeploymentPool | None = None,
+            tracer: Tracer | None = None,
+            tool_router: ToolRouter | None = None,
+            hedge_requests: bool = False
+    ):
+        if not api_key:
+            raise ValueError("API key is required")
+
+        self.__deployment_pool = deployment_pool or DeploymentPool([Deployment(endpoint, deployment_name)])
+        self.__hedge_requests = hedge_requests
+        self.__api_key = api_key
+        self.__owns_transport = transport is None
+        self.__transport = transport or AsyncHttpTransport()
+        self.__max_tool_rounds = max_tool_rounds
+        self.__turn_timeout = turn_timeout
+        self.__tool_semaphores = {
+            name: asyncio.Semaphore(limit) for name, limit in (tool_concurrency_limits or {}).items()
+        }
+        self.__serialize_mutating_tools = serialize_mutating_tools
+        self.__context_window = context_window
+        self.__completion_cache = completion_cache
+        self.__tracer = tracer or Tracer()
+        self.__tool_router = tool_router
+
+        self.__tools_dict: dict[str, AsyncBaseTool] = {}
+        self.__tools: list[dict[str, Any]] = []
+
+        for tool in tools or []:
+            async_tool = tool if isinstance(tool, AsyncBaseTool) else SyncToolAdapter(tool, tool_executor)
+            self.__tools_dict[async_tool.name] = async_tool
+            self.__tools.append(async_tool.schema)
+
+        self.__request_encoder = RequestEncoder(self.__tools, fast_json=fast_json)
+
+    async def get_completion(
+            self,
+            messages: list[Message],
+            use_cache: bool = True,
+            trace_attributes: dict[str, Any] | None = None
+    ) -> Message:
+        """
+        Runs the agent loop for one user turn, see `DialClient.get_completion`.
+
+        Raises `TurnBudgetExceeded` if the model still asks for tools after `max_tool_rounds` rounds or
+        the turn runs longer than `turn_timeout` seconds (in-flight requests and tool calls are cancelled).
+        """
+        # caller attributes must not collide with the client's own
+        attributes = {**(trace_attributes or {}), "stream": False, "tool_rounds": 0}
+        with self.__tracer.span("turn", **attributes) as span:
+            return await self._run_turn(messages, use_cache, span)
+
+    async def _run_turn(self, messages: list[Message], use_cache: bool, span: Span) -> Message:
+        started_at = time.monotonic()
+        tool_rounds = 0
+
+        try:
+            async with asyncio.timeout(self.__turn_timeout):
+                while True:
+                    with self.__tracer.span("llm_round", stream=False, messages=len(messages)):
+                        ai_response, finish_reason = await self._request_completion(messages, use_cache)
+
+                    if finish_reason != "tool_calls":
+                        return ai_response
+
+                    if tool_rounds >= self.__max_tool_rounds:
+                        raise TurnBudgetExceeded(
+                            f"model requested more than {self.__max_tool_rounds} tool rounds",
+                            rounds=tool_rounds,
+                            elapsed=time.monotonic() - started_at
+                        )
+
+                    # the round is added only once complete, so a deadline hit in a tool call leaves no orphan
+                    tool_messages = await self._process_tool_calls(ai_response.tool_calls)
+                    messages.append(ai_response)
+                    messages.extend(tool_messages)
+                    tool_rounds += 1
+                    span.set(tool_rounds=tool_rounds)
+        except TimeoutError as e:
+            raise TurnBudgetExceeded(
+                f"turn exceeded {self.__turn_timeout}s deadline",
+                rounds=tool_rounds,
+                elapsed=time.monotonic() - started_at
+            ) from e
+
+    async def _request_completion(self, messages: list[Message], use_cache: bool = True) -> tuple[Message, str]:
+        headers = {
+            "api-key": self.__api_key,
+            "Content-Type": "application/json"
+        }
+
+        tool_names = self._route_tools(messages)
+        if self.__context_window is not None:
+            tools_block = self.__request_encoder.tools_block(tool_names)
+            messages = self.__context_window.fit(messages, reserved_tokens=estimate_text_tokens(tools_block))
+        with self.__tracer.span("serialization", messages=len(messages)) as serialization_span:
+            body = self.__request_encoder.encode(messages, tool_names=tool_names)
+            serialization_span.set(bytes=len(body), tools=len(self.__tools) if tool_names is None else len(tool_names))
+
+        cache_key = None
+        if self.__completion_cache is not None and use_cache:
+            cache_key = CompletionCache.key(self.__deployment_pool.key, body)
+            cached = self.__completion_cache.get(cache_key)
+            annotate(cached=cached is not None)
+            if cached is not None:
+                annotate(finish_reason=cached["finish_reason"])
+                return message_from_choice(cached), cached["finish_reason"]
+
+        retry = len(self.__deployment_pool) == 1
+
+        async def send(deployment: Deployment) -> tuple[Deployment, dict[str, Any]]:
+            response = await self.__transport.post(url=deployment.url, headers=headers, content=body, retry=retry)
+            if response.status_code != 200:
+                raise HttpStatusError(
+                    f"Error: {response.status_code} {response.text}",
+                    status_code=response.status_code,
+                    body=response.text
+                )
+            return deployment, response.json()
+
+        deployment, data = await self.__deployment_pool.acall(send, hedge=self.__hedge_requests)
+        choice = data["choices"][0]
+        annotate(deployment=deployment.url, finish_reason=choice["finish_reason"], **usage_attributes(data.get("usage")))
+        message = message_from_choice(choice)
+        # rounds requesting mutating tools always go to the model, see DialClient
+        if cache_key is not None and not any(map(self._is_mutating, message.tool_calls or ())):
+            self.__completion_cache.set(
+                cache_key, {"message": choice["message"], "finish_reason": choice["finish_reason"]}
+            )
+        return message, choice["finish_reason"]
+
+    def _route_tools(self, messages: list[Message]) -> list[str] | None:
+        """Names of tools to offer in the next request, None for all of them"""
+        if self.__tool_router is None:
+            return None
+        tools = self.__tool_router.select(messages, list(self.__tools_dict.values()))
+        return None if len(tools) == len(self.__tools_dict) else [tool.name for tool in tools]
+
+    async def _process_tool_calls(self, tool_calls: Sequence[ToolCall]) -> list[Message]:
+        """
+        Executes tool calls stage by stage (see `group_tool_calls`), calls of a stage concurrently, and returns TOOL
+        messages in the original order
+        """
+        tool_messages: list[Message | None] = [None] * len(tool_calls)
+        for stage in group_tool_calls(tool_calls, self._is_mutating if self.__serialize_mutating_tools else None):
+            results = await asyncio.gather(*(self._execute_tool_call(tool_calls[index]) for index in stage))
+            for index, tool_message in zip(stage, results):
+                tool_messages[index] = tool_message
+
+        return tool_messages
+
+    async def _execute_tool_call(self, tool_call: ToolCall) -> Message:
+        tool_call_id = tool_call.id
+        function_name = tool_call.name
+
+        with self.__tracer.span(
+                "tool_call", tool=function_name, tool_call_id=tool_call_id, argument_bytes=len(tool_call.arguments)
+        ) as span:
+            arguments = json.loads(tool_call.arguments)
+            tool_execution_result = await self._call_tool(function_name, arguments)
+            span.set(result_bytes=len(tool_execution_result))
+            span.error = tool_error(tool_execution_result)
+
+        logger.info(
+            "FUNCTION '%s' (%d chars):\n%s", function_name, len(tool_execution_result), Preview(tool_execution_result)
+        )
+
+        return Message(
+            role=Role.TOOL,
+            name=function_name,
+            tool_call_id=tool_call_id,
+            content=tool_execution_result
+        )
+
+    def _is_mutating(self, tool_call: ToolCall) -> bool:
+        tool = self.__tools_dict.get(tool_call.name)
+        return tool is not None and tool.is_mutating
+
+    async def _call_tool(self, function_name: str, arguments: dict[str, Any]) -> str:
+        if function_name in self.__tools_dict:
+            tool = self.__tools_dict[function_name]
+            semaphore = self.__tool_semaphores.get(function_name)
+            if semaphore is None:
+                return await tool.execute(arguments)
+            async with semaphore:
+                return await tool.execute(arguments)
+        else:
+            return f"Unknown function: {function_name}"
+
+    async def aclose(self) -> None:
+        """Closes the tools, the deployment pool and the transport if it was created by this client"""
+        for tool in self.__tools_dict.values():
+            tool.close()
+        self.__deployment_pool.close()
+        if self.__owns_transport:
+            await self.__transport.aclose()
@@ -0,0 +1,228 @@
+"""
+Batch mode: runs conversations from a JSONL file through DialClient concurrently and writes a result line to
+the output JSONL file as soon as each conversation completes.
+
+Input lines are either full conversations {"id": ..., "messages": [{"role": ..., "content": ...}, ...]} or single
+user queries {"id": ..., "query": ...}; `requests.jsonl` records ({"request_id": ..., "body": ...}) are accepted too.
+The system prompt is added to conversations that do not start with a system message.
+
+Run: python -m task.batch input.jsonl output.jsonl [--concurrency 8]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, TextIO
+
+from task.client import DialClient
+from task.log import configure_logging
+from task.models.message import Message
+from task.models.role import Role
+from task.prompts import SYSTEM_PROMPT
+from task.stats import percentile
+from task.tools.routing import KeywordToolRouter
+from task.tools.toolset import build_tools
+from task.tools.users.mirror import UserMirror
+from task.tools.users.user_client import USER_SERVICE_ENDPOINT, UserClient
+from task.tracing import JsonLinesExporter, Tracer
+from task.transport import HttpTransport
+
+DEFAULT_DIAL_ENDPOINT = "https://ai-proxy.lab.epam.com"
+
+
+@dataclass
+class BatchItem:
+    id: str
+    messages: list[Message]
+    # why the input line could not be parsed, such items fail without a request
+    error: str | None = None
+
+
+@dataclass
+class BatchResult:
+    id: str
+    ok: bool
+    # completion requests made, i.e. tool rounds plus the final answer
+    rounds: int
+    latency: float
+    content: str | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        result = {"id": self.id, "ok": self.ok, "rounds": self.rounds, "latency": round(self.latency, 4)}
+        if self.ok:
+            result["content"] = self.content
+        else:
+            result["error"] = self.error
+        return result
+
+
+@dataclass
+class BatchSummary:
+    conversations: int = 0
+    failed: int = 0
+    rounds: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+
+    @property
+    def conversations_per_second(self) -> float:
+        return self.conversations / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def rounds_per_second(self) -> float:
+        return self.rounds / self.elapsed if self.elapsed else 0.0
+
+    def add(self, result: BatchResult) -> None:
+        self.conversations += 1
+        self.failed += not result.ok
+        self.rounds += result.rounds
+        self.latencies.append(result.latency)
+
+    def report(self) -> str:
+        lines = [
+            f"Conversations: {self.conversations} ({self.failed} failed) in {self.elapsed:.2f}s",
+            f"Throughput: {self.conversations_per_second:.2f} conversations/s, {self.rounds_per_second:.2f} rounds/s",
+        ]
+        if self.latencies:
+            lines.append("Latency: " + ", ".join(
+                f"p{pct} {percentile(self.latencies, pct):.2f}s" for pct in (50, 95, 99)
+            ))
+        return "\n".join(lines)
+
+
+def read_batch(lines: Iterable[str], system_prompt: str | None = SYSTEM_PROMPT) -> Iterator[BatchItem]:
+    """
+    Parses input JSONL lines (blank lines are skipped) into batch items; a malformed line becomes an item with
+    an `error`, so it is reported as a failed conversation instead of stopping the batch
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield _parse_item(line, line_number, system_prompt)
+        except Exception as e:
+            yield BatchItem(id=str(line_number), messages=[], error=f"Line {line_number}: invalid input: {e}")
+
+
+def _parse_item(line: str, line_number: int, system_prompt: str | None) -> BatchItem:
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("expected a JSON object")
+    item_id = str(record.get("id") or record.get("request_id") or line_number)
+
+    if "messages" in record:
+        messages = [Message.from_dict(message) for message in record["messages"]]
+    elif query := record.get("query") or record.get("body"):
+        messages = [Message(role=Role.USER, content=query)]
+    else:
+        raise ValueError("expected `messages`, `query` or `body`")
+
+    if system_prompt and (not messages or messages[0].role != Role.SYSTEM):
+        messages.insert(0, Message(role=Role.SYSTEM, content=system_prompt))
+    return BatchItem(id=item_id, messages=messages)
+
+
+def run_item(dial_client: DialClient, item: BatchItem) -> BatchResult:
+    if item.error is not None:
+        return BatchResult(item.id, ok=False, rounds=0, latency=0.0, error=item.error)
+    messages = list(item.messages)
+    started_at = time.perf_counter()
+    try:
+        response = dial_client.get_completion(
+            messages, print_request=False, trace_attributes={"conversation_id": item.id}
+        )
+    except Exception as e:
+        # tool rounds completed before the failure are appended to `messages` as well
+        rounds = sum(1 for message in messages[len(item.messages):] if message.role == Role.AI)
+        return BatchResult(item.id, ok=False, rounds=rounds, latency=time.perf_counter() - started_at, error=str(e))
+
+    rounds = sum(1 for message in messages[len(item.messages):] if message.role == Role.AI) + 1
+    return BatchResult(
+        item.id, ok=True, rounds=rounds, latency=time.perf_counter() - started_at, content=response.content
+    )
+
+
+def run_batch(
+        dial_client: DialClient,
+        items: Iterable[BatchItem],
+        output: TextIO,
+        concurrency: int = 8
+) -> BatchSummary:
+    """
+    Runs conversations with up to `concurrency` of them in flight, result lines are written to `output` in
+    completion order. Items are consumed lazily, so large input files are not loaded into memory.
+    """
+    summary = BatchSummary()
+    lock = threading.Lock()
+    # bounds submitted but not yet completed conversations
+    slots = threading.BoundedSemaphore(concurrency * 2)
+
+    def on_done(future: Future) -> None:
+        # the slot is freed even if the result cannot be written, or the submit loop would wait for it forever
+        try:
+            result = future.result()
+            with lock:
+                summary.add(result)
+                output.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+                output.flush()
+        finally:
+            slots.release()
+
+    started_at = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as executor:
+        for item in items:
+            slots.acquire()
+            executor.submit(run_item, dial_client, item).add_done_callback(on_done)
+    summary.elapsed = time.perf_counter() - started_at
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL file with conversations")
+    parser.add_argument("output", help="JSONL file to write results to")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--endpoint", default=os.getenv("DIAL_ENDPOINT", DEFAULT_DIAL_ENDPOINT))
+    parser.add_argument("--deployment", default="gpt-4o")
+    parser.add_argument("--user-service-endpoint", default=USER_SERVICE_ENDPOINT)
+    parser.add_argument("--trace", help="JSONL file to append spans to (see `python -m task.tracing`)")
+    parser.add_argument("--user-mirror", action="store_true", help="answer user searches from an in-process mirror")
+    parser.add_argument("--log-level", default="WARNING", help="INFO logs every tool call, DEBUG every request")
+    args = parser.parse_args()
+    api_key = os.getenv("DIAL_API_KEY")
+    if not api_key:
+        parser.error("set the DIAL_API_KEY environment variable")
+    configure_logging(args.log_level)
+
+    # every in-flight conversation keeps its own keep-alive connection to ai-proxy
+    transport = HttpTransport(host_pool_sizes={args.endpoint: max(args.concurrency, 10)})
+    mirror = UserMirror(args.user_service_endpoint, transport=transport).start() if args.user_mirror else None
+    user_client = UserClient(endpoint=args.user_service_endpoint, transport=transport, mirror=mirror)
+    tracer = Tracer([JsonLinesExporter(args.trace)] if args.trace else None)
+    dial_client = DialClient(
+        endpoint=args.endpoint,
+        deployment_name=args.deployment,
+        api_key=api_key,
+        tools=build_tools(user_client, mirror, api_key=api_key, endpoint=args.endpoint, transport=transport),
+        transport=transport,
+        tracer=tracer,
+        tool_router=KeywordToolRouter()
+    )
+
+    with open(args.input, encoding="utf-8") as input_file, open(args.output, "w", encoding="utf-8") as output_file:
+        summary = run_batch(dial_client, read_batch(input_file), output_file, concurrency=args.concurrency)
+
+    print(summary.report())
+    if mirror is not None:
+        mirror.close()
+    dial_client.close()
+    tracer.close()
+    transport.close()
+
+
+if __name__ == "__main__":
+    main()
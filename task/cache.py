@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Thread-safe in-memory LRU cache with hit/miss counters. With `ttl` (seconds) entries also expire that long
+    after being set; expired entries count as misses.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None):
+        self.__max_entries = max_entries
+        self.__ttl = ttl
+        # key -> (value, monotonic expiry time or None)
+        self.__entries: OrderedDict[K, tuple[V, float | None]] = OrderedDict()
+        self.__stats = CacheStats()
+        self.__lock = threading.Lock()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.__stats
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        with self.__lock:
+            entry = self.__entries.get(key, _MISSING)
+            if entry is not _MISSING and entry[1] is not None and entry[1] <= time.monotonic():
+                del self.__entries[key]
+                entry = _MISSING
+            if entry is _MISSING:
+                self.__stats.misses += 1
+                return default
+            self.__entries.move_to_end(key)
+            self.__stats.hits += 1
+            return entry[0]
+
+    def set(self, key: K, value: V) -> None:
+        if self.__max_entries <= 0:
+            return
+        expires_at = time.monotonic() + self.__ttl if self.__ttl is not None else None
+        with self.__lock:
+            self.__entries[key] = (value, expires_at)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_entries:
+                self.__entries.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            return entry[0] if entry is not None else None
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+@dataclass
+class CompletionCacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.memory_hits + self.disk_hits + self.misses
+        return (self.memory_hits + self.disk_hits) / total if total else 0.0
+
+
+class CompletionCache:
+    """
+    Cache of completion choices keyed by a hash of the deployment endpoint and the exact request body
+    (messages and tools). In-memory LRU tier in front of an optional on-disk tier (one JSON file per entry),
+    so identical rounds of regression runs are answered without calling the model.
+    """
+
+    def __init__(self, max_entries: int = 1024, directory: str | Path | None = None):
+        self.__memory: LRUCache[str, dict[str, Any]] = LRUCache(max_entries)
+        self.__directory = Path(directory) if directory else None
+        self.__stats = CompletionCacheStats()
+        self.__lock = threading.Lock()
+        if self.__directory:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def stats(self) -> CompletionCacheStats:
+        return self.__stats
+
+    @staticmethod
+    def key(endpoint: str, body: bytes) -> str:
+        return hashlib.sha256(endpoint.encode("utf-8") + b"\0" + body).hexdigest()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        choice = self.__memory.get(key)
+        if choice is not None:
+            self.__count("memory_hits")
+            return choice
+
+        choice = self.__read(key)
+        if choice is not None:
+            self.__memory.set(key, choice)
+            self.__count("disk_hits")
+            return choice
+
+        self.__count("misses")
+        return None
+
+    def set(self, key: str, choice: dict[str, Any]) -> None:
+        self.__memory.set(key, choice)
+        self.__write(key, choice)
+
+    def clear(self) -> None:
+        self.__memory.clear()
+        if self.__directory:
+            for path in self.__directory.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+
+    def __count(self, counter: str) -> None:
+        with self.__lock:
+            setattr(self.__stats, counter, getattr(self.__stats, counter) + 1)
+
+    def __path(self, key: str) -> Path:
+        return self.__directory / key[:2] / f"{key}.json"
+
+    def __read(self, key: str) -> dict[str, Any] | None:
+        if not self.__directory:
+            return None
+        try:
+            with open(self.__path(key), encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def __write(self, key: str, choice: dict[str, Any]) -> None:
+        if not self.__directory:
+            return
+        path = self.__path(key)
+        path.parent.mkdir(exist_ok=True)
+        # write to a temporary file first, so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(choice, file)
+        os.replace(tmp_path, path)
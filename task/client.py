@@ -1,11 +1,68 @@
+import contextvars
 import json
-from typing import Any
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Sequence
 
 import requests
 
-from task.models.message import Message
+from task.cache import CompletionCache
+from task.deployments import Deployment, DeploymentPool
+from task.log import Preview
+from task.models.context_window import ContextWindow, estimate_text_tokens
+from task.models.message import Message, ToolCall
 from task.models.role import Role
+from task.resilience import HttpStatusError
+from task.serialization import RequestEncoder
+from task.streaming import StreamMetrics, ToolCallAssembler, iter_sse_events
 from task.tools.base import BaseTool
+from task.tools.routing import ToolRouter
+from task.tracing import Span, Tracer, annotate, tool_error, usage_attributes
+from task.transport import HttpTransport, get_default_transport
+
+logger = logging.getLogger(__name__)
+
+
+class TurnBudgetExceeded(Exception):
+    """Raised when a user turn runs out of tool rounds or wall-clock time before the model gives a final answer"""
+
+    def __init__(self, message: str, rounds: int, elapsed: float):
+        super().__init__(f"{message} (tool rounds: {rounds}, elapsed: {elapsed:.1f}s)")
+        self.rounds = rounds
+        self.elapsed = elapsed
+
+
+def message_from_choice(choice: dict[str, Any]) -> Message:
+    """Creates assistant Message from a completion `choice`"""
+    message_data = choice["message"]
+    return Message(
+        role=Role.AI,
+        content=message_data.get("content", ""),
+        tool_calls=message_data.get("tool_calls")
+    )
+
+
+def group_tool_calls(
+        tool_calls: Sequence[ToolCall],
+        is_mutating: Callable[[ToolCall], bool] | None = None
+) -> list[list[int]]:
+    """
+    Splits tool calls of one assistant turn into stages of indexes: calls of a stage may run concurrently with each
+    other, stages run one after another. Without `is_mutating` all calls form one stage; otherwise consecutive
+    read-only calls share a stage and every mutating call is a stage of its own, so no call overtakes a write in
+    either direction (a read requested after `update_user` sees the update).
+    """
+    stages: list[list[int]] = []
+    for index, tool_call in enumerate(tool_calls):
+        if is_mutating is not None and is_mutating(tool_call):
+            stages += [[index], []]
+        elif stages:
+            stages[-1].append(index)
+        else:
+            stages.append([index])
+    return [stage for stage in stages if stage]
 
 
 class DialClient:
@@ -15,22 +72,51 @@ class DialClient:
             endpoint: str,
             deployment_name: str,
             api_key: str,
-            tools: list[BaseTool] | None = None
+            tools: list[BaseTool] | None = None,
+            transport: HttpTransport | None = None,
+            max_tool_rounds: int = 10,
+            turn_timeout: float | None = 120.0,
+            max_tool_workers: int = 8,
+            tool_concurrency_limits: dict[str, int] | None = None,
+            serialize_mutating_tools: bool = True,
+            fast_json: bool = True,
+            context_window: ContextWindow | None = None,
+            completion_cache: CompletionCache | None = None,
+            deployment_pool: DeploymentPool | None = None,
+            tracer: Tracer | None = None,
+            tool_router: ToolRouter | None = None,
+            hedge_requests: bool = False
     ):
-        #TODO:
-        # 1. If not api_key then raise error
-        # 2. Add `self.__endpoint` with formatted `endpoint` with model (model=deployment_name):
-        #   - f"{endpoint}/openai/deployments/{deployment_name}/chat/completions"
-        # 3. Add `self.__api_key`
-        # 4. Prepare tools dict where key will be tool name and value will
-        # 5. Prepare tools list with tool schemas
-        # 6. Optional: print endpoint and tools schemas
-        
         if not api_key:
             raise ValueError("API key is required")
         
-        self.__endpoint = f"{endpoint}/openai/deployments/{deployment_name}/chat/completions"
+        # `deployment_pool` (if provided) replaces the single `endpoint`/`deployment_name` deployment
+        self.__deployment_pool = deployment_pool or DeploymentPool([Deployment(endpoint, deployment_name)])
+        # Buffered requests are hedged (duplicated to another deployment, see DeploymentPool) only if enabled
+        self.__hedge_requests = hedge_requests
         self.__api_key = api_key
+        self.__transport = transport or get_default_transport()
+        self.__max_tool_rounds = max_tool_rounds
+        self.__turn_timeout = turn_timeout
+
+        # Tool calls of one assistant turn are executed concurrently, `tool_concurrency_limits` caps
+        # parallel executions of a tool (by name) across all turns handled by this client
+        self.__tool_executor = (
+            ThreadPoolExecutor(max_workers=max_tool_workers, thread_name_prefix="tool")
+            if max_tool_workers > 1 else None
+        )
+        self.__tool_semaphores = {
+            name: threading.BoundedSemaphore(limit) for name, limit in (tool_concurrency_limits or {}).items()
+        }
+        self.__serialize_mutating_tools = serialize_mutating_tools
+        self.__last_stream_metrics: StreamMetrics | None = None
+        # Token budget applied to every request, the caller's history itself is not trimmed
+        self.__context_window = context_window
+        self.__completion_cache = completion_cache
+        # Spans of turns, LLM rounds, serialization and tool calls (discarded if the tracer has no exporters)
+        self.__tracer = tracer or Tracer()
+        # Offers only tools relevant to the current turn in each request (all tools if not set)
+        self.__tool_router = tool_router
         
         # Prepare tools dict where key is tool name and value is the tool instance
         self.__tools_dict: dict[str, BaseTool] = {}
@@ -40,138 +126,424 @@ class DialClient:
             for tool in tools:
                 self.__tools_dict[tool.name] = tool
                 self.__tools.append(tool.schema)
+
+        # Encoded messages are reused between rounds, tool schemas are encoded once
+        self.__request_encoder = RequestEncoder(self.__tools, fast_json=fast_json)
         
-        # Optional: print endpoint and tools schemas
-        print(f"Initialized DialClient with endpoint: {self.__endpoint}")
-        print(f"Available tools: {list(self.__tools_dict.keys())}")
-
-
-    def get_completion(self, messages: list[Message], print_request: bool = True) -> Message:
-        #TODO:
-        # 1. create `headers` dict with:
-        #   - "api-key": self._api_key
-        #   - "Content-Type": "application/json"
-        # 2. create `request_data` dict with:
-        #   - "messages": [msg.to_dict() for msg in messages]
-        #   - "tools": self._tools
-        # 3. Optional: print request (message history)
-        # 4. Make POST request (requests) with:
-        #   - url=self._endpoint
-        #   - headers=headers
-        #   - json=request_data
-        # 5. If response status code is 200:
-        #   - get response as json
-        #   - get "choices" from response json
-        #   - get first choice
-        #   - Optional: print choice
-        #   - Get `message` from `choice` and assign to `message_data` variable
-        #   - Get `content` from `message` and assign to `content` variable
-        #   - Get `tool_calls` from `message` and assign to `tool_calls` variable
-        #   - Create `ai_response` Message (with AI role, `content` and `tool_calls`)
-        #   - If `choice` `finish_reason` is `tool_calls`:
-        #       Yes:
-        #           - append `ai_response` to `messages`
-        #           - call `_process_tool_calls` with `tool_calls` and assign result to `tool_messages` variable
-        #           - add `tool_messages` to `messages` (use `extend` method)
-        #           - make recursive call (return `get_completion` with `messages` and `print_request`)
-        #       No: return `ai_response` (final assistant response)
-        # Otherwise raise exception
-        
+        # Optional: log endpoint and tools schemas
+        logger.info(
+            "Initialized DialClient with endpoints: %s", [d.url for d in self.__deployment_pool.deployments]
+        )
+        logger.info("Available tools: %s", list(self.__tools_dict.keys()))
+
+
+    def get_completion(
+            self,
+            messages: list[Message],
+            print_request: bool = True,
+            stream: bool = False,
+            on_token: Callable[[str], None] | None = None,
+            stream_metrics: StreamMetrics | None = None,
+            use_cache: bool = True,
+            trace_attributes: dict[str, Any] | None = None
+    ) -> Message:
+        """
+        Runs the agent loop for one user turn: requests completions and executes requested tools until the model
+        gives a final answer. Assistant `tool_calls` messages and TOOL results are appended to `messages`.
+
+        With `stream=True` content tokens are passed to `on_token` as they arrive and every read-only tool call is
+        dispatched as soon as its arguments are complete (mutating ones once the response has finished with
+        "tool_calls"). Latency milestones are recorded into `stream_metrics` (a new one if not provided), also
+        available as `last_stream_metrics`.
+
+        If the client has a completion cache, rounds identical to cached ones are answered from it
+        (`use_cache=False` bypasses the cache for this turn); rounds requesting mutating tools are never cached.
+
+        The turn is traced as a "turn" span with `trace_attributes` (e.g. a conversation id) and child spans
+        of LLM rounds, request serialization and tool calls.
+
+        Raises `TurnBudgetExceeded` if the model still asks for tools after `max_tool_rounds` rounds or
+        the turn runs longer than `turn_timeout` seconds.
+        """
+        # caller attributes must not collide with the client's own
+        attributes = {**(trace_attributes or {}), "stream": stream, "tool_rounds": 0}
+        with self.__tracer.span("turn", **attributes) as span:
+            return self._run_turn(messages, print_request, stream, on_token, stream_metrics, use_cache, span)
+
+    def _run_turn(
+            self,
+            messages: list[Message],
+            print_request: bool,
+            stream: bool,
+            on_token: Callable[[str], None] | None,
+            stream_metrics: StreamMetrics | None,
+            use_cache: bool,
+            span: Span
+    ) -> Message:
+        started_at = time.monotonic()
+        deadline = started_at + self.__turn_timeout if self.__turn_timeout else None
+        tool_rounds = 0
+        if stream:
+            stream_metrics = stream_metrics or StreamMetrics(started_at=started_at)
+            self.__last_stream_metrics = stream_metrics
+
+        while True:
+            try:
+                ai_response, finish_reason, tool_messages = self._complete_round(
+                    messages,
+                    print_request,
+                    deadline,
+                    stream,
+                    on_token,
+                    stream_metrics,
+                    dispatch_tools=tool_rounds < self.__max_tool_rounds,
+                    use_cache=use_cache
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                # read timeouts surface as ConnectionError while a streamed body is consumed
+                if deadline is None or time.monotonic() < deadline:
+                    raise
+                raise TurnBudgetExceeded(
+                    f"turn exceeded {self.__turn_timeout}s deadline",
+                    rounds=tool_rounds,
+                    elapsed=time.monotonic() - started_at
+                ) from e
+
+            if finish_reason != "tool_calls":
+                # Final response
+                return ai_response
+
+            if tool_rounds >= self.__max_tool_rounds:
+                raise TurnBudgetExceeded(
+                    f"model requested more than {self.__max_tool_rounds} tool rounds",
+                    rounds=tool_rounds,
+                    elapsed=time.monotonic() - started_at
+                )
+
+            # Tool calls needed
+            messages.append(ai_response)
+            if tool_messages is None:
+                tool_messages = self._process_tool_calls(ai_response.tool_calls)
+            messages.extend(tool_messages)
+            tool_rounds += 1
+            span.set(tool_rounds=tool_rounds)
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TurnBudgetExceeded(
+                    f"turn exceeded {self.__turn_timeout}s deadline",
+                    rounds=tool_rounds,
+                    elapsed=time.monotonic() - started_at
+                )
+
+    def _complete_round(
+            self,
+            messages: list[Message],
+            print_request: bool,
+            deadline: float | None,
+            stream: bool,
+            on_token: Callable[[str], None] | None,
+            stream_metrics: StreamMetrics | None,
+            dispatch_tools: bool,
+            use_cache: bool
+    ) -> tuple[Message, str, list[Message] | None]:
+        """
+        Gets the next assistant message (from the cache or the model) with its `finish_reason` and, for streamed
+        rounds, TOOL messages of tool calls that were already dispatched.
+        """
+        # tools are picked once per round, for the context window, the cache key and the request itself
+        tool_names = self._route_tools(messages)
+        if self.__context_window is not None:
+            tools_block = self.__request_encoder.tools_block(tool_names)
+            messages = self.__context_window.fit(messages, reserved_tokens=estimate_text_tokens(tools_block))
+
+        with self.__tracer.span("llm_round", stream=stream, messages=len(messages)) as span:
+            cache_key = None
+            if self.__completion_cache is not None and use_cache:
+                cache_key = CompletionCache.key(self.__deployment_pool.key, self._encode_request(messages, tool_names))
+                cached = self.__completion_cache.get(cache_key)
+                span.set(cached=cached is not None)
+                if cached is not None:
+                    ai_response = message_from_choice(cached)
+                    if stream and ai_response.content:
+                        stream_metrics.mark_token()
+                        if on_token:
+                            on_token(ai_response.content)
+                    span.set(finish_reason=cached["finish_reason"], tool_calls=len(ai_response.tool_calls or []))
+                    return ai_response, cached["finish_reason"], None
+
+            if stream:
+                ai_response, finish_reason, tool_messages = self._stream_completion(
+                    messages, deadline, on_token, stream_metrics, dispatch_tools, print_request, tool_names
+                )
+            else:
+                ai_response, finish_reason = self._request_completion(messages, print_request, deadline, tool_names)
+                tool_messages = None
+            span.set(finish_reason=finish_reason, tool_calls=len(ai_response.tool_calls or []))
+
+            # a replayed write would repeat its side effect without the model deciding to, so such rounds always
+            # go to the model
+            if cache_key is not None and not any(map(self._is_mutating, ai_response.tool_calls or ())):
+                self.__completion_cache.set(
+                    cache_key, {"message": ai_response.to_dict(), "finish_reason": finish_reason}
+                )
+            return ai_response, finish_reason, tool_messages
+
+    def _request_completion(
+            self,
+            messages: list[Message],
+            print_request: bool,
+            deadline: float | None,
+            tool_names: list[str] | None = None
+    ) -> tuple[Message, str]:
+        """Makes a single completion request and returns the assistant message with its `finish_reason`"""
+        log_level = logging.INFO if print_request else logging.DEBUG
+        logger.log(log_level, "Making request to DIAL API...")
+
+        response = self._post_completion(messages, deadline, tool_names=tool_names)
+        data = response.json()
+        annotate(**usage_attributes(data.get("usage")))
+        choice = data["choices"][0]
+
+        logger.log(log_level, "Response: %s", Preview(choice))
+
+        return message_from_choice(choice), choice["finish_reason"]
+
+    def _stream_completion(
+            self,
+            messages: list[Message],
+            deadline: float | None,
+            on_token: Callable[[str], None] | None,
+            stream_metrics: StreamMetrics,
+            dispatch_tools: bool,
+            print_request: bool = True,
+            tool_names: list[str] | None = None
+    ) -> tuple[Message, str, list[Message] | None]:
+        """
+        Makes a single streaming completion request. Read-only tool calls are dispatched while the rest of the
+        response is still streaming (unless `dispatch_tools` is False); mutating ones only once the response has
+        finished with "tool_calls". TOOL messages are returned in the original order.
+        """
+        log_level = logging.INFO if print_request else logging.DEBUG
+        logger.log(log_level, "Making streaming request to DIAL API...")
+
+        content_parts = []
+        finish_reason = None
+        assembler = ToolCallAssembler()
+        # futures by position of their tool call in the response
+        pending: dict[int, Future] = {}
+        deferred: list[tuple[int, ToolCall]] = []
+
+        def dispatch(tool_call: ToolCall) -> None:
+            if not dispatch_tools:
+                return
+            position = len(pending) + len(deferred)
+            # side effects must not happen for a response that ends up cut short or failing, and with serialized
+            # mutating tools the calls requested after a write must not overtake it
+            if self._is_mutating(tool_call) or (deferred and self.__serialize_mutating_tools):
+                deferred.append((position, tool_call))
+                return
+            stream_metrics.mark_tool_dispatch()
+            pending[position] = self._submit_tool_call(tool_call)
+
+        try:
+            with self._post_completion(messages, deadline, stream=True, tool_names=tool_names) as response:
+                response.encoding = response.encoding or "utf-8"
+                for chunk in iter_sse_events(response.iter_lines(decode_unicode=True)):
+                    # the usage block (if requested) comes in a final chunk without choices
+                    if chunk.get("usage"):
+                        annotate(**usage_attributes(chunk["usage"]))
+                    if not chunk.get("choices"):
+                        continue
+                    choice = chunk["choices"][0]
+                    delta = choice.get("delta") or {}
+
+                    if token := delta.get("content"):
+                        stream_metrics.mark_token()
+                        content_parts.append(token)
+                        if on_token:
+                            on_token(token)
+
+                    for tool_call in assembler.add(delta.get("tool_calls") or []):
+                        dispatch(tool_call)
+
+                    finish_reason = choice.get("finish_reason") or finish_reason
+
+            for tool_call in assembler.finish():
+                dispatch(tool_call)
+        except BaseException:
+            self._discard_tool_calls(list(pending.values()), "streamed response failed")
+            raise
+
+        ai_response = Message(
+            role=Role.AI,
+            content="".join(content_parts),
+            tool_calls=assembler.tool_calls or None
+        )
+        finish_reason = finish_reason or "stop"
+        logger.log(log_level, "Response: %s", Preview(ai_response.to_dict()))
+
+        if finish_reason != "tool_calls":
+            self._discard_tool_calls(list(pending.values()), f"response finished with {finish_reason!r}")
+            return ai_response, finish_reason, None
+
+        if not pending and not deferred:
+            return ai_response, finish_reason, None
+        # deferred calls start once the ones dispatched while streaming (all requested before them) have finished
+        tool_messages = {position: future.result() for position, future in pending.items()}
+        for _ in deferred:
+            stream_metrics.mark_tool_dispatch()
+        deferred_messages = self._process_tool_calls([tool_call for _, tool_call in deferred])
+        tool_messages.update(zip((position for position, _ in deferred), deferred_messages))
+        return ai_response, finish_reason, [tool_messages[position] for position in sorted(tool_messages)]
+
+    @staticmethod
+    def _discard_tool_calls(pending: Sequence[Future], reason: str) -> None:
+        """Drops results of read-only tool calls dispatched for a response that will not be used"""
+        if not pending:
+            return
+        not_started = sum(future.cancel() for future in pending)
+        logger.warning(
+            "Discarding %d read-only tool calls (%d not started): %s", len(pending), not_started, reason
+        )
+
+    def _post_completion(
+            self,
+            messages: list[Message],
+            deadline: float | None,
+            stream: bool = False,
+            tool_names: list[str] | None = None
+    ) -> requests.Response:
+        """
+        Posts the request to a deployment of the pool, offering only `tool_names` (all tools if None); buffered
+        requests are hedged if the client was created with `hedge_requests`.
+        """
         headers = {
             "api-key": self.__api_key,
             "Content-Type": "application/json"
         }
-        
-        request_data = {
-            "messages": [msg.to_dict() for msg in messages],
-            "tools": self.__tools
-        }
-        
-        if print_request:
-            print(f"\n{'='*50}")
-            print("Making request to DIAL API...")
-            print(f"{'='*50}")
-        
-        response = requests.post(url=self.__endpoint, headers=headers, json=request_data)
-        
-        if response.status_code == 200:
-            response_json = response.json()
-            choices = response_json["choices"]
-            choice = choices[0]
-            
-            if print_request:
-                print(f"Response: {choice}")
-            
-            message_data = choice["message"]
-            content = message_data.get("content", "")
-            tool_calls = message_data.get("tool_calls")
-            
-            ai_response = Message(
-                role=Role.AI,
-                content=content,
-                tool_calls=tool_calls
+
+        body = self._encode_request(messages, tool_names, stream=stream)
+        # with several deployments a failing one is left for the next instead of being retried
+        retry = len(self.__deployment_pool) == 1
+
+        def send(deployment: Deployment) -> tuple[Deployment, requests.Response]:
+            connect_timeout, read_timeout = self.__transport.timeout
+            if deadline is not None:
+                read_timeout = max(min(read_timeout, deadline - time.monotonic()), 0.001)
+
+            response = self.__transport.post(
+                url=deployment.url,
+                headers=headers,
+                data=body,
+                timeout=(connect_timeout, read_timeout),
+                stream=stream,
+                retry=retry,
+                deadline=deadline
             )
-            
-            if choice["finish_reason"] == "tool_calls":
-                # Tool calls needed
-                messages.append(ai_response)
-                tool_messages = self._process_tool_calls(tool_calls)
-                messages.extend(tool_messages)
-                return self.get_completion(messages, print_request)
-            else:
-                # Final response
-                return ai_response
-        else:
-            raise Exception(f"Error: {response.status_code} {response.text}")
-
-
-    def _process_tool_calls(self, tool_calls: list[dict[str, Any]]) -> list[Message]:
-        """Process tool calls and add results to messages."""
-        tool_messages = []
-        for tool_call in tool_calls:
-            #TODO:
-            # 1. Get `id` from `tool_call` and assign to `tool_call_id` variable
-            # 2. Get `function` from `tool_call` and assign to `function` variable
-            # 3. Get `name` from `function` and assign to `function_name` variable
-            # 4. Get `arguments` from `function` as json (json.loads) and assign to `arguments` variable
-            # 5. Call `_call_tool` with `function_name` and `arguments`, and assign to `tool_execution_result` variable
-            # 6. Append to `tool_messages` Message with:
-            #       - role=Role.TOOL
-            #       - name=function_name
-            #       - tool_call_id=tool_call_id
-            #       - content=tool_execution_result
-            # 7. print(f"FUNCTION '{function_name}'\n{tool_execution_result}\n{'-'*50}")
-            # 8. Return `tool_messages`
-            # -----
-            # FYI: It is important to provide `tool_call_id` in TOOL Message. By `tool_call_id` LLM make a  relation
-            #      between Assistant message `tool_calls[i][id]` and message in history.
-            #      In case if no Tool message presented in history (no message at all or with different tool_call_id),
-            #      then LLM with answer with Error (that not find tool message with specified id).
-            
-            tool_call_id = tool_call["id"]
-            function = tool_call["function"]
-            function_name = function["name"]
-            arguments = json.loads(function["arguments"])
-            
-            tool_execution_result = self._call_tool(function_name, arguments)
-            
-            tool_messages.append(Message(
-                role=Role.TOOL,
-                name=function_name,
-                tool_call_id=tool_call_id,
-                content=tool_execution_result
-            ))
-            
-            print(f"FUNCTION '{function_name}'\n{tool_execution_result}\n{'-'*50}")
+
+            if response.status_code != 200:
+                raise HttpStatusError(
+                    f"Error: {response.status_code} {response.text}",
+                    status_code=response.status_code,
+                    body=response.text
+                )
+            return deployment, response
+
+        deployment, response = self.__deployment_pool.call(send, hedge=self.__hedge_requests and not stream)
+        annotate(deployment=deployment.url)
+        return response
+
+    def _encode_request(self, messages: list[Message], tool_names: list[str] | None, stream: bool = False) -> bytes:
+        with self.__tracer.span("serialization", messages=len(messages)) as span:
+            body = self.__request_encoder.encode(messages, stream=stream, tool_names=tool_names)
+            span.set(bytes=len(body), tools=len(self.__tools) if tool_names is None else len(tool_names))
+        return body
+
+    def _route_tools(self, messages: list[Message]) -> list[str] | None:
+        """Names of tools to offer in the next request, None for all of them"""
+        if self.__tool_router is None:
+            return None
+        tools = self.__tool_router.select(messages, list(self.__tools_dict.values()))
+        return None if len(tools) == len(self.__tools_dict) else [tool.name for tool in tools]
+
+    def _process_tool_calls(self, tool_calls: Sequence[ToolCall]) -> list[Message]:
+        """
+        Executes tool calls of one assistant turn and returns TOOL messages in the original order.
+
+        Calls of a stage (see `group_tool_calls`) run concurrently, stages one after another: if mutating tools are
+        serialized, each of them waits for the calls requested before it and the calls requested after it wait for
+        it; otherwise all calls run concurrently.
+        """
+        # FYI: It is important to provide `tool_call_id` in TOOL Message. By `tool_call_id` LLM make a  relation
+        #      between Assistant message `tool_calls[i][id]` and message in history.
+        #      In case if no Tool message presented in history (no message at all or with different tool_call_id),
+        #      then LLM with answer with Error (that not find tool message with specified id).
+        if self.__tool_executor is None or len(tool_calls) < 2:
+            return [self._execute_tool_call(tool_call) for tool_call in tool_calls]
+
+        tool_messages: list[Message | None] = [None] * len(tool_calls)
+        for stage in group_tool_calls(tool_calls, self._is_mutating if self.__serialize_mutating_tools else None):
+            futures = [(index, self._submit_tool_call(tool_calls[index])) for index in stage]
+            for index, future in futures:
+                tool_messages[index] = future.result()
 
         return tool_messages
 
+    def _submit_tool_call(self, tool_call: ToolCall) -> Future:
+        # each call runs in a copy of this thread's context, so its tool span keeps the current parent
+        if self.__tool_executor is None:
+            future = Future()
+            future.set_result(self._execute_tool_call(tool_call))
+            return future
+        return self.__tool_executor.submit(contextvars.copy_context().run, self._execute_tool_call, tool_call)
+
+    def _execute_tool_call(self, tool_call: ToolCall) -> Message:
+        tool_call_id = tool_call.id
+        function_name = tool_call.name
+
+        with self.__tracer.span(
+                "tool_call", tool=function_name, tool_call_id=tool_call_id, argument_bytes=len(tool_call.arguments)
+        ) as span:
+            arguments = json.loads(tool_call.arguments)
+            tool_execution_result = self._call_tool(function_name, arguments)
+            span.set(result_bytes=len(tool_execution_result))
+            span.error = tool_error(tool_execution_result)
+
+        logger.info(
+            "FUNCTION '%s' (%d chars):\n%s", function_name, len(tool_execution_result), Preview(tool_execution_result)
+        )
+
+        return Message(
+            role=Role.TOOL,
+            name=function_name,
+            tool_call_id=tool_call_id,
+            content=tool_execution_result
+        )
+
+    def _is_mutating(self, tool_call: ToolCall) -> bool:
+        tool = self.__tools_dict.get(tool_call.name)
+        return tool is not None and tool.is_mutating
+
     def _call_tool(self, function_name: str, arguments: dict[str, Any]) -> str:
-        #TODO:
-        # Get tool from `__tools_dict`, id present then return executed result, otherwise return `f"Unknown function: {function_name}"`
-        
         if function_name in self.__tools_dict:
             tool = self.__tools_dict[function_name]
-            return tool.execute(arguments)
+            semaphore = self.__tool_semaphores.get(function_name)
+            if semaphore is None:
+                return tool.execute(arguments)
+            with semaphore:
+                return tool.execute(arguments)
         else:
             return f"Unknown function: {function_name}"
+
+    @property
+    def last_stream_metrics(self) -> StreamMetrics | None:
+        """Metrics of the most recent streamed turn"""
+        return self.__last_stream_metrics
+
+    def close(self) -> None:
+        """Stops tool worker threads and closes the tools and the deployment pool"""
+        if self.__tool_executor is not None:
+            self.__tool_executor.shutdown(wait=False)
+        for tool in self.__tools_dict.values():
+            tool.close()
+        self.__deployment_pool.close()
@@ -0,0 +1,292 @@
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import Awaitable, Callable, TypeVar
+
+from task.resilience import HttpStatusError
+from task.stats import percentile
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Deployment:
+    """Model deployment behind a DIAL endpoint, `weight` is its relative share of traffic"""
+    endpoint: str
+    name: str
+    weight: float = 1.0
+
+    def __post_init__(self):
+        if self.weight <= 0:
+            raise ValueError(f"Deployment weight must be positive, got {self.weight}")
+
+    @property
+    def url(self) -> str:
+        return f"{self.endpoint}/openai/deployments/{self.name}/chat/completions"
+
+
+@dataclass
+class DeploymentStats:
+    requests: int = 0
+    failures: int = 0
+    # duplicate requests sent to this deployment because another one was slow
+    hedges: int = 0
+    ewma_latency: float | None = None
+    unavailable_until: float = 0.0
+
+
+def is_failover_error(error: Exception) -> bool:
+    """Whether another deployment may succeed where this one failed (a bad request fails everywhere)"""
+    return not isinstance(error, HttpStatusError) or error.retryable
+
+
+class DeploymentPool:
+    """
+    Spreads requests over several deployments. Each request first goes to a deployment picked at random with
+    probability proportional to `weight / EWMA latency`. On a transient failure (connection error, timeout, 429, 5xx,
+    open circuit) the deployment is put aside for `failure_cooldown` seconds and the request fails over to the next
+    best one. Hedging is off unless `hedge_percentile` is set: then a hedged request still running after that
+    percentile of recently observed latencies is duplicated to another deployment and the first successful response
+    wins. Every hedge is one more (billed) LLM call, so enable it only where tail latency matters more than cost.
+    """
+
+    def __init__(
+            self,
+            deployments: list[Deployment],
+            ewma_alpha: float = 0.3,
+            failure_cooldown: float = 10.0,
+            hedge_percentile: float | None = None,
+            hedge_min_samples: int = 20,
+            latency_window: int = 256,
+            max_hedge_workers: int = 8
+    ):
+        if not deployments:
+            raise ValueError("At least one deployment is required")
+
+        self.__deployments = list(deployments)
+        self.__ewma_alpha = ewma_alpha
+        self.__failure_cooldown = failure_cooldown
+        self.__hedge_percentile = hedge_percentile
+        self.__hedge_min_samples = hedge_min_samples
+        self.__max_hedge_workers = max_hedge_workers
+        self.__stats = {deployment: DeploymentStats() for deployment in self.__deployments}
+        self.__latencies: deque[float] = deque(maxlen=latency_window)
+        self.__hedge_executor: ThreadPoolExecutor | None = None
+        self.__random = random.Random()
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__deployments)
+
+    @property
+    def deployments(self) -> list[Deployment]:
+        return list(self.__deployments)
+
+    @property
+    def key(self) -> str:
+        """Stable identity of the pool, e.g. for cache keys"""
+        return "|".join(deployment.url for deployment in self.__deployments)
+
+    @property
+    def stats(self) -> dict[Deployment, DeploymentStats]:
+        with self.__lock:
+            return {deployment: replace(stats) for deployment, stats in self.__stats.items()}
+
+    @property
+    def hedge_delay(self) -> float | None:
+        """Seconds after which a hedged request is duplicated, None until enough latencies are observed"""
+        if self.__hedge_percentile is None or len(self.__deployments) < 2:
+            return None
+        with self.__lock:
+            latencies = list(self.__latencies)
+        if len(latencies) < self.__hedge_min_samples:
+            return None
+        return percentile(latencies, self.__hedge_percentile)
+
+    def candidates(self) -> list[Deployment]:
+        """Deployments in the order to try them: weighted random pick, the rest by score, cooling down ones last"""
+        now = time.monotonic()
+        with self.__lock:
+            known = [stats.ewma_latency for stats in self.__stats.values() if stats.ewma_latency is not None]
+            # deployments without observations yet are scored as average ones, so they get their share of traffic
+            default_latency = sum(known) / len(known) if known else 1.0
+            available = [d for d in self.__deployments if self.__stats[d].unavailable_until <= now]
+            cooling = sorted(
+                (d for d in self.__deployments if self.__stats[d].unavailable_until > now),
+                key=lambda d: self.__stats[d].unavailable_until
+            )
+            scores = {}
+            for deployment in available:
+                latency = self.__stats[deployment].ewma_latency
+                scores[deployment] = deployment.weight / max(default_latency if latency is None else latency, 1e-6)
+
+        if not available:
+            return cooling
+        first = self.__random.choices(available, weights=[scores[d] for d in available])[0]
+        rest = sorted((d for d in available if d != first), key=scores.get, reverse=True)
+        return [first, *rest, *cooling]
+
+    def record_success(self, deployment: Deployment, latency: float) -> None:
+        with self.__lock:
+            stats = self.__stats[deployment]
+            stats.requests += 1
+            stats.unavailable_until = 0.0
+            stats.ewma_latency = latency if stats.ewma_latency is None else (
+                self.__ewma_alpha * latency + (1 - self.__ewma_alpha) * stats.ewma_latency
+            )
+            self.__latencies.append(latency)
+
+    def record_failure(self, deployment: Deployment) -> None:
+        with self.__lock:
+            stats = self.__stats[deployment]
+            stats.requests += 1
+            stats.failures += 1
+            stats.unavailable_until = time.monotonic() + self.__failure_cooldown
+
+    def call(self, send: Callable[[Deployment], T], hedge: bool = False) -> T:
+        """
+        Calls `send(deployment)` with candidate deployments until one succeeds. `send` raises on failure, the last
+        error is re-raised if all deployments fail. Hedging (`hedge=True`, effective only with `hedge_percentile`) runs
+        `send` in worker threads: losing duplicates that have not started yet are cancelled, running ones cannot be
+        interrupted and their results are dropped, so only requests that can be abandoned (e.g. not streamed ones)
+        should be hedged.
+        """
+        candidates = self.candidates()
+        hedge_delay = self.hedge_delay if hedge else None
+        if hedge_delay is not None:
+            return self.__call_hedged(send, candidates, hedge_delay)
+
+        last_error: Exception | None = None
+        for deployment in candidates:
+            try:
+                return self.__timed(send, deployment)
+            except Exception as e:
+                if not is_failover_error(e):
+                    raise
+                last_error = e
+        raise last_error
+
+    async def acall(self, send: Callable[[Deployment], Awaitable[T]], hedge: bool = False) -> T:
+        """Asyncio counterpart of `call`, losing hedged requests are cancelled"""
+        candidates = deque(self.candidates())
+        hedge_delay = self.hedge_delay if hedge else None
+        pending: set[asyncio.Task] = set()
+        last_error: Exception | None = None
+
+        def launch(hedged: bool = False) -> None:
+            deployment = candidates.popleft()
+            if hedged:
+                self.__count_hedge(deployment)
+            pending.add(asyncio.ensure_future(self.__atimed(send, deployment)))
+
+        launch()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, timeout=hedge_delay if candidates else None, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch(hedged=True)
+                    continue
+                for task in done:
+                    pending.discard(task)
+                    try:
+                        return task.result()
+                    except Exception as e:
+                        if not is_failover_error(e):
+                            raise
+                        last_error = e
+                if not pending and candidates:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise last_error
+
+    def close(self) -> None:
+        """Stops hedging worker threads, queued hedges are cancelled (a later hedged call starts new workers)"""
+        with self.__lock:
+            executor, self.__hedge_executor = self.__hedge_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __call_hedged(self, send: Callable[[Deployment], T], candidates: list[Deployment], hedge_delay: float) -> T:
+        with self.__lock:
+            if self.__hedge_executor is None:
+                self.__hedge_executor = ThreadPoolExecutor(
+                    max_workers=self.__max_hedge_workers, thread_name_prefix="hedge"
+                )
+            executor = self.__hedge_executor
+
+        remaining = deque(candidates)
+        pending: set[Future] = set()
+        last_error: Exception | None = None
+        # set by the winning attempt itself, so losers a worker picks up before they are cancelled are not sent
+        settled = threading.Event()
+
+        def attempt(deployment: Deployment) -> T:
+            if settled.is_set():
+                raise CancelledError()
+            result = self.__timed(send, deployment)
+            settled.set()
+            return result
+
+        def launch(hedged: bool = False) -> None:
+            deployment = remaining.popleft()
+            if hedged:
+                self.__count_hedge(deployment)
+            pending.add(executor.submit(attempt, deployment))
+
+        launch()
+        try:
+            while pending:
+                done, _ = wait(pending, timeout=hedge_delay if remaining else None, return_when=FIRST_COMPLETED)
+                if not done:
+                    launch(hedged=True)
+                    continue
+                for future in done:
+                    pending.discard(future)
+                    try:
+                        return future.result()
+                    except Exception as e:
+                        if not is_failover_error(e):
+                            raise
+                        last_error = e
+                if not pending and remaining:
+                    launch()
+        finally:
+            # queued losers never start, running ones are not interrupted and their results are dropped
+            settled.set()
+            for future in pending:
+                future.cancel()
+        raise last_error
+
+    def __count_hedge(self, deployment: Deployment) -> None:
+        with self.__lock:
+            self.__stats[deployment].hedges += 1
+
+    def __timed(self, send: Callable[[Deployment], T], deployment: Deployment) -> T:
+        started_at = time.monotonic()
+        try:
+            result = send(deployment)
+        except Exception as e:
+            if is_failover_error(e):
+                self.record_failure(deployment)
+            raise
+        self.record_success(deployment, time.monotonic() - started_at)
+        return result
+
+    async def __atimed(self, send: Callable[[Deployment], Awaitable[T]], deployment: Deployment) -> T:
+        started_at = time.monotonic()
+        try:
+            result = await send(deployment)
+        except Exception as e:
+            if is_failover_error(e):
+                self.record_failure(deployment)
+            raise
+        self.record_success(deployment, time.monotonic() - started_at)
+        return result
@@ -0,0 +1,66 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any, TextIO
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+# Tool results may be whole rendered user lists, only their beginning is logged
+PREVIEW_CHARS = 500
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class Preview:
+    """Size-capped text of a value for log arguments, built only if the record is actually emitted"""
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = PREVIEW_CHARS):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else repr(self.value)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}... [{len(text) - self.limit} more characters]"
+
+
+def configure_logging(
+        level: int | str = logging.INFO,
+        stream: TextIO | None = None,
+        fmt: str = LOG_FORMAT
+) -> logging.handlers.QueueListener:
+    """
+    Routes records of the `task` loggers through a queue to a background thread that writes them to `stream`
+    (stderr by default), so slow terminals never block the agent loop. Reconfiguring replaces the previous listener;
+    the listener is stopped (flushed) at exit.
+    """
+    global _listener
+    stop_logging()
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(fmt))
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+
+    logger = logging.getLogger("task")
+    logger.handlers[:] = [logging.handlers.QueueHandler(log_queue)]
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+
+    listener.start()
+    _listener = listener
+    return listener
+
+
+def stop_logging():
+    """Flushes queued records and stops the background thread started by `configure_logging`"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
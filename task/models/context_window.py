@@ -0,0 +1,101 @@
+from dataclasses import dataclass, field
+
+from task.cache import LRUCache
+from task.models.message import Message
+from task.models.role import Role
+
+# Rough average for English text and JSON with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+# Role, separators and other per-message framing tokens
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(message: Message) -> int:
+    """Estimates number of prompt tokens the message takes"""
+    chars = len(message.content or "") + len(message.name or "")
+    for tool_call in message.tool_calls or ():
+        chars += len(tool_call.id) + len(tool_call.name) + len(tool_call.arguments)
+    return chars // CHARS_PER_TOKEN + MESSAGE_OVERHEAD_TOKENS
+
+
+def estimate_text_tokens(text: str | bytes | None) -> int:
+    """Estimates number of prompt tokens of other request parts, e.g. the encoded tools block"""
+    return len(text or "") // CHARS_PER_TOKEN
+
+
+@dataclass
+class ContextWindow:
+    """
+    Keeps requests within `max_tokens`: leading system messages and the current turn (from the last user message)
+    are always kept; older TOOL results are condensed to `condensed_tool_result_chars` first, and if that is not
+    enough the oldest turns are dropped as a whole, so assistant `tool_calls` always come with their TOOL messages.
+    Once no older turns are left, TOOL results of the current turn are condensed, oldest first.
+    """
+    max_tokens: int = 64_000
+    condensed_tool_result_chars: int = 400
+    # condensed copies of TOOL messages, reused between rounds so their wire encoding is kept as well
+    _condensed: LRUCache[Message, Message] = field(
+        default_factory=lambda: LRUCache(4096), init=False, repr=False, compare=False
+    )
+
+    def fit(self, messages: list[Message], reserved_tokens: int = 0) -> list[Message]:
+        """
+        Returns messages that fit the budget together with `reserved_tokens` of the rest of the request (e.g. tools),
+        `messages` itself if nothing had to change
+        """
+        total = reserved_tokens + sum(estimate_tokens(message) for message in messages)
+        if total <= self.max_tokens:
+            return messages
+
+        head_size = 0
+        while head_size < len(messages) and messages[head_size].role == Role.SYSTEM:
+            head_size += 1
+        head = messages[:head_size]
+
+        # Turns start with a user message, so assistant `tool_calls` stay together with their TOOL messages
+        turns: list[list[Message]] = []
+        for message in messages[head_size:]:
+            if message.role == Role.USER or not turns:
+                turns.append([message])
+            else:
+                turns[-1].append(message)
+        history, current_turn = turns[:-1], turns[-1:]
+
+        history = [[self._condense(message) for message in turn] for turn in history]
+        total = reserved_tokens + sum(
+            estimate_tokens(message) for message in head + _flatten(history) + _flatten(current_turn)
+        )
+
+        while history and total > self.max_tokens:
+            total -= sum(estimate_tokens(message) for message in history.pop(0))
+
+        # tool rounds of one turn can outgrow the budget on their own
+        current_turn = [list(turn) for turn in current_turn]
+        for turn in current_turn:
+            for index, message in enumerate(turn):
+                if total <= self.max_tokens:
+                    break
+                condensed = self._condense(message)
+                total -= estimate_tokens(message) - estimate_tokens(condensed)
+                turn[index] = condensed
+
+        return head + _flatten(history) + _flatten(current_turn)
+
+    def _condense(self, message: Message) -> Message:
+        if message.role != Role.TOOL or len(message.content) <= self.condensed_tool_result_chars:
+            return message
+        condensed = self._condensed.get(message)
+        if condensed is None:
+            omitted = len(message.content) - self.condensed_tool_result_chars
+            condensed = Message(
+                role=message.role,
+                content=f"{message.content[:self.condensed_tool_result_chars]}\n[... {omitted} more characters omitted]",
+                tool_call_id=message.tool_call_id,
+                name=message.name
+            )
+            self._condensed.set(message, condensed)
+        return condensed
+
+
+def _flatten(turns: list[list[Message]]) -> list[Message]:
+    return [message for turn in turns for message in turn]
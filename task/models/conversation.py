@@ -1,6 +1,7 @@
 import uuid
 from dataclasses import dataclass, field
 
+from task.models.context_window import ContextWindow
 from task.models.message import Message
 
 
@@ -8,10 +9,16 @@ from task.models.message import Message
 class Conversation:
     id: str = field(default_factory=lambda: str(uuid.uuid4()))
     messages: list[Message] = field(default_factory=list)
+    context_window: ContextWindow | None = None
 
     def add_message(self, message: Message) -> None:
         self.messages.append(message)
 
     def get_messages(self) -> list[Message]:
         return self.messages
-    
\ No newline at end of file
+
+    def get_context(self) -> list[Message]:
+        """Provides messages fitted into `context_window` token budget (full history if no window is set)"""
+        if self.context_window is None:
+            return self.messages
+        return self.context_window.fit(self.messages)
@@ -1,16 +1,55 @@
-from dataclasses import dataclass
-from typing import Any
+import json
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Iterable
 
 from task.models.role import Role
+from task.serialization import dumps
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class ToolCall:
+    """Function call requested by the model"""
+    id: str
+    name: str
+    # JSON encoded arguments, as generated by the model
+    arguments: str
+    type: str = "function"
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"id": self.id, "type": self.type, "function": {"name": self.name, "arguments": self.arguments}}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "ToolCall":
+        function = data.get("function") or {}
+        return cls(
+            id=data.get("id") or "",
+            name=sys.intern(function.get("name") or ""),
+            arguments=function.get("arguments") or "",
+            type=data.get("type") or "function"
+        )
+
+
+@dataclass(frozen=True, slots=True)
 class Message:
+    """
+    Immutable chat message. Tool calls may be given as `ToolCall`s or as API dicts and are stored as a tuple of
+    `ToolCall`s; the wire (JSON) encoding is computed once and kept with the message.
+    """
     role: Role
     content: str
     tool_call_id: str | None = None
-    name: str| None = None
-    tool_calls: list[dict[str, Any]] | None = None
+    name: str | None = None
+    tool_calls: tuple[ToolCall, ...] | None = None
+    _wire: bytes | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.role, Role):
+            object.__setattr__(self, "role", Role(self.role))
+        if self.name is not None:
+            object.__setattr__(self, "name", sys.intern(self.name))
+        if self.tool_calls is not None:
+            object.__setattr__(self, "tool_calls", _to_tool_calls(self.tool_calls))
 
     def to_dict(self) -> dict[str, Any]:
         result = {
@@ -22,5 +61,35 @@ class Message:
         if self.name:
             result["name"] = self.name
         if self.tool_calls:
-            result["tool_calls"] = self.tool_calls
+            result["tool_calls"] = [tool_call.to_dict() for tool_call in self.tool_calls]
         return result
+
+    def to_json(self, fast_json: bool = True) -> bytes:
+        """Wire encoding of the message, encoded on first use"""
+        wire = self._wire
+        if wire is None:
+            # orjson returns bytes with ~1 KiB of spare capacity, an exact-size copy is kept instead
+            wire = bytes(memoryview(dumps(self.to_dict(), fast_json)))
+            object.__setattr__(self, "_wire", wire)
+        return wire
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Message":
+        return cls(
+            role=Role(data["role"]),
+            content=data.get("content", ""),
+            tool_call_id=data.get("tool_call_id"),
+            name=data.get("name"),
+            tool_calls=data.get("tool_calls")
+        )
+
+    @classmethod
+    def from_json(cls, raw: bytes | str) -> "Message":
+        return cls.from_dict(json.loads(raw))
+
+
+def _to_tool_calls(tool_calls: Iterable[ToolCall | dict[str, Any]]) -> tuple[ToolCall, ...] | None:
+    result = tuple(
+        tool_call if isinstance(tool_call, ToolCall) else ToolCall.from_dict(tool_call) for tool_call in tool_calls
+    )
+    return result or None
@@ -0,0 +1,155 @@
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+# Rate limiting and transient upstream failures, worth retrying after a pause
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+# Methods retried by default; POST is only retried when the caller says so (e.g. chat completions). DELETE is left
+# out: a retry after a lost response gets 404 for the resource it deleted and reports a failure
+RETRYABLE_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT"})
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+class HttpStatusError(Exception):
+    """Non-success HTTP response, `retryable` tells whether the same request may succeed later"""
+
+    def __init__(self, message: str, status_code: int, body: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code in RETRYABLE_STATUS_CODES
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open"""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"Circuit breaker for {endpoint} is open, retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter, `Retry-After` (when present) takes precedence"""
+    max_attempts: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    respect_retry_after: bool = True
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Pause before the next attempt, `attempt` is the number of attempts made so far"""
+        if retry_after is not None and self.respect_retry_after:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parses `Retry-After` header given either in seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Stops calling an endpoint after `failure_threshold` consecutive failures. After `reset_timeout` seconds a single
+    probe call is let through: success closes the circuit, failure opens it again.
+    """
+
+    def __init__(self, endpoint: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.__endpoint = endpoint
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__failures = 0
+        self.__opened_at: float | None = None
+        self.__probe_in_flight = False
+        self.__lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.__opened_at is not None
+
+    def before_call(self) -> None:
+        """Raises `CircuitOpenError` if the endpoint should not be called now"""
+        with self.__lock:
+            if self.__opened_at is None:
+                return
+            retry_in = self.__opened_at + self.__reset_timeout - time.monotonic()
+            if retry_in > 0 or self.__probe_in_flight:
+                raise CircuitOpenError(self.__endpoint, max(retry_in, 0.0))
+            self.__probe_in_flight = True
+
+    def record_success(self) -> None:
+        with self.__lock:
+            self.__failures = 0
+            self.__opened_at = None
+            self.__probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self.__lock:
+            self.__failures += 1
+            if self.__probe_in_flight or self.__failures >= self.__failure_threshold:
+                self.__opened_at = time.monotonic()
+            self.__probe_in_flight = False
+
+
+class Resilience:
+    """Retry policy plus per-endpoint circuit breakers, shared by all calls made through one transport"""
+
+    def __init__(
+            self,
+            retry_policy: RetryPolicy | None = None,
+            failure_threshold: int = 5,
+            reset_timeout: float = 30.0
+    ):
+        self.__retry_policy = retry_policy or RetryPolicy()
+        self.__failure_threshold = failure_threshold
+        self.__reset_timeout = reset_timeout
+        self.__breakers: dict[str, CircuitBreaker] = {}
+        self.__lock = threading.Lock()
+
+    @staticmethod
+    def endpoint_key(method: str, url: str) -> str:
+        """Endpoint identity for circuit breaking: method, host and path with numeric ids collapsed"""
+        parts = urlsplit(url)
+        return f"{method} {parts.scheme}://{parts.netloc}{_ID_SEGMENT.sub('/{id}', parts.path)}"
+
+    def breaker(self, method: str, url: str) -> CircuitBreaker:
+        key = self.endpoint_key(method, url)
+        with self.__lock:
+            if key not in self.__breakers:
+                self.__breakers[key] = CircuitBreaker(key, self.__failure_threshold, self.__reset_timeout)
+            return self.__breakers[key]
+
+    def should_retry(self, method: str, retry: bool | None) -> bool:
+        return method.upper() in RETRYABLE_METHODS if retry is None else retry
+
+    def retry_delay(self, attempt: int, deadline: float | None, retry_after: float | None = None) -> float | None:
+        """Pause before the next attempt, or None if attempts are exhausted or the pause would cross `deadline`"""
+        if attempt >= self.__retry_policy.max_attempts:
+            return None
+        delay = self.__retry_policy.delay(attempt, retry_after)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            return None
+        return delay
+
+    @staticmethod
+    def is_failure(status_code: int) -> bool:
+        """Whether response counts against the circuit breaker (rate limiting does not, it is handled by backoff)"""
+        return status_code >= 500
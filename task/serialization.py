@@ -0,0 +1,61 @@
+import json
+from typing import TYPE_CHECKING, Any, Sequence
+
+if TYPE_CHECKING:
+    # Message caches its own encoding with `dumps`, so it is only imported for annotations here
+    from task.models.message import Message
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON backend
+    orjson = None
+
+
+def dumps(obj: Any, fast_json: bool = True) -> bytes:
+    """Encodes `obj` to compact UTF-8 JSON, with `orjson` if it is installed and `fast_json` is enabled"""
+    if fast_json and orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class RequestEncoder:
+    """
+    Encodes chat completion request bodies incrementally.
+
+    Messages are immutable and keep their encoded form, so each round only encodes messages that are new since
+    the previous one. Tool schemas are encoded once, tools blocks of tool subsets are assembled from them and cached.
+    """
+
+    def __init__(self, tools: list[dict[str, Any]], fast_json: bool = True):
+        self.__fast_json = fast_json
+        self.__tool_schemas = {tool["function"]["name"]: dumps(tool, fast_json) for tool in tools}
+        self.__tools_block = dumps(tools, fast_json) if tools else None
+        self.__subset_blocks: dict[tuple[str, ...], bytes] = {}
+
+    def encode(self, messages: list["Message"], stream: bool = False, tool_names: Sequence[str] | None = None) -> bytes:
+        """Encodes request body with all tools, or only with `tool_names` if provided"""
+        body = [b'{"messages":[', b",".join(self.encode_message(message) for message in messages), b"]"]
+        tools_block = self.tools_block(tool_names)
+        if tools_block is not None:
+            body += [b',"tools":', tools_block]
+        if stream:
+            # token usage of streamed completions is only reported on request, in a final chunk
+            body.append(b',"stream":true,"stream_options":{"include_usage":true}')
+        body.append(b"}")
+        return b"".join(body)
+
+    def tools_block(self, tool_names: Sequence[str] | None = None) -> bytes | None:
+        """Encoded tools of a request with all tools, or only with `tool_names` if provided (None if there are none)"""
+        return self.__tools_block if tool_names is None else self.__subset_block(tuple(tool_names))
+
+    def encode_message(self, message: "Message") -> bytes:
+        return message.to_json(self.__fast_json)
+
+    def __subset_block(self, tool_names: tuple[str, ...]) -> bytes | None:
+        if not tool_names:
+            return None
+        block = self.__subset_blocks.get(tool_names)
+        if block is None:
+            block = b"[" + b",".join(self.__tool_schemas[name] for name in tool_names) + b"]"
+            self.__subset_blocks[tool_names] = block
+        return block
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class SingleFlightStats:
+    # calls that ran, and calls that waited for an identical in-flight one instead
+    calls: int = 0
+    coalesced: int = 0
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Collapses concurrent calls with the same key onto one execution; every caller gets its result or exception.
+    Keys should include whatever makes a result outdated (e.g. a write generation), so a call never joins one that
+    started before a write it must observe.
+    """
+
+    def __init__(self):
+        self.__in_flight: dict[K, Future] = {}
+        self.__stats = SingleFlightStats()
+        self.__lock = threading.Lock()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self.__stats
+
+    def do(self, key: K, call: Callable[[], V]) -> V:
+        with self.__lock:
+            future = self.__in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.__in_flight[key] = Future()
+                self.__stats.calls += 1
+            else:
+                self.__stats.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self.__lock:
+                del self.__in_flight[key]
+
+
+class AsyncSingleFlight(Generic[K, V]):
+    """
+    Asyncio counterpart of SingleFlight, for calls made from one event loop. The call runs as a task of its own, so
+    a cancelled caller (the first one included) does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.__in_flight: dict[K, asyncio.Future] = {}
+        self.__stats = SingleFlightStats()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return self.__stats
+
+    async def do(self, key: K, call: Callable[[], Awaitable[V]]) -> V:
+        task = self.__in_flight.get(key)
+        if task is None:
+            task = self.__in_flight[key] = asyncio.ensure_future(call())
+            task.add_done_callback(lambda done: self.__finish(key, done))
+            self.__stats.calls += 1
+        else:
+            self.__stats.coalesced += 1
+        return await asyncio.shield(task)
+
+    def __finish(self, key: K, task: asyncio.Future) -> None:
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+        if not task.cancelled():
+            # marks the exception retrieved when every caller was cancelled
+            task.exception()
@@ -0,0 +1,83 @@
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator
+
+from task.models.message import ToolCall
+
+
+@dataclass
+class StreamMetrics:
+    """Latency milestones of one streamed user turn, in seconds since the turn started"""
+    started_at: float = field(default_factory=time.monotonic)
+    time_to_first_token: float | None = None
+    time_to_first_tool_dispatch: float | None = None
+    tokens: int = 0
+    tool_dispatches: int = 0
+
+    def mark_token(self) -> None:
+        self.tokens += 1
+        if self.time_to_first_token is None:
+            self.time_to_first_token = time.monotonic() - self.started_at
+
+    def mark_tool_dispatch(self) -> None:
+        self.tool_dispatches += 1
+        if self.time_to_first_tool_dispatch is None:
+            self.time_to_first_tool_dispatch = time.monotonic() - self.started_at
+
+
+def iter_sse_events(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+    """Parses `data:` lines of a Server-Sent Events completion stream into chunks until `[DONE]`"""
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        yield json.loads(data)
+
+
+class ToolCallAssembler:
+    """
+    Assembles streamed `tool_calls` deltas into complete tool calls.
+
+    Tool calls are streamed one after another, so a call is complete as soon as a delta for the next index
+    arrives (or the stream finishes).
+    """
+
+    def __init__(self):
+        self.__tool_calls: dict[int, dict[str, Any]] = {}
+        self.__open_index: int | None = None
+
+    @property
+    def tool_calls(self) -> list[ToolCall]:
+        return [ToolCall.from_dict(self.__tool_calls[index]) for index in sorted(self.__tool_calls)]
+
+    def add(self, deltas: list[dict[str, Any]]) -> list[ToolCall]:
+        """Applies deltas of one chunk and returns tool calls that became complete"""
+        completed = []
+        for delta in deltas:
+            index = delta.get("index", 0)
+            if self.__open_index is not None and index != self.__open_index:
+                completed.append(ToolCall.from_dict(self.__tool_calls[self.__open_index]))
+            self.__open_index = index
+
+            tool_call = self.__tool_calls.setdefault(
+                index, {"id": "", "type": "function", "function": {"name": "", "arguments": ""}}
+            )
+            if delta.get("id"):
+                tool_call["id"] = delta["id"]
+            if delta.get("type"):
+                tool_call["type"] = delta["type"]
+            function = delta.get("function") or {}
+            tool_call["function"]["name"] += function.get("name") or ""
+            tool_call["function"]["arguments"] += function.get("arguments") or ""
+        return completed
+
+    def finish(self) -> list[ToolCall]:
+        """Completes the last open tool call, returns it (if any)"""
+        if self.__open_index is None:
+            return []
+        completed = [ToolCall.from_dict(self.__tool_calls[self.__open_index])]
+        self.__open_index = None
+        return completed
@@ -1,12 +1,11 @@
+import asyncio
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor
 from typing import Any
 
 
-class BaseTool(ABC):
-
-    @abstractmethod
-    def execute(self, arguments: dict[str, Any]) -> str:
-        pass
+class ToolDefinition(ABC):
+    """Tool metadata shared by sync and async tools"""
 
     @property
     @abstractmethod
@@ -23,6 +22,14 @@ class BaseTool(ABC):
     def input_schema(self) -> dict[str, Any]:
         pass
 
+    @property
+    def is_mutating(self) -> bool:
+        """Whether tool changes external state (other calls of the turn are not reordered around such calls)"""
+        return False
+
+    def close(self) -> None:
+        """Releases resources held by the tool, called when the client owning it is closed"""
+
     @property
     def schema(self) -> dict[str, Any]:
         """Provides tools JSON Schema"""
@@ -33,4 +40,49 @@ class BaseTool(ABC):
                 "description": self.description,
                 "parameters": self.input_schema
             }
-        }
\ No newline at end of file
+        }
+
+
+class BaseTool(ToolDefinition, ABC):
+
+    @abstractmethod
+    def execute(self, arguments: dict[str, Any]) -> str:
+        pass
+
+
+class AsyncBaseTool(ToolDefinition, ABC):
+
+    @abstractmethod
+    async def execute(self, arguments: dict[str, Any]) -> str:
+        pass
+
+
+class SyncToolAdapter(AsyncBaseTool):
+    """Runs blocking `BaseTool` in a thread pool so it can be awaited from the event loop"""
+
+    def __init__(self, tool: BaseTool, executor: Executor | None = None):
+        self.__tool = tool
+        self.__executor = executor
+
+    @property
+    def name(self) -> str:
+        return self.__tool.name
+
+    @property
+    def description(self) -> str:
+        return self.__tool.description
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return self.__tool.input_schema
+
+    @property
+    def is_mutating(self) -> bool:
+        return self.__tool.is_mutating
+
+    def close(self) -> None:
+        self.__tool.close()
+
+    async def execute(self, arguments: dict[str, Any]) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.__executor, self.__tool.execute, arguments)
@@ -0,0 +1,151 @@
+import math
+import re
+import threading
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Sequence, TypeVar
+
+from task.models.message import Message
+from task.models.role import Role
+from task.tools.base import ToolDefinition
+from task.tracing import tool_error
+
+T = TypeVar("T", bound=ToolDefinition)
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+_STOP_WORDS = frozenset({
+    "a", "about", "all", "an", "and", "any", "are", "as", "be", "by", "can", "do", "for", "from", "get", "give",
+    "have", "i", "in", "is", "it", "me", "my", "of", "on", "or", "please", "should", "that", "the", "their", "this",
+    "to", "tool", "use", "want", "what", "when", "which", "who", "with", "you", "your",
+})
+
+# words users (and tool descriptions) use for the same action, mapped to one keyword
+_SYNONYMS = {
+    "add": "create", "new": "create", "register": "create", "insert": "create",
+    "remove": "delete", "drop": "delete", "erase": "delete",
+    "change": "update", "modify": "update", "edit": "update", "set": "update", "rename": "update",
+    "find": "search", "look": "search", "lookup": "search", "list": "search", "filter": "search",
+    "show": "retrieve", "fetch": "retrieve", "display": "retrieve",
+    "internet": "web", "online": "web", "google": "web",
+    "people": "user", "person": "user",
+}
+
+
+def keywords(text: str) -> list[str]:
+    """Lowercased words with plural and -ing suffixes stripped and synonyms merged, stop words removed"""
+    result = []
+    for word in _WORD.findall(text.lower()):
+        if len(word) > 5 and word.endswith("ing"):
+            word = word[:-3]
+        elif len(word) > 4 and word.endswith(("ches", "shes", "sses", "xes")):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        word = _SYNONYMS.get(word, word)
+        if word not in _STOP_WORDS:
+            result.append(word)
+    return result
+
+
+def current_turn(messages: Sequence[Message]) -> tuple[Message | None, list[Message]]:
+    """Last user message and the messages that follow it"""
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].role == Role.USER:
+            return messages[index], list(messages[index + 1:])
+    return None, list(messages)
+
+
+class ToolRouter(ABC):
+    """Picks tools to offer the model in the next round"""
+
+    @abstractmethod
+    def select(self, messages: Sequence[Message], tools: Sequence[T]) -> list[T]:
+        """Returns a subset of `tools` (in their original order) relevant to the conversation"""
+
+
+class KeywordToolRouter(ToolRouter):
+    """
+    Scores tools by keyword overlap (TF-IDF weighted) between the last user message and tool names and descriptions,
+    and offers at most `max_tools` best scoring ones, skipping those scoring below `min_relative_score` of the best.
+    Tools called earlier in the turn and `always_include` ones are kept. Every tool is offered if no tool matches at
+    all, or if the previous round of the turn gave no tool call or a failed one (the model may need a tool that was
+    left out, e.g. search_users before update_user).
+    """
+
+    def __init__(
+            self,
+            max_tools: int = 4,
+            min_relative_score: float = 0.5,
+            always_include: Sequence[str] = (),
+            name_weight: float = 2.0
+    ):
+        self.__max_tools = max_tools
+        self.__min_relative_score = min_relative_score
+        self.__always_include = frozenset(always_include)
+        self.__name_weight = name_weight
+        self.__indexes: dict[tuple[str, ...], tuple[dict[str, Counter], dict[str, float]]] = {}
+        self.__lock = threading.Lock()
+
+    def select(self, messages: Sequence[Message], tools: Sequence[T]) -> list[T]:
+        user_message, turn = current_turn(messages)
+        if user_message is None or len(tools) <= 1 or _previous_round_failed(turn):
+            return list(tools)
+
+        keyword_weights, idf = self.__index(tools)
+        query = set(keywords(user_message.content or ""))
+        scores = {
+            tool.name: sum(keyword_weights[tool.name][word] * idf.get(word, 0.0) for word in query)
+            for tool in tools
+        }
+
+        best_score = max(scores.values())
+        if best_score <= 0:
+            return list(tools)
+        ranked = sorted(
+            (name for name, score in scores.items() if score >= best_score * self.__min_relative_score),
+            key=scores.get,
+            reverse=True
+        )
+
+        selected = set(ranked[:self.__max_tools]) | self.__always_include
+        for message in turn:
+            for tool_call in message.tool_calls or ():
+                selected.add(tool_call.name)
+        return [tool for tool in tools if tool.name in selected]
+
+    def __index(self, tools: Sequence[ToolDefinition]) -> tuple[dict[str, Counter], dict[str, float]]:
+        key = tuple(tool.name for tool in tools)
+        with self.__lock:
+            if key in self.__indexes:
+                return self.__indexes[key]
+
+        keyword_weights: dict[str, Counter] = {}
+        for tool in tools:
+            weights = Counter()
+            for word in set(keywords(tool.name.replace("_", " "))):
+                weights[word] += self.__name_weight
+            for word in set(keywords(tool.description)):
+                weights[word] += 1.0
+            keyword_weights[tool.name] = weights
+
+        document_frequency = Counter(word for weights in keyword_weights.values() for word in weights)
+        # words shared by all tools (e.g. "user") still count a little, rare ones count most
+        idf = {word: math.log(1 + len(tools) / count) for word, count in document_frequency.items()}
+
+        with self.__lock:
+            self.__indexes[key] = (keyword_weights, idf)
+        return keyword_weights, idf
+
+
+def _previous_round_failed(turn: Sequence[Message]) -> bool:
+    """Whether the last assistant message of the turn has no tool calls, or any of its tool calls failed"""
+    for index in range(len(turn) - 1, -1, -1):
+        if turn[index].role == Role.AI:
+            if not turn[index].tool_calls:
+                return True
+            return any(
+                message.role == Role.TOOL and tool_error(message.content or "") is not None
+                for message in turn[index + 1:]
+            )
+    return False
@@ -0,0 +1,36 @@
+from task.tools.base import BaseTool
+from task.tools.users.bulk_create_users_tool import BulkCreateUsersTool
+from task.tools.users.create_user_tool import CreateUserTool
+from task.tools.users.delete_user_tool import DeleteUserTool
+from task.tools.users.fuzzy_search_users_tool import FuzzySearchUsersTool
+from task.tools.users.get_user_by_id_tool import GetUserByIdTool
+from task.tools.users.get_users_by_ids_tool import GetUsersByIdsTool
+from task.tools.users.mirror import UserMirror
+from task.tools.users.rendering import TableRenderer
+from task.tools.users.search_users_tool import SearchUsersTool
+from task.tools.users.update_user_tool import UpdateUserTool
+from task.tools.users.user_client import UserClient
+from task.tools.web_search import WebSearchTool
+from task.transport import HttpTransport
+
+
+def build_tools(
+        user_client: UserClient,
+        mirror: UserMirror | None,
+        api_key: str,
+        endpoint: str,
+        transport: HttpTransport | None = None
+) -> list[BaseTool]:
+    """Tools listed in SYSTEM_PROMPT for the agent entry points, `fuzzy_search_users` only with a `mirror`"""
+    return [
+        WebSearchTool(api_key=api_key, endpoint=endpoint, transport=transport),
+        GetUserByIdTool(user_client),
+        GetUsersByIdsTool(user_client, renderer=TableRenderer()),
+        SearchUsersTool(user_client, renderer=TableRenderer()),
+        # typo-tolerant search needs the local copy of all users
+        *([FuzzySearchUsersTool(user_client, mirror, renderer=TableRenderer())] if mirror is not None else []),
+        CreateUserTool(user_client),
+        BulkCreateUsersTool(user_client),
+        UpdateUserTool(user_client),
+        DeleteUserTool(user_client)
+    ]
@@ -0,0 +1,297 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Coroutine, Optional, Sequence, TypeVar
+
+import httpx
+
+from task.cache import CacheStats, LRUCache
+from task.resilience import HttpStatusError
+from task.singleflight import AsyncSingleFlight, SingleFlightStats
+from task.tools.users.models.user_info import UserCreate, UserUpdate
+from task.tools.users.rendering import BlockRenderer, UserRenderer
+from task.tools.users.user_client import (
+    USER_SERVICE_ENDPOINT, UserSearchCache, render_search_page, user_from_response
+)
+from task.transport import AsyncHttpTransport
+
+if TYPE_CHECKING:
+    from task.tools.users.mirror import UserMirror
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUserClient:
+    """
+    Asyncio counterpart of UserClient with the same methods as coroutines, caching, search paging and rendering.
+    Requests go through a pooled `AsyncHttpTransport`; at most `max_concurrency` of them are in flight per client,
+    each limited to `timeout` seconds (retries included). `sync()` returns a blocking facade for the
+    `BaseUserServiceTool` subclasses.
+
+    Create one client per event loop: the transport and the coalescing of identical reads are bound to it.
+    """
+
+    def __init__(
+            self,
+            endpoint: str = USER_SERVICE_ENDPOINT,
+            transport: AsyncHttpTransport | None = None,
+            max_concurrency: int = 10,
+            timeout: float | None = 10.0,
+            cache_size: int = 1024,
+            cache_ttl: float | None = 30.0,
+            search_cache: UserSearchCache | None = None,
+            renderer: UserRenderer | None = None,
+            mirror: "UserMirror | None" = None
+    ):
+        self.__endpoint = endpoint
+        # an own transport is sized to the concurrency limit and closed with the client
+        self.__owns_transport = transport is None
+        self.__transport = transport or AsyncHttpTransport(pool_maxsize=max_concurrency)
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__timeout = timeout
+        self.__users: LRUCache[int, dict[str, Any]] = LRUCache(cache_size, ttl=cache_ttl)
+        self.__generation = 0
+        self.__search_cache = search_cache or UserSearchCache()
+        self.__renderer = renderer or BlockRenderer()
+        self.__mirror = mirror
+        self.__flights: AsyncSingleFlight[tuple, Any] = AsyncSingleFlight()
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self.__users.stats
+
+    @property
+    def search_cache(self) -> UserSearchCache:
+        return self.__search_cache
+
+    @property
+    def coalescing_stats(self) -> SingleFlightStats:
+        return self.__flights.stats
+
+    @property
+    def renderer(self) -> UserRenderer:
+        return self.__renderer
+
+    def sync(self, loop: asyncio.AbstractEventLoop | None = None) -> "BlockingUserClient":
+        """Blocking facade running calls on `loop` (a private loop thread if None), for use from other threads"""
+        return BlockingUserClient(self, loop)
+
+    async def aclose(self) -> None:
+        if self.__owns_transport:
+            await self.__transport.aclose()
+
+    async def __aenter__(self) -> "AsyncUserClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def __request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        async with self.__semaphore:
+            if self.__timeout is None:
+                return await self.__transport.request(method, url, **kwargs)
+            async with asyncio.timeout(self.__timeout):
+                return await self.__transport.request(
+                    method, url, deadline=time.monotonic() + self.__timeout, **kwargs
+                )
+
+    def __invalidate(self, user_id: int | None = None):
+        self.__generation += 1
+        self.__search_cache.invalidate()
+        if user_id is not None:
+            self.__users.pop(user_id)
+
+    async def get_user(self, user_id: int, renderer: UserRenderer | None = None) -> str:
+        return (renderer or self.__renderer).render_one(await self.get_user_info(user_id))
+
+    async def get_user_info(self, user_id: int) -> dict[str, Any]:
+        user = self.__users.get(user_id)
+        if user is not None:
+            return user
+
+        generation = self.__generation
+        return await self.__flights.do(("get", user_id, generation), lambda: self.__fetch_user(user_id, generation))
+
+    async def __fetch_user(self, user_id: int, generation: int) -> dict[str, Any]:
+        headers = {"Content-Type": "application/json"}
+
+        response = await self.__request("GET", f"{self.__endpoint}/v1/users/{user_id}", headers=headers)
+
+        if response.status_code == 200:
+            data = response.json()
+            if generation == self.__generation:
+                self.__users.set(user_id, data)
+            return data
+
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
+
+    async def search_users(
+            self,
+            name: Optional[str] = None,
+            surname: Optional[str] = None,
+            email: Optional[str] = None,
+            gender: Optional[str] = None,
+            limit: int | None = None,
+            offset: int = 0,
+            fields: Sequence[str] | None = None,
+            renderer: UserRenderer | None = None,
+    ) -> str:
+        params = {
+            key: value for key, value in {"name": name, "surname": surname, "email": email, "gender": gender}.items()
+            if value
+        }
+        users = await self.__search(params)
+        return render_search_page(users, limit, offset, fields, renderer or self.__renderer)
+
+    async def __search(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        if self.__mirror is not None and self.__mirror.is_fresh:
+            return self.__mirror.search(UserSearchCache.normalize(params))
+
+        users = self.__search_cache.get(params)
+        if users is not None:
+            return users
+
+        generation = self.__search_cache.generation
+        return await self.__flights.do(
+            ("search", UserSearchCache.key(params), generation), lambda: self.__fetch_search(params, generation)
+        )
+
+    async def __fetch_search(self, params: dict[str, str], generation: int) -> list[dict[str, Any]]:
+        headers = {"Content-Type": "application/json"}
+
+        response = await self.__request("GET", self.__endpoint + "/v1/users/search", headers=headers, params=params)
+
+        if response.status_code == 200:
+            data = response.json()
+            logger.debug("Get %d users successfully", len(data))
+            self.__search_cache.set(params, data, generation)
+            return data
+
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
+
+    async def add_user(self, user_create_model: UserCreate) -> str:
+        response = await self.__post_user(user_create_model)
+        return f"User successfully added: {response.text}"
+
+    async def create_user(self, user_create_model: UserCreate) -> dict[str, Any]:
+        return user_from_response(await self.__post_user(user_create_model)) or {}
+
+    async def __post_user(self, user_create_model: UserCreate) -> httpx.Response:
+        headers = {"Content-Type": "application/json"}
+
+        response = await self.__request(
+            "POST", f"{self.__endpoint}/v1/users", headers=headers, json=user_create_model.model_dump()
+        )
+
+        if response.status_code == 201:
+            self.__invalidate()
+            user = user_from_response(response)
+            if user is not None:
+                self.__users.set(user["id"], user)
+                if self.__mirror is not None:
+                    self.__mirror.upsert(user)
+            return response
+
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
+
+    async def update_user(self, user_id: int, user_update_model: UserUpdate) -> str:
+        headers = {"Content-Type": "application/json"}
+
+        try:
+            response = await self.__request(
+                "PUT", f"{self.__endpoint}/v1/users/{user_id}", headers=headers, json=user_update_model.model_dump()
+            )
+        finally:
+            # even a failed update may have been applied
+            self.__invalidate(user_id)
+
+        if response.status_code == 201:
+            user = user_from_response(response)
+            if user is not None and self.__mirror is not None:
+                self.__mirror.upsert(user)
+            return f"User successfully updated: {response.text}"
+
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
+
+    async def delete_user(self, user_id: int) -> str:
+        headers = {"Content-Type": "application/json"}
+
+        try:
+            response = await self.__request("DELETE", f"{self.__endpoint}/v1/users/{user_id}", headers=headers)
+        finally:
+            self.__invalidate(user_id)
+
+        if response.status_code == 204:
+            if self.__mirror is not None:
+                self.__mirror.remove(user_id)
+            return "User successfully deleted"
+
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
+
+
+class BlockingUserClient:
+    """
+    UserClient-compatible blocking facade of an AsyncUserClient, so the `BaseUserServiceTool` subclasses can use it.
+    Calls are run on the given event loop (which must not be the caller's thread loop) or on a private loop thread.
+    """
+
+    def __init__(self, client: AsyncUserClient, loop: asyncio.AbstractEventLoop | None = None):
+        self.__client = client
+        self.__thread: threading.Thread | None = None
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            self.__thread = threading.Thread(target=loop.run_forever, name="user-client-loop", daemon=True)
+            self.__thread.start()
+        self.__loop = loop
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self.__client.cache_stats
+
+    @property
+    def search_cache(self) -> UserSearchCache:
+        return self.__client.search_cache
+
+    @property
+    def coalescing_stats(self) -> SingleFlightStats:
+        return self.__client.coalescing_stats
+
+    @property
+    def renderer(self) -> UserRenderer:
+        return self.__client.renderer
+
+    def __run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self.__loop).result()
+
+    def get_user(self, user_id: int, renderer: UserRenderer | None = None) -> str:
+        return self.__run(self.__client.get_user(user_id, renderer))
+
+    def get_user_info(self, user_id: int) -> dict[str, Any]:
+        return self.__run(self.__client.get_user_info(user_id))
+
+    def search_users(self, **kwargs: Any) -> str:
+        return self.__run(self.__client.search_users(**kwargs))
+
+    def add_user(self, user_create_model: UserCreate) -> str:
+        return self.__run(self.__client.add_user(user_create_model))
+
+    def create_user(self, user_create_model: UserCreate) -> dict[str, Any]:
+        return self.__run(self.__client.create_user(user_create_model))
+
+    def update_user(self, user_id: int, user_update_model: UserUpdate) -> str:
+        return self.__run(self.__client.update_user(user_id, user_update_model))
+
+    def delete_user(self, user_id: int) -> str:
+        return self.__run(self.__client.delete_user(user_id))
+
+    def close(self) -> None:
+        """Closes the client, and stops the private loop thread if there is one"""
+        self.__run(self.__client.aclose())
+        if self.__thread is not None:
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join()
+            self.__loop.close()
+            self.__thread = None
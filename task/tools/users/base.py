@@ -1,11 +1,35 @@
+import asyncio
+import inspect
 from abc import ABC
+from typing import Any, Callable
 
-from task.tools.base import BaseTool
+from task.tools.base import AsyncBaseTool, BaseTool
+from task.tools.users.async_user_client import AsyncUserClient
+from task.tools.users.rendering import UserRenderer
 from task.tools.users.user_client import UserClient
 
 
 class BaseUserServiceTool(BaseTool, ABC):
+    """User service tool; tools returning users render them with `renderer` (the client's one if not given)"""
 
-    def __init__(self, user_client: UserClient):
+    def __init__(self, user_client: UserClient, renderer: UserRenderer | None = None):
         super().__init__()
         self._user_client = user_client
+        self._renderer = renderer
+
+
+class AsyncBaseUserServiceTool(AsyncBaseTool, ABC):
+
+    def __init__(self, user_client: UserClient | AsyncUserClient, renderer: UserRenderer | None = None):
+        super().__init__()
+        self._user_client = user_client
+        self._renderer = renderer
+
+    async def _call_user_client(self, method: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+        """
+        Awaits `AsyncUserClient` method, or calls blocking `UserClient` method in a worker thread,
+        e.g. `await self._call_user_client(client.get_user, 1)`
+        """
+        if inspect.iscoroutinefunction(method):
+            return await method(*args, **kwargs)
+        return await asyncio.to_thread(method, *args, **kwargs)
@@ -0,0 +1,62 @@
+from typing import Any
+
+from task.tools.users.base import BaseUserServiceTool
+from task.tools.users.bulk_import import import_users
+from task.tools.users.models.user_info import UserCreate
+from task.tools.users.user_client import UserClient
+
+
+class BulkCreateUsersTool(BaseUserServiceTool):
+    """
+    Bulk counterpart of `add_user`: validates up to `max_records` users, creates the valid ones concurrently (at most
+    `concurrency` requests in flight) and returns one summary line per failed record.
+    """
+
+    def __init__(self, user_client: UserClient, concurrency: int = 8, max_records: int = 100):
+        super().__init__(user_client)
+        self.__concurrency = concurrency
+        self.__max_records = max_records
+
+    @property
+    def name(self) -> str:
+        return "add_users"
+
+    @property
+    def description(self) -> str:
+        return ("Creates several new users in one call. Each user needs name, surname, email and about_me, like in "
+                "add_user. Use this instead of repeated add_user calls when creating more than one user; invalid "
+                "records are reported and the rest are still created.")
+
+    @property
+    def is_mutating(self) -> bool:
+        return True
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        user_schema = UserCreate.model_json_schema()
+        defs = user_schema.pop("$defs", {})
+        return {
+            "type": "object",
+            "properties": {
+                "users": {
+                    "type": "array",
+                    "items": user_schema,
+                    "maxItems": self.__max_records,
+                    "description": "Users to create"
+                }
+            },
+            "required": ["users"],
+            **({"$defs": defs} if defs else {})
+        }
+
+    def execute(self, arguments: dict[str, Any]) -> str:
+        users = arguments.get("users")
+        if not isinstance(users, list) or not users:
+            return "Error while creating users: `users` must be a non-empty list of users"
+        if len(users) > self.__max_records:
+            return f"Error while creating users: at most {self.__max_records} users are allowed per call"
+
+        try:
+            return import_users(self._user_client, users, concurrency=self.__concurrency).report()
+        except Exception as e:
+            return f"Error while creating users: {str(e)}"
@@ -0,0 +1,193 @@
+"""
+Bulk user import: validates `UserCreate` records in one pass, then creates the valid ones concurrently through
+UserClient and reports a per-record summary.
+
+Records come from a CSV file (header row with UserCreate field names, nested fields as `address.city`,
+`credit_card.num`, ...), a JSONL file (one object per line) or a JSON array.
+
+Run: python -m task.tools.users.bulk_import users.csv [--concurrency 8] [--output results.jsonl]
+"""
+import argparse
+import csv
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, TextIO
+
+from pydantic import ValidationError
+
+from task.log import configure_logging
+from task.tools.users.models.user_info import UserCreate
+from task.tools.users.user_client import USER_SERVICE_ENDPOINT, UserClient
+from task.transport import HttpTransport
+
+
+@dataclass
+class ImportResult:
+    # 1-based position of the record in the input
+    record: int
+    ok: bool
+    user_id: int | None = None
+    email: str | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        result = {"record": self.record, "ok": self.ok, "email": self.email}
+        if self.ok:
+            result["id"] = self.user_id
+        else:
+            result["error"] = self.error
+        return result
+
+
+@dataclass
+class InvalidRecord:
+    """Input record that could not be parsed, reported as a failed result by `validate`"""
+    error: str
+
+
+@dataclass
+class ImportSummary:
+    results: list[ImportResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def created(self) -> int:
+        return sum(result.ok for result in self.results)
+
+    @property
+    def users_per_second(self) -> float:
+        return self.created / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        """Compact summary: counts and throughput, created ids by record and one line per failed record"""
+        lines = [
+            f"Created {self.created} of {len(self.results)} users in {self.elapsed:.2f}s "
+            f"({self.users_per_second:.1f} users/s)"
+        ]
+        created = [f"{result.record}:{result.user_id}" for result in self.results if result.ok and result.user_id]
+        if created:
+            lines.append("Created ids (record:id): " + ", ".join(created))
+        unknown = [str(result.record) for result in self.results if result.ok and not result.user_id]
+        if unknown:
+            lines.append("Created, id unknown (records): " + ", ".join(unknown))
+        failed = [result for result in self.results if not result.ok]
+        if failed:
+            lines.append("Failed:")
+            lines += [
+                f"  #{result.record}{f' ({result.email})' if result.email else ''}: {result.error}" for result in failed
+            ]
+        return "\n".join(lines)
+
+
+def validate(records: Iterable[Any]) -> tuple[list[tuple[int, UserCreate]], list[ImportResult]]:
+    """Valid records with their positions, and a failed result for every invalid (or unparseable) one"""
+    valid, invalid = [], []
+    for record_number, record in enumerate(records, start=1):
+        if isinstance(record, InvalidRecord):
+            invalid.append(ImportResult(record_number, ok=False, error=record.error))
+            continue
+        try:
+            valid.append((record_number, UserCreate.model_validate(record)))
+        except ValidationError as e:
+            errors = "; ".join(
+                f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}" for error in e.errors()
+            )
+            email = record.get("email") if isinstance(record, dict) else None
+            invalid.append(ImportResult(record_number, ok=False, email=email, error=f"invalid record: {errors}"))
+    return valid, invalid
+
+
+def import_users(user_client: UserClient, records: Iterable[Any], concurrency: int = 8) -> ImportSummary:
+    """Validates all `records` first, then creates the valid ones with up to `concurrency` requests in flight"""
+    started_at = time.perf_counter()
+    valid, invalid = validate(records)
+
+    def create(item: tuple[int, UserCreate]) -> ImportResult:
+        record_number, user_create = item
+        try:
+            user = user_client.create_user(user_create)
+        except Exception as e:
+            return ImportResult(record_number, ok=False, email=user_create.email, error=str(e))
+        return ImportResult(record_number, ok=True, user_id=user.get("id"), email=user_create.email)
+
+    results = list(invalid)
+    if valid:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(valid)), thread_name_prefix="import") as executor:
+            results += executor.map(create, valid)
+    results.sort(key=lambda result: result.record)
+    return ImportSummary(results=results, elapsed=time.perf_counter() - started_at)
+
+
+def read_records(path: str | Path) -> list[dict[str, Any] | InvalidRecord]:
+    """
+    Records of a CSV, JSON array or JSONL file; unparseable JSONL lines are returned as `InvalidRecord`s, so they are
+    reported with the other invalid records. Raises ValueError if a JSON file does not hold an array.
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.suffix.lower() == ".csv":
+            return [_csv_record(row) for row in csv.DictReader(file)]
+        if path.suffix.lower() == ".json":
+            records = json.load(file)
+            if not isinstance(records, list):
+                raise ValueError(f"{path}: expected a JSON array of user records, got {type(records).__name__}")
+            return records
+        return [_jsonl_record(line, line_number) for line_number, line in enumerate(file, start=1) if line.strip()]
+
+
+def _jsonl_record(line: str, line_number: int) -> dict[str, Any] | InvalidRecord:
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return InvalidRecord(f"line {line_number}: invalid JSON: {e}")
+
+
+def _csv_record(row: dict[str, str]) -> dict[str, Any]:
+    # empty cells are missing values, `a.b` columns become nested objects
+    record: dict[str, Any] = {}
+    for column, value in row.items():
+        if column is None or value is None or not value.strip():
+            continue
+        *parents, key = column.strip().split(".")
+        target = record
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[key] = value.strip()
+    return record
+
+
+def write_results(summary: ImportSummary, output: TextIO) -> None:
+    for result in summary.results:
+        output.write(json.dumps(result.to_dict(), ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV, JSONL or JSON file with user records")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--user-service-endpoint", default=USER_SERVICE_ENDPOINT)
+    parser.add_argument("--output", help="JSONL file to write a result line per record to")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+    configure_logging(args.log_level)
+
+    try:
+        records = read_records(args.input)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    with HttpTransport(host_pool_sizes={args.user_service_endpoint: args.concurrency}) as transport:
+        user_client = UserClient(endpoint=args.user_service_endpoint, transport=transport)
+        summary = import_users(user_client, records, concurrency=args.concurrency)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            write_results(summary, output)
+    print(summary.report())
+
+
+if __name__ == "__main__":
+    main()
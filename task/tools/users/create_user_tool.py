@@ -16,6 +16,10 @@ class CreateUserTool(BaseUserServiceTool):
         #TODO: Provide description of this tool
         return "Creates a new user in the system. Required fields are name, surname, email, and about_me. Optional fields include phone, date_of_birth, address, gender, company, salary, and credit_card."
 
+    @property
+    def is_mutating(self) -> bool:
+        return True
+
     @property
     def input_schema(self) -> dict[str, Any]:
         #TODO: Provide tool params Schema. To do that you can create json schema from UserCreate pydentic model ` UserCreate.model_json_schema()`
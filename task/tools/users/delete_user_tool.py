@@ -15,6 +15,10 @@ class DeleteUserTool(BaseUserServiceTool):
         #TODO: Provide description of this tool
         return "Deletes a user from the system by user ID. This action is permanent and cannot be undone."
 
+    @property
+    def is_mutating(self) -> bool:
+        return True
+
     @property
     def input_schema(self) -> dict[str, Any]:
         #TODO:
@@ -0,0 +1,75 @@
+import heapq
+import re
+import threading
+from collections import Counter
+from typing import Any
+
+FUZZY_FIELDS = ("name", "surname", "email")
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> set[str]:
+    """Trigrams of the case-folded words of `text`, each word padded like `"  word "` so short words count too"""
+    result = set()
+    for word in _WORD.findall(text.casefold()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index of users' name, surname and email. Keep it current by registering `update` as a
+    UserMirror listener.
+    """
+
+    def __init__(self, fields: tuple[str, ...] = FUZZY_FIELDS):
+        self.__fields = fields
+        self.__postings: dict[str, set[int]] = {}
+        self.__trigrams: dict[int, set[str]] = {}
+        self.__users: dict[int, dict[str, Any]] = {}
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.__users)
+
+    def update(self, old: dict[str, Any] | None, new: dict[str, Any] | None):
+        with self.__lock:
+            if old is not None:
+                for gram in self.__trigrams.pop(old["id"], ()):
+                    ids = self.__postings[gram]
+                    ids.discard(old["id"])
+                    if not ids:
+                        del self.__postings[gram]
+                self.__users.pop(old["id"], None)
+            if new is not None:
+                grams = trigrams(" ".join(str(new[field]) for field in self.__fields if new.get(field)))
+                for gram in grams:
+                    self.__postings.setdefault(gram, set()).add(new["id"])
+                self.__trigrams[new["id"]] = grams
+                self.__users[new["id"]] = new
+
+    def search(self, query: str, limit: int = 5, threshold: float = 0.4) -> list[tuple[float, dict[str, Any]]]:
+        """
+        Up to `limit` (similarity, user) pairs, most similar first. Similarity is the share of the query's trigrams
+        found in the user's fields; users below `threshold` are skipped, ties go to users with fewer other trigrams.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        with self.__lock:
+            overlaps = Counter()
+            for gram in query_grams:
+                overlaps.update(self.__postings.get(gram, ()))
+            candidates = [
+                (
+                    overlap / len(query_grams),
+                    overlap / (len(query_grams) + len(self.__trigrams[user_id]) - overlap),
+                    user_id
+                )
+                for user_id, overlap in overlaps.items()
+                if overlap / len(query_grams) >= threshold
+            ]
+            best = heapq.nlargest(limit, candidates)
+            return [(similarity, self.__users[user_id]) for similarity, _, user_id in best]
@@ -0,0 +1,80 @@
+from typing import Any, Sequence
+
+from task.tools.users.base import BaseUserServiceTool
+from task.tools.users.fuzzy import TrigramIndex
+from task.tools.users.mirror import UserMirror
+from task.tools.users.rendering import UserRenderer
+from task.tools.users.search_users_tool import SUMMARY_FIELDS
+from task.tools.users.user_client import UserClient
+
+
+class FuzzySearchUsersTool(BaseUserServiceTool):
+    """
+    Typo-tolerant search over the users of `mirror`: a trigram index of their name, surname and email, built once and
+    updated with every change of the mirror, ranks users by similarity to the query. Searches fail while the mirror
+    is not loaded or has fallen behind (is not `is_fresh`).
+    """
+
+    def __init__(
+            self,
+            user_client: UserClient,
+            mirror: UserMirror,
+            limit: int = 5,
+            max_limit: int = 20,
+            threshold: float = 0.4,
+            fields: Sequence[str] = SUMMARY_FIELDS,
+            renderer: UserRenderer | None = None
+    ):
+        super().__init__(user_client, renderer)
+        self.__mirror = mirror
+        self.__index = TrigramIndex()
+        mirror.add_listener(self.__index.update)
+        self.__limit = limit
+        self.__max_limit = max_limit
+        self.__threshold = threshold
+        self.__fields = ("id", *fields, "similarity")
+
+    @property
+    def name(self) -> str:
+        return "fuzzy_search_users"
+
+    @property
+    def description(self) -> str:
+        return ("Finds users whose name, surname or email resemble the query, tolerating typos and misspellings "
+                "(e.g. 'Jon Smyth' finds John Smith). Returns the most similar users first with their similarity "
+                "(0-1). Use it when search_users finds nothing or the exact spelling is uncertain.")
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Name, surname, full name or email of the user, possibly misspelled"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": self.__max_limit,
+                    "description": f"Maximum number of users to return, {self.__limit} by default"
+                }
+            },
+            "required": ["query"]
+        }
+
+    def execute(self, arguments: dict[str, Any]) -> str:
+        try:
+            if not self.__mirror.is_fresh:
+                return "Error while fuzzy searching users: user mirror is not ready, use search_users instead"
+            limit = min(int(arguments.get("limit") or self.__limit), self.__max_limit)
+            matches = self.__index.search(str(arguments["query"]), limit=limit, threshold=self.__threshold)
+            if not matches:
+                return "Found 0 similar users\n"
+            users = []
+            for similarity, user in matches:
+                user = {**user, "similarity": round(similarity, 2)}
+                users.append({key: user[key] for key in self.__fields if key in user})
+            return f"Found {len(users)} similar users:\n" + (self._renderer or self._user_client.renderer).render(users)
+        except Exception as e:
+            return f"Error while fuzzy searching users: {str(e)}"
@@ -37,6 +37,6 @@ class GetUserByIdTool(BaseUserServiceTool):
         # 3. Optional: You can wrap it with `try-except` and return error as string `f"Error while retrieving user by id: {str(e)}"`
         try:
             user_id = int(arguments["id"])
-            return self._user_client.get_user(user_id)
+            return self._user_client.get_user(user_id, renderer=self._renderer)
         except Exception as e:
             return f"Error while retrieving user by id: {str(e)}"
\ No newline at end of file
@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from task.tools.users.base import BaseUserServiceTool
+from task.tools.users.rendering import UserRenderer
+from task.tools.users.user_client import UserClient
+
+
+class GetUsersByIdsTool(BaseUserServiceTool):
+    """
+    Bulk counterpart of `get_user_by_id`: fetches up to `max_ids` users concurrently (at most `max_workers`
+    requests in flight across all calls of the tool) and returns them in one tool message, with an error line for
+    every id that failed.
+    """
+
+    def __init__(
+            self,
+            user_client: UserClient,
+            max_workers: int = 8,
+            max_ids: int = 50,
+            renderer: UserRenderer | None = None
+    ):
+        super().__init__(user_client, renderer)
+        # worker threads are started on demand and reused by later calls
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="get_users")
+        self.__max_ids = max_ids
+
+    @property
+    def name(self) -> str:
+        return "get_users_by_ids"
+
+    @property
+    def description(self) -> str:
+        return ("Retrieves full information about several users by their IDs in one call. Use this instead of "
+                "repeated get_user_by_id calls when you need details of more than one user.")
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "ids": {
+                    "type": "array",
+                    "items": {"type": "integer"},
+                    "maxItems": self.__max_ids,
+                    "description": "User IDs"
+                }
+            },
+            "required": ["ids"]
+        }
+
+    def close(self) -> None:
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def execute(self, arguments: dict[str, Any]) -> str:
+        ids = arguments.get("ids")
+        if not isinstance(ids, list) or not ids:
+            return "Error while retrieving users by ids: `ids` must be a non-empty list of user IDs"
+        if len(ids) > self.__max_ids:
+            return f"Error while retrieving users by ids: at most {self.__max_ids} IDs are allowed per call"
+        invalid = [user_id for user_id in ids if _as_user_id(user_id) is None]
+        if invalid:
+            return f"Error while retrieving users by ids: IDs must be integers, got {', '.join(map(str, invalid))}"
+
+        # duplicates are fetched (and reported) once, in the order the model gave them
+        ids = list(dict.fromkeys(_as_user_id(user_id) for user_id in ids))
+        results = list(self.__executor.map(self.__get_user, ids))
+
+        users = [result for ok, result in results if ok]
+        errors = [f"  id {user_id}: {result}" for user_id, (ok, result) in zip(ids, results) if not ok]
+        text = f"Found {len(users)} of {len(ids)} users:\n"
+        if users:
+            text += (self._renderer or self._user_client.renderer).render(users)
+        if errors:
+            text += "Errors:\n" + "\n".join(errors) + "\n"
+        return text
+
+    def __get_user(self, user_id: int) -> tuple[bool, dict[str, Any] | str]:
+        try:
+            return True, self._user_client.get_user_info(user_id)
+        except Exception as e:
+            return False, str(e)
+
+
+def _as_user_id(value: Any) -> int | None:
+    """`value` as an integer user id (integral floats like 3.0 are accepted), None if it is not one"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return None
@@ -0,0 +1,210 @@
+import bisect
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from task.tools.users.user_client import USER_SERVICE_ENDPOINT
+from task.transport import HttpTransport, get_default_transport
+
+INDEXED_FIELDS = ("name", "surname", "email", "gender")
+# fields matched as a whole value rather than as a substring ("male" must not match "female")
+EXACT_FIELDS = ("gender",)
+
+logger = logging.getLogger(__name__)
+
+
+class _FieldIndex:
+    """Case-folded field value -> user ids (hash index), plus the sorted distinct values (prefix index)"""
+
+    def __init__(self):
+        self.__ids: dict[str, set[int]] = {}
+        self.__values: list[str] = []
+
+    def add(self, value: str, user_id: int):
+        ids = self.__ids.get(value)
+        if ids is None:
+            ids = self.__ids[value] = set()
+            bisect.insort(self.__values, value)
+        ids.add(user_id)
+
+    def remove(self, value: str, user_id: int):
+        ids = self.__ids.get(value)
+        if ids is None:
+            return
+        ids.discard(user_id)
+        if not ids:
+            del self.__ids[value]
+            del self.__values[bisect.bisect_left(self.__values, value)]
+
+    def exact(self, query: str) -> set[int]:
+        """Ids of users whose value equals `query`"""
+        return set(self.__ids.get(query, ()))
+
+    def matching(self, query: str) -> set[int]:
+        """Ids of users whose value contains `query`, like the user service matches"""
+        values = self.__values
+        result: set[int] = set()
+        # values equal to or starting with `query` form one range of the sorted values, only the others are scanned
+        start = end = bisect.bisect_left(values, query)
+        while end < len(values) and values[end].startswith(query):
+            result.update(self.__ids[values[end]])
+            end += 1
+        for value in itertools.chain(itertools.islice(values, start), itertools.islice(values, end, None)):
+            if query in value:
+                result.update(self.__ids[value])
+        return result
+
+
+class UserMirror:
+    """
+    In-process copy of all users of the user service with hash and prefix indexes on name, surname, email and gender,
+    answering searches the way the service does (every given parameter is a case-insensitive substring), except that
+    gender must match exactly.
+
+    `start()` bulk loads the users and reloads them every `refresh_interval` seconds in the background, re-indexing
+    only users that changed; UserClients created with `mirror=` apply their own mutations immediately. When no reload
+    succeeded for `max_staleness` seconds the mirror is not `is_fresh` and clients search remotely instead.
+    """
+
+    def __init__(
+            self,
+            endpoint: str = USER_SERVICE_ENDPOINT,
+            transport: HttpTransport | None = None,
+            refresh_interval: float | None = 60.0,
+            max_staleness: float = 300.0
+    ):
+        self.__endpoint = endpoint
+        self.__transport = transport or get_default_transport()
+        self.__refresh_interval = refresh_interval
+        self.__max_staleness = max_staleness
+        self.__users: dict[int, dict[str, Any]] = {}
+        self.__indexes = {field: _FieldIndex() for field in INDEXED_FIELDS}
+        self.__loaded_at: float | None = None
+        # bumped by every mutation applied, a reload that raced with one is discarded
+        self.__mutations = 0
+        self.__listeners: list[Callable[[dict[str, Any] | None, dict[str, Any] | None], None]] = []
+        self.__lock = threading.RLock()
+        self.__stopped = threading.Event()
+        self.__thread: threading.Thread | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        loaded_at = self.__loaded_at
+        return loaded_at is not None and time.monotonic() - loaded_at <= self.__max_staleness
+
+    def __len__(self) -> int:
+        return len(self.__users)
+
+    def start(self) -> "UserMirror":
+        """Loads all users and starts the background refresh; a failed initial load leaves the mirror stale"""
+        self.refresh()
+        if self.__refresh_interval and self.__thread is None:
+            self.__thread = threading.Thread(target=self.__refresh_loop, name="user-mirror", daemon=True)
+            self.__thread.start()
+        return self
+
+    def close(self):
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+
+    def refresh(self) -> bool:
+        mutations = self.__mutations
+        try:
+            response = self.__transport.get(
+                url=self.__endpoint + "/v1/users/search", headers={"Content-Type": "application/json"}
+            )
+            response.raise_for_status()
+            users = response.json()
+        except Exception as e:
+            logger.warning("User mirror refresh failed: %s", e)
+            return False
+
+        with self.__lock:
+            if mutations != self.__mutations:
+                logger.debug("User mirror refresh raced with a mutation, keeping current users")
+                return False
+            loaded = {user["id"]: user for user in users}
+            for user_id in self.__users.keys() - loaded.keys():
+                self.__remove(user_id)
+            changed = 0
+            for user_id, user in loaded.items():
+                if self.__users.get(user_id) != user:
+                    self.__upsert(user)
+                    changed += 1
+            self.__loaded_at = time.monotonic()
+        logger.debug("User mirror refreshed: %d users, %d changed", len(loaded), changed)
+        return True
+
+    def search(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        """Users matching normalized (case-folded) search `params`, in id order"""
+        with self.__lock:
+            if not params:
+                return [self.__users[user_id] for user_id in sorted(self.__users)]
+            ids: set[int] | None = None
+            for field, query in params.items():
+                index = self.__indexes.get(field)
+                if index is None:
+                    matching = {
+                        user_id for user_id, user in self.__users.items()
+                        if query in str(user.get(field, "")).casefold()
+                    }
+                elif field in EXACT_FIELDS:
+                    matching = index.exact(query)
+                else:
+                    matching = index.matching(query)
+                ids = matching if ids is None else ids & matching
+                if not ids:
+                    return []
+            return [self.__users[user_id] for user_id in sorted(ids)]
+
+    def add_listener(self, listener: Callable[[dict[str, Any] | None, dict[str, Any] | None], None]):
+        """
+        Calls `listener(old, new)` for every user added (`old` is None), changed or removed (`new` is None), under the
+        mirror lock; users already loaded are passed to it as added first
+        """
+        with self.__lock:
+            for user_id in sorted(self.__users):
+                listener(None, self.__users[user_id])
+            self.__listeners.append(listener)
+
+    def upsert(self, user: dict[str, Any]):
+        with self.__lock:
+            self.__mutations += 1
+            self.__upsert(user)
+
+    def remove(self, user_id: int):
+        with self.__lock:
+            self.__mutations += 1
+            self.__remove(user_id)
+
+    def __upsert(self, user: dict[str, Any]):
+        old = self.__users.get(user["id"])
+        if old is not None:
+            self.__unindex(old)
+        self.__users[user["id"]] = user
+        for field, index in self.__indexes.items():
+            if user.get(field) is not None:
+                index.add(str(user[field]).casefold(), user["id"])
+        for listener in self.__listeners:
+            listener(old, user)
+
+    def __remove(self, user_id: int):
+        user = self.__users.pop(user_id, None)
+        if user is None:
+            return
+        self.__unindex(user)
+        for listener in self.__listeners:
+            listener(user, None)
+
+    def __unindex(self, user: dict[str, Any]):
+        for field, index in self.__indexes.items():
+            if user.get(field) is not None:
+                index.remove(str(user[field]).casefold(), user["id"])
+
+    def __refresh_loop(self):
+        while not self.__stopped.wait(self.__refresh_interval):
+            self.refresh()
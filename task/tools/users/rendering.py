@@ -0,0 +1,111 @@
+from abc import ABC, abstractmethod
+from typing import Any, Sequence
+
+from task.serialization import dumps
+
+
+def flatten(user: dict[str, Any]) -> dict[str, Any]:
+    """Nested objects (`address`, `credit_card`) become dotted keys, e.g. `address.city`"""
+    result = {}
+    for key, value in user.items():
+        if type(value) is dict:
+            for nested_key, nested_value in flatten(value).items():
+                result[f"{key}.{nested_key}"] = nested_value
+        else:
+            result[key] = value
+    return result
+
+
+def mask(user: dict[str, Any]) -> dict[str, Any]:
+    """Copy of `user` with the card number cut to its last 4 digits and the CVV hidden"""
+    card = user.get("credit_card")
+    if not isinstance(card, dict):
+        return user
+    masked_card = dict(card)
+    if masked_card.get("num"):
+        masked_card["num"] = f"**** {str(masked_card['num']).replace(' ', '').replace('-', '')[-4:]}"
+    if masked_card.get("cvv"):
+        masked_card["cvv"] = "***"
+    return {**user, "credit_card": masked_card}
+
+
+class UserRenderer(ABC):
+    """Renders user records into tool results, with card details masked if `mask=True`"""
+
+    def __init__(self, flatten: bool = False, mask: bool = False):
+        self.__flatten = flatten
+        self.__mask = mask
+
+    def prepare(self, user: dict[str, Any]) -> dict[str, Any]:
+        if self.__mask:
+            user = mask(user)
+        return flatten(user) if self.__flatten else user
+
+    def render_one(self, user: dict[str, Any]) -> str:
+        return self.render([user])
+
+    @abstractmethod
+    def render(self, users: Sequence[dict[str, Any]]) -> str:
+        pass
+
+
+class BlockRenderer(UserRenderer):
+    """Fenced `key: value` block per user (the original format)"""
+
+    def render_one(self, user: dict[str, Any]) -> str:
+        parts = ["```\n"]
+        self.__append(parts, user)
+        return "".join(parts)
+
+    def render(self, users: Sequence[dict[str, Any]]) -> str:
+        parts = []
+        for user in users:
+            parts.append("```\n")
+            self.__append(parts, user)
+        parts.append("\n")
+        return "".join(parts)
+
+    def __append(self, parts: list[str], user: dict[str, Any]):
+        parts.extend([f"  {key}: {value}\n" for key, value in self.prepare(user).items()])
+        parts.append("```\n")
+
+
+class TableRenderer(UserRenderer):
+    """
+    One header line with the columns of all users (nested fields flattened) and one line per user,
+    `separator` separated (tab by default)
+    """
+
+    def __init__(self, separator: str = "\t", mask: bool = False):
+        super().__init__(flatten=True, mask=mask)
+        self.__separator = separator
+
+    def render(self, users: Sequence[dict[str, Any]]) -> str:
+        rows = [self.prepare(user) for user in users]
+        columns = list(dict.fromkeys(key for row in rows for key in row))
+        lines = [self.__separator.join(columns)]
+        for row in rows:
+            lines.append(self.__separator.join(self.__cell(row.get(column)) for column in columns))
+        return "\n".join(lines) + "\n"
+
+    def __cell(self, value: Any) -> str:
+        if value is None:
+            return ""
+        text = str(value)
+        if self.__separator in text or "\n" in text:
+            text = text.replace(self.__separator, " ").replace("\n", " ")
+        return text
+
+
+class JsonRenderer(UserRenderer):
+    """Compact JSON object per user, array for lists"""
+
+    def __init__(self, flatten: bool = False, mask: bool = False, fast_json: bool = True):
+        super().__init__(flatten=flatten, mask=mask)
+        self.__fast_json = fast_json
+
+    def render_one(self, user: dict[str, Any]) -> str:
+        return dumps(self.prepare(user), self.__fast_json).decode("utf-8")
+
+    def render(self, users: Sequence[dict[str, Any]]) -> str:
+        return dumps([self.prepare(user) for user in users], self.__fast_json).decode("utf-8")
@@ -1,9 +1,32 @@
-from typing import Any
+from typing import Any, Sequence
 
 from task.tools.users.base import BaseUserServiceTool
+from task.tools.users.models.user_info import UserCreate
+from task.tools.users.rendering import UserRenderer
+from task.tools.users.user_client import UserClient
+
+USER_FIELDS = ("id", *UserCreate.model_fields)
+SUMMARY_FIELDS = ("name", "surname", "email", "gender")
 
 
 class SearchUsersTool(BaseUserServiceTool):
+    """
+    Returns small result pages: `page_size` users (at most `max_page_size` if the model asks for more) with only
+    `default_fields` unless the model asks for other fields, after a header with the total number of matches.
+    """
+
+    def __init__(
+            self,
+            user_client: UserClient,
+            page_size: int = 10,
+            max_page_size: int = 50,
+            default_fields: Sequence[str] = SUMMARY_FIELDS,
+            renderer: UserRenderer | None = None
+    ):
+        super().__init__(user_client, renderer)
+        self.__page_size = page_size
+        self.__max_page_size = max_page_size
+        self.__default_fields = tuple(default_fields)
 
     @property
     def name(self) -> str:
@@ -13,7 +36,10 @@ class SearchUsersTool(BaseUserServiceTool):
     @property
     def description(self) -> str:
         #TODO: Provide description of this tool
-        return "Search for users by name, surname, email, or gender. All parameters are optional. Returns a list of matching users."
+        return ("Search for users by name, surname, email, or gender. All parameters are optional. Returns the total "
+                f"number of matching users and a page of them ({self.__page_size} by default, use `offset` for the "
+                f"next pages) with only {', '.join(('id', *self.__default_fields))} unless other `fields` are "
+                "requested.")
 
     @property
     def input_schema(self) -> dict[str, Any]:
@@ -42,6 +68,22 @@ class SearchUsersTool(BaseUserServiceTool):
                 "gender": {
                     "type": "string",
                     "description": "User's gender to filter by"
+                },
+                "limit": {
+                    "type": "integer",
+                    "minimum": 1,
+                    "maximum": self.__max_page_size,
+                    "description": f"Maximum number of users to return, {self.__page_size} by default"
+                },
+                "offset": {
+                    "type": "integer",
+                    "minimum": 0,
+                    "description": "Number of matching users to skip, for paging"
+                },
+                "fields": {
+                    "type": "array",
+                    "items": {"type": "string", "enum": list(USER_FIELDS)},
+                    "description": "User fields to return (id is always returned)"
                 }
             },
             "required": []
@@ -52,6 +94,12 @@ class SearchUsersTool(BaseUserServiceTool):
         # 1. Call user_client search_users (with `**arguments`) and return its results
         # 2. Optional: You can wrap it with `try-except` and return error as string `f"Error while searching users: {str(e)}"`
         try:
-            return self._user_client.search_users(**arguments)
+            arguments = dict(arguments)
+            limit = min(int(arguments.pop("limit", None) or self.__page_size), self.__max_page_size)
+            offset = int(arguments.pop("offset", None) or 0)
+            fields = arguments.pop("fields", None) or self.__default_fields
+            return self._user_client.search_users(
+                **arguments, limit=limit, offset=offset, fields=fields, renderer=self._renderer
+            )
         except Exception as e:
             return f"Error while searching users: {str(e)}"
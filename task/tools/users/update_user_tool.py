@@ -16,6 +16,10 @@ class UpdateUserTool(BaseUserServiceTool):
         #TODO: Provide description of this tool
         return "Updates an existing user's information by user ID. All fields in new_info are optional - only provided fields will be updated."
 
+    @property
+    def is_mutating(self) -> bool:
+        return True
+
     @property
     def input_schema(self) -> dict[str, Any]:
         #TODO:
@@ -1,39 +1,186 @@
-from typing import Any, Optional
-
-import requests
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Optional, Sequence
 
+from task.cache import CacheStats, LRUCache
+from task.resilience import HttpStatusError
+from task.singleflight import SingleFlight, SingleFlightStats
 from task.tools.users.models.user_info import UserCreate, UserUpdate
+from task.tools.users.rendering import BlockRenderer, UserRenderer
+from task.transport import HttpTransport, get_default_transport
+
+if TYPE_CHECKING:
+    from task.tools.users.mirror import UserMirror
 
 USER_SERVICE_ENDPOINT = "http://localhost:8041"
 
+logger = logging.getLogger(__name__)
+
+
+class UserSearchCache:
+    """
+    Search results keyed by normalized query parameters, so queries differing only in case or surrounding whitespace
+    share an entry (the user service matches case-insensitively). Every user mutation bumps the generation, dropping all
+    results and keeping searches that raced with the mutation from being stored. One instance may be shared by the
+    UserClients of all conversations in a process (`max_entries=0` disables caching).
+    """
+
+    def __init__(self, max_entries: int = 256, ttl: float | None = 30.0):
+        self.__results: LRUCache[tuple[tuple[str, str], ...], list[dict[str, Any]]] = LRUCache(max_entries, ttl=ttl)
+        self.__generation = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.__results.stats
+
+    @staticmethod
+    def normalize(params: dict[str, str | None]) -> dict[str, str]:
+        """Drops empty parameters, trims and case-folds the rest"""
+        return {key: value.strip().casefold() for key, value in params.items() if value and value.strip()}
+
+    @classmethod
+    def key(cls, params: dict[str, str | None]) -> tuple[tuple[str, str], ...]:
+        """Cache (and coalescing) key of search `params`, the params themselves are sent unchanged"""
+        return tuple(sorted(cls.normalize(params).items()))
+
+    def get(self, params: dict[str, str]) -> list[dict[str, Any]] | None:
+        return self.__results.get(self.key(params))
+
+    def set(self, params: dict[str, str], users: list[dict[str, Any]], generation: int) -> None:
+        """Stores `users` found with `params` unless a mutation happened since `generation` was read"""
+        with self.__lock:
+            if generation == self.__generation:
+                self.__results.set(self.key(params), users)
+
+    def invalidate(self) -> None:
+        with self.__lock:
+            self.__generation += 1
+            self.__results.clear()
+
+
+def user_from_response(response: Any) -> dict[str, Any] | None:
+    """User record in a create/update response body, None if the body is not one"""
+    try:
+        user = response.json()
+    except ValueError:
+        return None
+    return user if isinstance(user, dict) and isinstance(user.get("id"), int) else None
+
+
+def render_search_page(
+        users: list[dict[str, Any]],
+        limit: int | None,
+        offset: int,
+        fields: Sequence[str] | None,
+        renderer: UserRenderer
+) -> str:
+    """
+    Renders at most `limit` of `users` (all if None) starting at `offset`, with only `fields` (and `id`) of each if
+    given, after a header with the total count
+    """
+    total = len(users)
+    offset = max(offset, 0)
+    page = users[offset:offset + limit if limit is not None else None]
+    if fields:
+        keys = dict.fromkeys(("id", *fields))
+        page = [{key: user[key] for key in keys if key in user} for user in page]
+
+    end = offset + len(page)
+    if not page and total:
+        header = f"Found {total} users, none at offset {offset}\n"
+    elif offset or end < total:
+        header = f"Found {total} users, showing {offset + 1}-{end}"
+        header += f" (pass offset={end} for more):\n" if end < total else ":\n"
+    else:
+        header = f"Found {total} users:\n" if total else "Found 0 users\n"
+    if not page:
+        return header
+    return header + renderer.render(page)
+
+
 class UserClient:
+    """
+    User service client. `get_user` results are kept in a TTL + LRU cache (`cache_size=0` disables it), which is
+    populated from `add_user` responses and invalidated by `update_user` and `delete_user`. `search_users` results
+    are kept in `search_cache`, pass the same instance to several clients to share it. Users are rendered with
+    `renderer` unless a call passes its own. With a fresh `mirror`, searches are answered from it locally, and
+    mutations made through this client are applied to it. Identical reads in flight at the same time are coalesced
+    onto one request (see `coalescing_stats`).
+    """
+
+    def __init__(
+            self,
+            endpoint: str = USER_SERVICE_ENDPOINT,
+            transport: HttpTransport | None = None,
+            cache_size: int = 1024,
+            cache_ttl: float | None = 30.0,
+            search_cache: UserSearchCache | None = None,
+            renderer: UserRenderer | None = None,
+            mirror: "UserMirror | None" = None
+    ):
+        self.__endpoint = endpoint
+        self.__transport = transport or get_default_transport()
+        self.__users: LRUCache[int, dict[str, Any]] = LRUCache(cache_size, ttl=cache_ttl)
+        # bumped by every mutation, so a read that raced with a write does not cache what it fetched
+        self.__generation = 0
+        self.__generation_lock = threading.Lock()
+        self.__search_cache = search_cache or UserSearchCache()
+        self.__renderer = renderer or BlockRenderer()
+        self.__mirror = mirror
+        self.__flights: SingleFlight[tuple, Any] = SingleFlight()
+
+    @property
+    def cache_stats(self) -> CacheStats:
+        return self.__users.stats
+
+    @property
+    def search_cache(self) -> UserSearchCache:
+        return self.__search_cache
 
-    def __user_to_string(self, user: dict[str, Any]):
-        user_str = "```\n"
-        for key, value in user.items():
-            user_str += f"  {key}: {value}\n"
-        user_str += "```\n"
+    @property
+    def coalescing_stats(self) -> SingleFlightStats:
+        return self.__flights.stats
 
-        return user_str
+    @property
+    def renderer(self) -> UserRenderer:
+        return self.__renderer
 
-    def __users_to_string(self, users: list[dict[str, Any]]):
-        users_str = ""
-        for value in users:
-            users_str += self.__user_to_string(value)
-        users_str += "\n"
+    def __invalidate(self, user_id: int | None = None):
+        with self.__generation_lock:
+            self.__generation += 1
+        self.__search_cache.invalidate()
+        if user_id is not None:
+            self.__users.pop(user_id)
 
-        return users_str
+    def get_user(self, user_id: int, renderer: UserRenderer | None = None) -> str:
+        return (renderer or self.__renderer).render_one(self.get_user_info(user_id))
 
-    def get_user(self, user_id: int) -> str:
+    def get_user_info(self, user_id: int) -> dict[str, Any]:
+        user = self.__users.get(user_id)
+        if user is not None:
+            return user
+
+        generation = self.__generation
+        return self.__flights.do(("get", user_id, generation), lambda: self.__fetch_user(user_id, generation))
+
+    def __fetch_user(self, user_id: int, generation: int) -> dict[str, Any]:
         headers = {"Content-Type": "application/json"}
 
-        response = requests.get(url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}", headers=headers)
+        response = self.__transport.get(url=f"{self.__endpoint}/v1/users/{user_id}", headers=headers)
 
         if response.status_code == 200:
             data = response.json()
-            return self.__user_to_string(data)
+            with self.__generation_lock:
+                if generation == self.__generation:
+                    self.__users.set(user_id, data)
+            return data
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
 
     def search_users(
             self,
@@ -41,62 +188,107 @@ class UserClient:
             surname: Optional[str] = None,
             email: Optional[str] = None,
             gender: Optional[str] = None,
+            limit: int | None = None,
+            offset: int = 0,
+            fields: Sequence[str] | None = None,
+            renderer: UserRenderer | None = None,
     ) -> str:
-        headers = {"Content-Type": "application/json"}
+        """
+        Renders users matching all given parameters after a header with their total count: at most `limit` of them
+        (all if None) starting at `offset`, with only `fields` (and `id`) of each if given.
+        """
+        params = {
+            key: value for key, value in {"name": name, "surname": surname, "email": email, "gender": gender}.items()
+            if value
+        }
+        return render_search_page(self.__search(params), limit, offset, fields, renderer or self.__renderer)
 
-        params = {}
-        if name:
-            params["name"] = name
-        if surname:
-            params["surname"] = surname
-        if email:
-            params["email"] = email
-        if gender:
-            params["gender"] = gender
+    def __search(self, params: dict[str, str]) -> list[dict[str, Any]]:
+        if self.__mirror is not None and self.__mirror.is_fresh:
+            return self.__mirror.search(UserSearchCache.normalize(params))
 
-        response = requests.get(url=USER_SERVICE_ENDPOINT + "/v1/users/search", headers=headers, params=params)
+        users = self.__search_cache.get(params)
+        if users is not None:
+            return users
+
+        generation = self.__search_cache.generation
+        return self.__flights.do(
+            ("search", UserSearchCache.key(params), generation), lambda: self.__fetch_search(params, generation)
+        )
+
+    def __fetch_search(self, params: dict[str, str], generation: int) -> list[dict[str, Any]]:
+        headers = {"Content-Type": "application/json"}
+
+        response = self.__transport.get(url=self.__endpoint + "/v1/users/search", headers=headers, params=params)
 
         if response.status_code == 200:
             data = response.json()
-            print(f"Get {len(data)} users successfully")
-            return self.__users_to_string(data)
+            logger.debug("Get %d users successfully", len(data))
+            self.__search_cache.set(params, data, generation)
+            return data
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
 
     def add_user(self, user_create_model: UserCreate) -> str:
+        response = self.__post_user(user_create_model)
+        return f"User successfully added: {response.text}"
+
+    def create_user(self, user_create_model: UserCreate) -> dict[str, Any]:
+        """Like `add_user`, but returns the created user record (empty if the service did not send it back)"""
+        return user_from_response(self.__post_user(user_create_model)) or {}
+
+    def __post_user(self, user_create_model: UserCreate) -> Any:
         headers = {"Content-Type": "application/json"}
 
-        response = requests.post(
-            url=f"{USER_SERVICE_ENDPOINT}/v1/users",
+        response = self.__transport.post(
+            url=f"{self.__endpoint}/v1/users",
             headers=headers,
             json=user_create_model.model_dump()
         )
 
         if response.status_code == 201:
-            return f"User successfully added: {response.text}"
+            self.__invalidate()
+            user = user_from_response(response)
+            if user is not None:
+                self.__users.set(user["id"], user)
+                if self.__mirror is not None:
+                    self.__mirror.upsert(user)
+            return response
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
 
     def update_user(self, user_id: int, user_update_model: UserUpdate) -> str:
         headers = {"Content-Type": "application/json"}
 
-        response = requests.put(
-            url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}",
-            headers=headers,
-            json=user_update_model.model_dump()
-        )
+        try:
+            response = self.__transport.put(
+                url=f"{self.__endpoint}/v1/users/{user_id}",
+                headers=headers,
+                json=user_update_model.model_dump()
+            )
+        finally:
+            # even a failed update may have been applied
+            self.__invalidate(user_id)
 
         if response.status_code == 201:
+            user = user_from_response(response)
+            if user is not None and self.__mirror is not None:
+                self.__mirror.upsert(user)
             return f"User successfully updated: {response.text}"
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
 
     def delete_user(self, user_id: int) -> str:
         headers = {"Content-Type": "application/json"}
 
-        response = requests.delete(url=f"{USER_SERVICE_ENDPOINT}/v1/users/{user_id}", headers=headers)
+        try:
+            response = self.__transport.delete(url=f"{self.__endpoint}/v1/users/{user_id}", headers=headers)
+        finally:
+            self.__invalidate(user_id)
 
         if response.status_code == 204:
+            if self.__mirror is not None:
+                self.__mirror.remove(user_id)
             return "User successfully deleted"
 
-        raise Exception(f"HTTP {response.status_code}: {response.text}")
+        raise HttpStatusError(f"HTTP {response.status_code}: {response.text}", response.status_code, response.text)
@@ -1,15 +1,26 @@
 from typing import Any
 
-import requests
-
+from task.deployments import Deployment, DeploymentPool
+from task.resilience import HttpStatusError
 from task.tools.base import BaseTool
+from task.transport import HttpTransport, get_default_transport
 
 
 class WebSearchTool(BaseTool):
 
-    def __init__(self, api_key: str, endpoint: str):
+    def __init__(
+            self,
+            api_key: str,
+            endpoint: str,
+            transport: HttpTransport | None = None,
+            deployment_pool: DeploymentPool | None = None,
+            hedge_requests: bool = False
+    ):
         self.__api_key = api_key
-        self.__endpoint = f"{endpoint}/openai/deployments/gemini-2.5-pro/chat/completions"
+        self.__transport = transport or get_default_transport()
+        self.__deployment_pool = deployment_pool or DeploymentPool([Deployment(endpoint, "gemini-2.5-pro")])
+        # a hedged search is a duplicate LLM call, so it is only done on request (and with pool's `hedge_percentile`)
+        self.__hedge_requests = hedge_requests
 
     # https://dialx.ai/dial_api#operation/sendChatCompletionRequest (-> tools -> function)
     # Sample of tool config:
@@ -85,9 +96,25 @@ class WebSearchTool(BaseTool):
             ]
         }
         
-        response = requests.post(url=self.__endpoint, headers=headers, json=request_data)
-        
-        if response.status_code == 200:
+        retry = len(self.__deployment_pool) == 1
+
+        def send(deployment: Deployment) -> str:
+            response = self.__transport.post(url=deployment.url, headers=headers, json=request_data, retry=retry)
+            if response.status_code != 200:
+                raise HttpStatusError(
+                    f"Error: {response.status_code} {response.text}",
+                    status_code=response.status_code,
+                    body=response.text
+                )
             return response.json()["choices"][0]["message"]["content"]
-        else:
-            return f"Error: {response.status_code} {response.text}"
+
+        try:
+            return self.__deployment_pool.call(send, hedge=self.__hedge_requests)
+        except HttpStatusError as e:
+            return str(e)
+        except Exception as e:
+            # open circuit, connection errors and timeouts left after retries fail only this call, not the turn
+            return f"Error: {str(e)}"
+
+    def close(self) -> None:
+        self.__deployment_pool.close()
@@ -0,0 +1,207 @@
+"""
+Tracing of agent turns: spans for the turn itself, every LLM round, request serialization and every tool call.
+
+Summary of a JSON-lines trace file (per turn: LLM, tool and serialization time and token usage):
+    python -m task.tracing traces.jsonl
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+USAGE_FIELDS = ("prompt_tokens", "completion_tokens", "total_tokens")
+# Tools report failures to the model as results starting with one of these
+TOOL_ERROR_PREFIXES = ("Error while ", "Error: ", "Unknown function: ")
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    # wall clock (epoch seconds) for correlation with other logs, `duration` is measured with a monotonic clock
+    start_time: float
+    duration: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Span | None:
+    """Innermost open span of the current thread (or asyncio task)"""
+    return _current_span.get()
+
+
+def annotate(**attributes: Any) -> None:
+    """Adds attributes to the current span, no-op outside of spans"""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attributes)
+
+
+def usage_attributes(usage: dict[str, Any] | None) -> dict[str, int]:
+    """Token counts from the `usage` block of a completion response"""
+    return {name: usage[name] for name in USAGE_FIELDS if name in (usage or {})}
+
+
+def tool_error(result: str) -> str | None:
+    """First line of a tool result that reports a failure, None for other results"""
+    if not result.startswith(TOOL_ERROR_PREFIXES):
+        return None
+    return result.split("\n", 1)[0][:500]
+
+
+class SpanExporter(ABC):
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Called with every finished span, from the thread that finished it"""
+
+    def close(self) -> None:
+        pass
+
+
+class JsonLinesExporter(SpanExporter):
+    """Appends finished spans to a JSON-lines file, one span per line"""
+
+    def __init__(self, path: str | Path):
+        self.__file = open(path, "a", encoding="utf-8")
+        self.__lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n"
+        with self.__lock:
+            self.__file.write(line)
+            self.__file.flush()
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__file.close()
+
+
+class InMemoryExporter(SpanExporter):
+    """Keeps finished spans in memory, e.g. for benchmarks"""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self.__lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self.__lock:
+            self.spans.append(span)
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to exporters. The parent of a new span is the current span of the thread
+    (or asyncio task); work submitted to thread pools keeps its parent when run in a copy of the submitter's context.
+    """
+
+    def __init__(self, exporters: list[SpanExporter] | None = None):
+        self.__exporters = list(exporters or [])
+
+    @contextmanager
+    def span(self, name: str, /, **attributes: Any) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            parent_id=parent.span_id if parent else None,
+            start_time=time.time(),
+            attributes=attributes
+        )
+        token = _current_span.set(span)
+        started_at = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - started_at
+            _current_span.reset(token)
+            for exporter in self.__exporters:
+                exporter.export(span)
+
+    def close(self) -> None:
+        for exporter in self.__exporters:
+            exporter.close()
+
+
+def summarize(spans: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Per-trace (turn) breakdown: total, LLM, serialization and tool time, tool calls, tool errors and token usage.
+    Tool calls dispatched while a completion was streaming run inside its LLM round, their time is reported as
+    `overlapped_tool_time` instead of being added to `tool_time` as well.
+    """
+    spans = list(spans)
+    names = {span["span_id"]: span["name"] for span in spans}
+    traces: dict[str, dict[str, Any]] = defaultdict(lambda: {
+        "llm_time": 0.0, "serialization_time": 0.0, "tool_time": 0.0, "overlapped_tool_time": 0.0,
+        "llm_rounds": 0, "tool_calls": 0, "tool_errors": 0, **{name: 0 for name in USAGE_FIELDS}
+    })
+    for span in spans:
+        trace = traces[span["trace_id"]]
+        attributes = span.get("attributes") or {}
+        if span["name"] == "turn":
+            trace.update(attributes)
+            trace["trace_id"] = span["trace_id"]
+            trace["duration"] = span["duration"]
+            trace["error"] = span.get("error")
+        elif span["name"] == "llm_round":
+            trace["llm_time"] += span["duration"]
+            trace["llm_rounds"] += 1
+            for name in USAGE_FIELDS:
+                trace[name] += attributes.get(name, 0)
+        elif span["name"] == "serialization":
+            trace["serialization_time"] += span["duration"]
+        elif span["name"] == "tool_call":
+            if names.get(span.get("parent_id")) == "llm_round":
+                trace["overlapped_tool_time"] += span["duration"]
+            else:
+                trace["tool_time"] += span["duration"]
+            trace["tool_calls"] += 1
+            trace["tool_errors"] += span.get("error") is not None
+    return [trace for trace in traces.values() if "duration" in trace]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace_file")
+    args = parser.parse_args()
+
+    with open(args.trace_file, encoding="utf-8") as file:
+        turns = summarize(json.loads(line) for line in file if line.strip())
+
+    for turn in turns:
+        label = turn.get("conversation_id") or turn["trace_id"][:16]
+        print(
+            f"{label}: {turn['duration']:.2f}s total, {turn['llm_time']:.2f}s LLM ({turn['llm_rounds']} rounds, "
+            f"{turn['serialization_time'] * 1000:.1f} ms serialization), {turn['tool_time']:.2f}s in tools "
+            f"({turn['tool_calls']} calls, {turn['tool_errors']} failed, summed"
+            + (f"; {turn['overlapped_tool_time']:.2f}s more while streaming" if turn["overlapped_tool_time"] else "")
+            + f"), {turn['prompt_tokens']}+{turn['completion_tokens']} tokens"
+            + (f", error: {turn['error']}" if turn["error"] else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
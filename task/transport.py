@@ -0,0 +1,258 @@
+import asyncio
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from task.resilience import RETRYABLE_STATUS_CODES, Resilience, parse_retry_after
+
+
+def _host_prefix(host: str) -> str:
+    parts = urlsplit(host)
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme else f"https://{host}"
+
+
+class HttpTransport:
+    """
+    Keep-alive HTTP session pool shared by DialClient, WebSearchTool and UserClient.
+
+    Connections are pooled per host, so a multi-round tool conversation against ai-proxy (and the
+    user service lookups in between) reuses already established TCP/TLS connections.
+
+    Connection errors and retryable statuses (429, 5xx) are retried with backoff per `resilience` policy
+    (GET, HEAD, OPTIONS and PUT by default, other requests with `retry=True`), every endpoint has its own circuit breaker.
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            host_pool_sizes: dict[str, int] | None = None,
+            connect_timeout: float = 5.0,
+            read_timeout: float = 120.0,
+            proxies: dict[str, str] | None = None,
+            verify: bool | str = True,
+            resilience: Resilience | None = None,
+    ):
+        """
+        :param pool_connections: number of per-host pools to keep
+        :param pool_maxsize: default max number of kept-alive connections per host
+        :param host_pool_sizes: per-host overrides of `pool_maxsize`, e.g. {"https://ai-proxy.lab.epam.com": 32}
+        :param connect_timeout: seconds to wait for a connection to be established
+        :param read_timeout: seconds to wait between bytes of a response
+        :param proxies: proxy settings in `requests` format, e.g. {"https": "http://proxy:3128"}
+        :param verify: TLS verification flag or path to a CA bundle
+        :param resilience: retry policy and circuit breakers (default settings if not provided)
+        """
+        self.__timeout = (connect_timeout, read_timeout)
+        self.__verify = verify
+        self.__resilience = resilience or Resilience()
+        self.__session = requests.Session()
+        self.__session.mount("http://", HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+        self.__session.mount("https://", HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+
+        for host, pool_size in (host_pool_sizes or {}).items():
+            self.__session.mount(_host_prefix(host), HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+        if proxies:
+            self.__session.proxies.update(proxies)
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        return self.__timeout
+
+    @property
+    def verify(self) -> bool | str:
+        return self.__verify
+
+    def request(
+            self,
+            method: str,
+            url: str,
+            retry: bool | None = None,
+            deadline: float | None = None,
+            **kwargs: Any
+    ) -> requests.Response:
+        """
+        :param retry: whether failed attempts may be repeated (default: only for RETRYABLE_METHODS)
+        :param deadline: `time.monotonic()` value after which no further attempts are made
+        """
+        kwargs.setdefault("timeout", self.__timeout)
+        # passed per request: session-level `verify` is overridden by REQUESTS_CA_BUNDLE otherwise
+        kwargs.setdefault("verify", self.__verify)
+        retry = self.__resilience.should_retry(method, retry)
+        breaker = self.__resilience.breaker(method, url)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.before_call()
+            try:
+                response = self.__session.request(method=method, url=url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                breaker.record_failure()
+                delay = self.__resilience.retry_delay(attempt, deadline) if retry else None
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except Exception:
+                breaker.record_failure()
+                raise
+
+            if self.__resilience.is_failure(response.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if retry and response.status_code in RETRYABLE_STATUS_CODES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self.__resilience.retry_delay(attempt, deadline, retry_after)
+                if delay is not None:
+                    response.close()
+                    time.sleep(delay)
+                    continue
+            return response
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self.__session.close()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncHttpTransport:
+    """
+    Asyncio counterpart of HttpTransport built on `httpx.AsyncClient`, takes the same pool/timeout/proxy settings.
+
+    The underlying client binds to the event loop it is first used in, so create one transport per event loop.
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            host_pool_sizes: dict[str, int] | None = None,
+            connect_timeout: float = 5.0,
+            read_timeout: float = 120.0,
+            proxies: dict[str, str] | None = None,
+            verify: bool | str = True,
+            resilience: Resilience | None = None,
+    ):
+        self.__timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.__resilience = resilience or Resilience()
+        proxies = proxies or {}
+
+        def make_transport(scheme: str, pool_size: int, max_connections: int) -> httpx.AsyncHTTPTransport:
+            return httpx.AsyncHTTPTransport(
+                verify=verify,
+                proxy=proxies.get(scheme),
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=pool_size)
+            )
+
+        mounts = {
+            f"{scheme}://": make_transport(scheme, pool_maxsize, pool_connections * pool_maxsize)
+            for scheme in ("http", "https")
+        }
+        for host, pool_size in (host_pool_sizes or {}).items():
+            prefix = _host_prefix(host)
+            mounts[prefix] = make_transport(urlsplit(prefix).scheme, pool_size, pool_size)
+
+        self.__client = httpx.AsyncClient(mounts=mounts, timeout=self.__timeout)
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return self.__timeout
+
+    async def request(
+            self,
+            method: str,
+            url: str,
+            retry: bool | None = None,
+            deadline: float | None = None,
+            **kwargs: Any
+    ) -> httpx.Response:
+        """Same retry and circuit breaking semantics as `HttpTransport.request`"""
+        retry = self.__resilience.should_retry(method, retry)
+        breaker = self.__resilience.breaker(method, url)
+
+        attempt = 0
+        while True:
+            attempt += 1
+            breaker.before_call()
+            try:
+                response = await self.__client.request(method=method, url=url, **kwargs)
+            except httpx.TransportError:
+                breaker.record_failure()
+                delay = self.__resilience.retry_delay(attempt, deadline) if retry else None
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                breaker.record_failure()
+                raise
+
+            if self.__resilience.is_failure(response.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+            if retry and response.status_code in RETRYABLE_STATUS_CODES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                delay = self.__resilience.retry_delay(attempt, deadline, retry_after)
+                if delay is not None:
+                    await response.aclose()
+                    await asyncio.sleep(delay)
+                    continue
+            return response
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    async def aclose(self) -> None:
+        await self.__client.aclose()
+
+    async def __aenter__(self) -> "AsyncHttpTransport":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+_default_transport: HttpTransport | None = None
+
+
+def get_default_transport() -> HttpTransport:
+    """Provides process-wide transport used by clients that were not given an explicit one"""
+    global _default_transport
+    if _default_transport is None:
+        _default_transport = HttpTransport()
+    return _default_transport
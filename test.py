@@ -5,21 +5,25 @@ from pathlib import Path
 # Add task directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from task.cache import CompletionCache
 from task.client import DialClient
+from task.log import configure_logging
 from task.models.conversation import Conversation
 from task.models.message import Message
 from task.models.role import Role
 from task.prompts import SYSTEM_PROMPT
-from task.tools.users.create_user_tool import CreateUserTool
-from task.tools.users.delete_user_tool import DeleteUserTool
-from task.tools.users.get_user_by_id_tool import GetUserByIdTool
-from task.tools.users.search_users_tool import SearchUsersTool
-from task.tools.users.update_user_tool import UpdateUserTool
+from task.tools.toolset import build_tools
+from task.tools.users.mirror import UserMirror
 from task.tools.users.user_client import UserClient
-from task.tools.web_search import WebSearchTool
+from task.transport import HttpTransport
 
 DIAL_ENDPOINT = "https://ai-proxy.lab.epam.com"
 API_KEY = os.getenv('DIAL_API_KEY', 'dial-fxbasxs2h6t7brhnbqs36omhe2y')
+# Set to a directory to replay identical completion rounds from disk on repeated runs
+COMPLETION_CACHE_DIR = os.getenv('DIAL_COMPLETION_CACHE_DIR')
+LOG_LEVEL = os.getenv('DIAL_LOG_LEVEL', 'INFO')
+# Set to 1 to answer user searches from an in-process mirror of the user service (enables fuzzy_search_users)
+USER_MIRROR = os.getenv('DIAL_USER_MIRROR') == '1'
 
 
 def print_separator(title: str = ""):
@@ -58,27 +62,26 @@ def run_test_case(dial_client: DialClient, test_name: str, user_query: str):
 
 
 def main():
+    configure_logging(LOG_LEVEL)
     print_separator("🎯 AI DIAL SIMPLE AGENT - COMPREHENSIVE TEST SUITE")
     
     # Initialize UserClient
     print("\n🔧 Initializing User Client...")
-    user_client = UserClient()
+    transport = HttpTransport(host_pool_sizes={DIAL_ENDPOINT: 20})
+    mirror = UserMirror(transport=transport).start() if USER_MIRROR else None
+    user_client = UserClient(transport=transport, mirror=mirror)
     print("✅ User Client initialized")
     
     # Initialize DialClient with all tools
     print("\n🔧 Initializing DIAL Client with tools...")
+    completion_cache = CompletionCache(directory=COMPLETION_CACHE_DIR) if COMPLETION_CACHE_DIR else None
     dial_client = DialClient(
         endpoint=DIAL_ENDPOINT,
         deployment_name="gpt-4o",
         api_key=API_KEY,
-        tools=[
-            WebSearchTool(api_key=API_KEY, endpoint=DIAL_ENDPOINT),
-            GetUserByIdTool(user_client),
-            SearchUsersTool(user_client),
-            CreateUserTool(user_client),
-            UpdateUserTool(user_client),
-            DeleteUserTool(user_client)
-        ]
+        tools=build_tools(user_client, mirror, api_key=API_KEY, endpoint=DIAL_ENDPOINT, transport=transport),
+        transport=transport,
+        completion_cache=completion_cache
     )
     
     print("✅ DIAL Client initialized with all tools")
@@ -154,6 +157,21 @@ def main():
     print(f"✅ Passed: {passed_tests}")
     print(f"❌ Failed: {failed_tests}")
     print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+    if completion_cache is not None:
+        stats = completion_cache.stats
+        print(f"Completion cache: {stats.memory_hits} memory hits, {stats.disk_hits} disk hits, "
+              f"{stats.misses} misses ({stats.hit_rate:.0%} hit rate)")
+    user_cache_stats = user_client.cache_stats
+    print(f"User cache: {user_cache_stats.hits} hits, {user_cache_stats.misses} misses "
+          f"({user_cache_stats.hit_rate:.0%} hit rate)")
+    search_cache_stats = user_client.search_cache.stats
+    print(f"Search cache: {search_cache_stats.hits} hits, {search_cache_stats.misses} misses "
+          f"({search_cache_stats.hit_rate:.0%} hit rate)")
+    coalescing_stats = user_client.coalescing_stats
+    print(f"User service reads: {coalescing_stats.calls} sent, {coalescing_stats.coalesced} coalesced")
+    dial_client.close()
+    if mirror is not None:
+        mirror.close()
     
     print_separator()
     print("🎉 All automated tests completed!")
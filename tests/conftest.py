@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture
+def calls() -> list[str]:
+    """Names of tools executed by a client made with `tests.fakes.make_client`, in execution order"""
+    return []
@@ -0,0 +1,137 @@
+"""Stand-ins for DialClient tests: recording tools and scripted streamed responses"""
+import json
+import threading
+import time
+from typing import Any
+
+from benchmarks.stand_in_server import StandInServer
+from task.client import DialClient
+from task.tools.base import BaseTool
+from task.tracing import Tracer
+
+
+class RecordingTool(BaseTool):
+
+    def __init__(self, name: str, mutating: bool, calls: list[str]):
+        self.__name = name
+        self.__mutating = mutating
+        self.__calls = calls
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def description(self) -> str:
+        return self.__name
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    @property
+    def is_mutating(self) -> bool:
+        return self.__mutating
+
+    def execute(self, arguments: dict[str, Any]) -> str:
+        self.__calls.append(self.__name)
+        return f"{self.__name} done"
+
+
+class SlowTool(BaseTool):
+    """Records `start:<name>`/`end:<name>` events around a `delay` and the peak number of concurrent executions"""
+
+    def __init__(self, name: str, mutating: bool, events: list[str], delay: float = 0.05):
+        self.__name = name
+        self.__mutating = mutating
+        self.__events = events
+        self.__delay = delay
+        self.__running = 0
+        self.peak_concurrency = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def description(self) -> str:
+        return self.__name
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    @property
+    def is_mutating(self) -> bool:
+        return self.__mutating
+
+    def execute(self, arguments: dict[str, Any]) -> str:
+        with self.__lock:
+            self.__running += 1
+            self.peak_concurrency = max(self.peak_concurrency, self.__running)
+            self.__events.append(f"start:{self.__name}")
+        time.sleep(self.__delay)
+        with self.__lock:
+            self.__running -= 1
+            self.__events.append(f"end:{self.__name}")
+        return f"{self.__name} done"
+
+
+class StreamedResponse:
+    """Stands in for a streamed `requests.Response`, optionally failing after `fail_after` lines"""
+
+    def __init__(self, chunks: list[dict[str, Any]], fail_after: int | None = None):
+        self.encoding = "utf-8"
+        self.__lines = [f"data: {json.dumps(chunk)}" for chunk in chunks] + ["data: [DONE]"]
+        self.__fail_after = fail_after
+
+    def __enter__(self) -> "StreamedResponse":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        pass
+
+    def iter_lines(self, decode_unicode: bool = False):
+        for position, line in enumerate(self.__lines):
+            if position == self.__fail_after:
+                raise ConnectionError("stream dropped")
+            yield line
+
+
+def completion_chunks(finish_reason: str, tool_names: list[str]) -> list[dict[str, Any]]:
+    message = {
+        "role": "assistant",
+        "content": "",
+        "tool_calls": [
+            {"id": f"call_{i}", "type": "function", "function": {"name": name, "arguments": "{}"}}
+            for i, name in enumerate(tool_names)
+        ]
+    }
+    return StandInServer.completion_chunks({"choices": [{"message": message, "finish_reason": finish_reason}]})
+
+
+def final_chunks() -> list[dict[str, Any]]:
+    message = {"role": "assistant", "content": "All done"}
+    return StandInServer.completion_chunks({"choices": [{"message": message, "finish_reason": "stop"}]})
+
+
+def make_client(
+        calls: list[str],
+        responses: list[StreamedResponse],
+        max_tool_workers: int = 8,
+        tracer: Tracer | None = None,
+        **options: Any
+) -> DialClient:
+    """DialClient with a read-only `read` and a mutating `write` tool, answering rounds with `responses`"""
+    client = DialClient(
+        endpoint="http://dial.invalid",
+        deployment_name="test",
+        api_key="key",
+        tools=[RecordingTool("read", False, calls), RecordingTool("write", True, calls)],
+        max_tool_workers=max_tool_workers,
+        tracer=tracer,
+        **options
+    )
+    client._post_completion = lambda messages, deadline, **kwargs: responses.pop(0)
+    return client
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+from typing import Any
+
+from benchmarks.stand_in_server import StandInServer
+from task.async_client import AsyncDialClient
+from task.client import TurnBudgetExceeded
+from task.models.message import Message
+from task.models.role import Role
+from task.tools.base import AsyncBaseTool, SyncToolAdapter
+from tests.fakes import RecordingTool
+
+
+class SleepingTool(AsyncBaseTool):
+
+    def __init__(self, name: str, delay: float):
+        self.__name = name
+        self.__delay = delay
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def description(self) -> str:
+        return self.__name
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    async def execute(self, arguments: dict[str, Any]) -> str:
+        await asyncio.sleep(self.__delay)
+        return f"{self.__name} done"
+
+
+class ThreadRecordingTool(RecordingTool):
+    """Blocking tool that remembers the thread it ran in"""
+
+    def __init__(self, calls: list[str], delay: float):
+        super().__init__("get_user_by_id", False, calls)
+        self.__delay = delay
+        self.threads: list[threading.Thread] = []
+
+    def execute(self, arguments: dict[str, Any]) -> str:
+        self.threads.append(threading.current_thread())
+        threading.Event().wait(self.__delay)
+        return super().execute(arguments)
+
+
+def run_turn(server: StandInServer, tools: list, **options) -> tuple[list[Message], Message | Exception]:
+    async def turn() -> tuple[list[Message], Message | Exception]:
+        client = AsyncDialClient(
+            endpoint=server.url, deployment_name="gpt-4o", api_key="key", tools=tools, **options
+        )
+        messages = [Message(role=Role.USER, content="go")]
+        try:
+            return messages, await client.get_completion(messages)
+        except TurnBudgetExceeded as e:
+            return messages, e
+        finally:
+            await client.aclose()
+
+    return asyncio.run(turn())
+
+
+def test_tool_rounds_against_stand_in_server(calls):
+    with StandInServer(tool_rounds=2, tool_calls_per_round=2) as server:
+        messages, answer = run_turn(server, [RecordingTool("get_user_by_id", False, calls)])
+
+    assert answer.content == "Done after 2 tool rounds."
+    assert calls == ["get_user_by_id"] * 4
+    assert [message.role for message in messages] == [Role.USER] + [Role.AI, Role.TOOL, Role.TOOL] * 2
+
+
+def test_round_cap_raises(calls):
+    with StandInServer(tool_rounds=5) as server:
+        messages, error = run_turn(server, [RecordingTool("get_user_by_id", False, calls)], max_tool_rounds=1)
+
+    assert isinstance(error, TurnBudgetExceeded)
+    assert error.rounds == 1
+    assert [message.role for message in messages] == [Role.USER, Role.AI, Role.TOOL]
+
+
+def test_deadline_cancels_tool_calls_and_keeps_complete_rounds():
+    with StandInServer(tool_rounds=50) as server:
+        messages, error = run_turn(server, [SleepingTool("get_user_by_id", 0.1)], turn_timeout=0.25)
+
+    assert isinstance(error, TurnBudgetExceeded)
+    assert "deadline" in str(error)
+    assert 1 <= error.rounds <= 2
+    assert [message.role for message in messages] == [Role.USER] + [Role.AI, Role.TOOL] * error.rounds
+
+
+def test_blocking_tools_run_off_the_event_loop(calls):
+    tool = ThreadRecordingTool(calls, delay=0.1)
+    with StandInServer(tool_rounds=1, tool_calls_per_round=3) as server:
+        messages, answer = run_turn(server, [tool])
+
+    assert answer.content == "Done after 1 tool rounds."
+    assert threading.main_thread() not in tool.threads
+    assert len(tool.threads) == 3
+
+
+def test_sync_tool_adapter_keeps_loop_responsive(calls):
+    adapter = SyncToolAdapter(ThreadRecordingTool(calls, delay=0.1))
+
+    async def run() -> tuple[str, int]:
+        ticks = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        result = await adapter.execute({})
+        ticker.cancel()
+        return result, ticks
+
+    result, ticks = asyncio.run(run())
+
+    assert result == "get_user_by_id done"
+    assert ticks >= 5
+    assert adapter.name == "get_user_by_id" and not adapter.is_mutating
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+from typing import Any
+
+import httpx
+import pytest
+
+from task.resilience import HttpStatusError
+from task.tools.users.async_user_client import AsyncUserClient
+from task.tools.users.models.user_info import UserUpdate
+
+ENDPOINT = "http://users.invalid"
+
+
+class FakeAsyncTransport:
+    """In-memory user service; GETs wait for `release_gets` if it is set, every request takes `delay` seconds"""
+
+    def __init__(self, delay: float = 0.0):
+        self.users = {user_id: {"id": user_id, "name": f"User{user_id}", "company": "Acme"} for user_id in range(1, 4)}
+        self.requests: list[tuple[str, str]] = []
+        self.release_gets: asyncio.Event | None = None
+        self.delay = delay
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def request(self, method: str, url: str, deadline: float | None = None, **kwargs: Any) -> httpx.Response:
+        path = url.removeprefix(ENDPOINT)
+        self.requests.append((method, path))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            if self.release_gets is not None and method == "GET":
+                await self.release_gets.wait()
+            await asyncio.sleep(self.delay)
+            return self.__reply(method, path, kwargs)
+        finally:
+            self.in_flight -= 1
+
+    def __reply(self, method: str, path: str, kwargs: dict[str, Any]) -> httpx.Response:
+        if path == "/v1/users/search":
+            name = (kwargs.get("params") or {}).get("name", "")
+            return httpx.Response(200, json=[user for user in self.users.values() if name in user["name"]])
+        user_id = int(path.rsplit("/", 1)[1])
+        if user_id not in self.users:
+            return httpx.Response(404, json={"detail": "User not found"})
+        if method == "PUT":
+            self.users[user_id].update({key: value for key, value in kwargs["json"].items() if value is not None})
+            return httpx.Response(201, json=self.users[user_id])
+        if method == "DELETE":
+            del self.users[user_id]
+            return httpx.Response(204)
+        return httpx.Response(200, json=dict(self.users[user_id]))
+
+    async def aclose(self) -> None:
+        pass
+
+
+def test_update_and_delete_invalidate_cached_users_and_searches():
+    transport = FakeAsyncTransport()
+    client = AsyncUserClient(endpoint=ENDPOINT, transport=transport)
+
+    async def run() -> None:
+        await client.get_user_info(1)
+        await client.search_users(name="User")
+        await client.update_user(1, UserUpdate(company="EPAM Systems"))
+
+        assert (await client.get_user_info(1))["company"] == "EPAM Systems"
+        await client.search_users(name="User")
+
+        await client.get_user_info(2)
+        await client.delete_user(2)
+        with pytest.raises(HttpStatusError):
+            await client.get_user_info(2)
+
+    asyncio.run(run())
+
+    assert transport.requests == [
+        ("GET", "/v1/users/1"), ("GET", "/v1/users/search"), ("PUT", "/v1/users/1"),
+        ("GET", "/v1/users/1"), ("GET", "/v1/users/search"),
+        ("GET", "/v1/users/2"), ("DELETE", "/v1/users/2"), ("GET", "/v1/users/2"),
+    ]
+
+
+def test_fetch_started_before_an_update_does_not_fill_the_cache():
+    transport = FakeAsyncTransport()
+    client = AsyncUserClient(endpoint=ENDPOINT, transport=transport)
+
+    async def run() -> tuple[dict[str, Any], dict[str, Any]]:
+        transport.release_gets = asyncio.Event()
+        stale_fetch = asyncio.create_task(client.get_user_info(1))
+        await asyncio.sleep(0)
+        await client.update_user(1, UserUpdate(company="EPAM Systems"))
+        # the fetch was answered with pre-update data, which must not be cached
+        transport.users[1]["company"] = "Acme"
+        transport.release_gets.set()
+        stale = await stale_fetch
+        transport.users[1]["company"] = "EPAM Systems"
+        return stale, await client.get_user_info(1)
+
+    stale, fresh = asyncio.run(run())
+
+    assert stale["company"] == "Acme"
+    assert fresh["company"] == "EPAM Systems"
+    assert transport.requests.count(("GET", "/v1/users/1")) == 2
+
+
+def test_requests_in_flight_are_capped():
+    transport = FakeAsyncTransport(delay=0.02)
+    client = AsyncUserClient(endpoint=ENDPOINT, transport=transport, max_concurrency=2)
+
+    async def run() -> None:
+        await asyncio.gather(*(client.get_user_info(user_id) for user_id in (1, 2, 3)), client.search_users())
+
+    asyncio.run(run())
+
+    assert transport.peak_in_flight == 2
+
+
+def test_request_timeout():
+    client = AsyncUserClient(endpoint=ENDPOINT, transport=FakeAsyncTransport(delay=1.0), timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.get_user_info(1))
+
+
+def test_blocking_client_close_stops_its_loop_thread():
+    transport = FakeAsyncTransport()
+    blocking = AsyncUserClient(endpoint=ENDPOINT, transport=transport).sync()
+
+    assert blocking.get_user_info(1)["name"] == "User1"
+    assert any(thread.name == "user-client-loop" for thread in threading.enumerate())
+
+    blocking.close()
+
+    assert not any(thread.name == "user-client-loop" for thread in threading.enumerate())
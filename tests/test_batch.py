@@ -0,0 +1,64 @@
+import io
+import json
+
+from task.batch import read_batch, run_batch
+from task.models.message import Message
+from task.models.role import Role
+
+
+class EchoClient:
+    """Answers every conversation with its last message"""
+
+    def get_completion(self, messages: list[Message], **kwargs) -> Message:
+        return Message(role=Role.AI, content=messages[-1].content)
+
+
+def test_read_batch_accepts_queries_messages_and_requests_records():
+    lines = [
+        json.dumps({"id": "q", "query": "hi"}),
+        "",
+        json.dumps({"id": "m", "messages": [{"role": "user", "content": "hello"}]}),
+        json.dumps({"request_id": "r", "body": "hey"})
+    ]
+
+    items = list(read_batch(lines, system_prompt="system"))
+
+    assert [item.id for item in items] == ["q", "m", "r"]
+    assert all(item.error is None and item.messages[0].role == Role.SYSTEM for item in items)
+    assert [item.messages[-1].content for item in items] == ["hi", "hello", "hey"]
+
+
+def test_malformed_lines_become_failed_items():
+    lines = ["{not json", json.dumps(["a list"]), json.dumps({"id": "x"}), json.dumps({"id": "ok", "query": "hi"})]
+
+    items = list(read_batch(lines))
+
+    assert [item.error is not None for item in items] == [True, True, True, False]
+    assert items[0].error.startswith("Line 1:")
+
+
+def test_run_batch_reports_malformed_lines_and_keeps_going():
+    lines = [json.dumps({"id": "a", "query": "one"}), "{broken", json.dumps({"id": "b", "query": "two"})]
+    output = io.StringIO()
+
+    summary = run_batch(EchoClient(), read_batch(lines, system_prompt=None), output, concurrency=2)
+
+    results = {result["id"]: result for result in map(json.loads, output.getvalue().splitlines())}
+    assert summary.conversations == 3 and summary.failed == 1
+    assert results["a"]["content"] == "one" and results["b"]["content"] == "two"
+    assert not results["2"]["ok"] and "Line 2" in results["2"]["error"]
+
+
+class BrokenOutput(io.StringIO):
+
+    def write(self, text: str) -> int:
+        raise OSError("disk full")
+
+
+def test_failed_result_writes_do_not_block_the_batch():
+    lines = [json.dumps({"id": str(number), "query": "hi"}) for number in range(6)]
+
+    # with a single slot pair, a leaked slot would block the submit loop on the third item
+    summary = run_batch(EchoClient(), read_batch(lines, system_prompt=None), BrokenOutput(), concurrency=1)
+
+    assert summary.conversations == 6
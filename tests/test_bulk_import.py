@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from task.tools.users.bulk_import import InvalidRecord, import_users, read_records, validate
+
+
+def user(number: int) -> dict:
+    return {"name": f"Name{number}", "surname": f"Surname{number}", "email": f"user{number}@example.com", "about_me": "-"}
+
+
+class FakeUserClient:
+
+    def __init__(self):
+        self.next_id = 100
+
+    def create_user(self, user_create) -> dict:
+        if user_create.email == "user2@example.com":
+            raise RuntimeError("HTTP 409: email taken")
+        if user_create.email == "user3@example.com":
+            return {}
+        self.next_id += 1
+        return {"id": self.next_id}
+
+
+def test_validate_collects_every_invalid_record():
+    valid, invalid = validate([user(1), {"name": "No", "email": "no@example.com"}, "junk", InvalidRecord("line 4: bad")])
+
+    assert [number for number, _ in valid] == [1]
+    assert [result.record for result in invalid] == [2, 3, 4]
+    assert "surname" in invalid[0].error and invalid[0].email == "no@example.com"
+    assert invalid[2].error == "line 4: bad"
+
+
+def test_import_users_reports_created_failed_and_unknown_ids():
+    summary = import_users(FakeUserClient(), [user(1), user(2), user(3), {"name": "x"}], concurrency=2)
+
+    assert [result.record for result in summary.results] == [1, 2, 3, 4]
+    assert summary.created == 2
+    report = summary.report()
+    assert report.startswith("Created 2 of 4 users")
+    assert "Created ids (record:id): 1:101" in report
+    assert "Created, id unknown (records): 3" in report
+    assert "#2 (user2@example.com): HTTP 409: email taken" in report
+    assert "None" not in report
+
+
+def test_read_records_reports_bad_jsonl_lines(tmp_path):
+    path = tmp_path / "users.jsonl"
+    path.write_text(json.dumps(user(1)) + "\n{oops\n\n" + json.dumps(user(2)) + "\n", encoding="utf-8")
+
+    records = read_records(path)
+
+    assert records[0] == user(1) and records[2] == user(2)
+    assert isinstance(records[1], InvalidRecord) and records[1].error.startswith("line 2:")
+
+
+def test_read_records_rejects_json_object(tmp_path):
+    path = tmp_path / "users.json"
+    path.write_text(json.dumps(user(1)), encoding="utf-8")
+
+    with pytest.raises(ValueError, match="JSON array"):
+        read_records(path)
+
+
+def test_read_records_nests_dotted_csv_columns(tmp_path):
+    path = tmp_path / "users.csv"
+    path.write_text("name,email,address.city,address.country,phone\nAnn, ann@example.com ,Kyiv,UA,\n", encoding="utf-8")
+
+    assert read_records(path) == [
+        {"name": "Ann", "email": "ann@example.com", "address": {"city": "Kyiv", "country": "UA"}}
+    ]
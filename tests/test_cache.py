@@ -0,0 +1,45 @@
+import time
+
+from task.cache import LRUCache
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert (cache.stats.hits, cache.stats.misses) == (3, 1)
+
+
+def test_entries_expire_after_ttl():
+    cache = LRUCache(ttl=0.05)
+    cache.set("a", 1)
+
+    assert cache.get("a") == 1
+    time.sleep(0.06)
+    assert cache.get("a", "expired") == "expired"
+    assert len(cache) == 0
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_set_refreshes_ttl():
+    cache = LRUCache(ttl=0.1)
+    cache.set("a", 1)
+    time.sleep(0.06)
+    cache.set("a", 2)
+    time.sleep(0.06)
+
+    assert cache.get("a") == 2
+
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUCache(max_entries=0)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.pop("a") is None
@@ -0,0 +1,40 @@
+import pytest
+
+from task.models.message import Message
+from task.models.role import Role
+from tests.fakes import StreamedResponse, completion_chunks, final_chunks, make_client
+
+
+@pytest.mark.parametrize("finish_reason", ["length", "stop"])
+def test_mutating_tool_not_run_when_stream_does_not_finish_with_tool_calls(calls, finish_reason):
+    client = make_client(calls, [StreamedResponse(completion_chunks(finish_reason, ["write", "read"]))])
+    messages = [Message(role=Role.USER, content="go")]
+
+    client.get_completion(messages, stream=True)
+
+    assert "write" not in calls
+    assert len(messages) == 1
+
+
+def test_mutating_tool_not_run_when_stream_fails(calls):
+    chunks = completion_chunks("tool_calls", ["write", "read"])
+    client = make_client(calls, [StreamedResponse(chunks, fail_after=len(chunks) - 1)])
+
+    with pytest.raises(ConnectionError):
+        client.get_completion([Message(role=Role.USER, content="go")], stream=True)
+
+    assert "write" not in calls
+
+
+@pytest.mark.parametrize("max_tool_workers", [1, 8])
+def test_tool_calls_run_once_stream_finishes_with_tool_calls(calls, max_tool_workers):
+    responses = [StreamedResponse(completion_chunks("tool_calls", ["write", "read"])), StreamedResponse(final_chunks())]
+    client = make_client(calls, responses, max_tool_workers)
+    messages = [Message(role=Role.USER, content="go")]
+
+    answer = client.get_completion(messages, stream=True)
+
+    assert answer.content == "All done"
+    assert sorted(calls) == ["read", "write"]
+    assert [message.role for message in messages] == [Role.USER, Role.AI, Role.TOOL, Role.TOOL]
+    assert [message.tool_call_id for message in messages[2:]] == ["call_0", "call_1"]
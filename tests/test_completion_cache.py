@@ -0,0 +1,76 @@
+from task.cache import CompletionCache
+from task.models.message import Message
+from task.models.role import Role
+from tests.fakes import StreamedResponse, completion_chunks, final_chunks, make_client
+
+CHOICE = {"message": {"role": "assistant", "content": "Hi"}, "finish_reason": "stop"}
+
+
+def test_memory_tier_hit():
+    cache = CompletionCache(max_entries=2)
+    key = CompletionCache.key("http://dial/a", b'{"messages": []}')
+    cache.set(key, CHOICE)
+
+    assert cache.get(key) == CHOICE
+    assert cache.get(CompletionCache.key("http://dial/b", b'{"messages": []}')) is None
+    assert (cache.stats.memory_hits, cache.stats.disk_hits, cache.stats.misses) == (1, 0, 1)
+
+
+def test_disk_tier_round_trip(tmp_path):
+    key = CompletionCache.key("http://dial/a", b"body")
+    CompletionCache(directory=tmp_path).set(key, CHOICE)
+
+    cache = CompletionCache(directory=tmp_path)
+    assert cache.get(key) == CHOICE
+    assert cache.get(key) == CHOICE
+    assert (cache.stats.memory_hits, cache.stats.disk_hits) == (1, 1)
+
+    cache.clear()
+    assert cache.get(key) is None
+
+
+def run_turn(client) -> list[Message]:
+    messages = [Message(role=Role.USER, content="go")]
+    client.get_completion(messages, print_request=False, stream=True)
+    return messages
+
+
+def test_repeated_turn_is_answered_from_cache(calls):
+    responses = [StreamedResponse(completion_chunks("tool_calls", ["read"])), StreamedResponse(final_chunks())]
+    client = make_client(calls, responses, completion_cache=CompletionCache())
+
+    first = run_turn(client)
+    second = run_turn(client)
+
+    assert [message.to_dict() for message in second] == [message.to_dict() for message in first]
+    assert calls == ["read", "read"]
+
+
+def test_rounds_requesting_mutating_tools_are_not_cached(calls):
+    responses = [
+        StreamedResponse(completion_chunks("tool_calls", ["write"])), StreamedResponse(final_chunks()),
+        StreamedResponse(completion_chunks("tool_calls", ["write"])),
+    ]
+    cache = CompletionCache()
+    client = make_client(calls, responses, completion_cache=cache)
+
+    run_turn(client)
+    run_turn(client)
+
+    # the write round went to the model again, the final round after it came from the cache
+    assert responses == []
+    assert calls == ["write", "write"]
+    assert cache.stats.memory_hits == 1
+
+
+def test_use_cache_false_bypasses_cache(calls):
+    responses = [StreamedResponse(final_chunks()), StreamedResponse(final_chunks())]
+    cache = CompletionCache()
+    client = make_client(calls, responses, completion_cache=cache)
+
+    for _ in range(2):
+        messages = [Message(role=Role.USER, content="go")]
+        client.get_completion(messages, print_request=False, stream=True, use_cache=False)
+
+    assert responses == []
+    assert (cache.stats.memory_hits, cache.stats.misses) == (0, 0)
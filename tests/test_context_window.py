@@ -0,0 +1,64 @@
+from task.models.context_window import ContextWindow, estimate_tokens
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+
+
+def tool_round(call_id: str, result: str) -> list[Message]:
+    return [
+        Message(role=Role.AI, content="", tool_calls=[ToolCall(id=call_id, name="search_users", arguments="{}")]),
+        Message(role=Role.TOOL, content=result, tool_call_id=call_id, name="search_users")
+    ]
+
+
+def total_tokens(messages: list[Message]) -> int:
+    return sum(estimate_tokens(message) for message in messages)
+
+
+def test_messages_within_budget_are_returned_as_is():
+    messages = [Message(role=Role.SYSTEM, content="system"), Message(role=Role.USER, content="hi")]
+
+    assert ContextWindow(max_tokens=1000).fit(messages) is messages
+
+
+def test_oldest_turns_are_dropped_whole():
+    old_turn = [Message(role=Role.USER, content="old " * 500), *tool_round("a", "x" * 2000)]
+    current = [Message(role=Role.USER, content="now")]
+    messages = [Message(role=Role.SYSTEM, content="system"), *old_turn, *current]
+
+    fitted = ContextWindow(max_tokens=100).fit(messages)
+
+    assert fitted == [messages[0], *current]
+
+
+def test_tool_results_of_current_turn_are_condensed_oldest_first():
+    window = ContextWindow(max_tokens=900, condensed_tool_result_chars=100)
+    messages = [
+        Message(role=Role.USER, content="find users"),
+        *tool_round("a", "a" * 2000),
+        *tool_round("b", "b" * 2000)
+    ]
+
+    fitted = window.fit(messages)
+
+    assert total_tokens(fitted) <= window.max_tokens
+    assert len(fitted[2].content) < 200
+    assert fitted[4] is messages[4]
+    assert [message.tool_call_id for message in fitted] == [message.tool_call_id for message in messages]
+
+
+def test_reserved_tokens_count_towards_budget():
+    window = ContextWindow(max_tokens=600, condensed_tool_result_chars=100)
+    messages = [Message(role=Role.USER, content="find users"), *tool_round("a", "a" * 2000)]
+
+    assert window.fit(messages) is messages
+    assert window.fit(messages, reserved_tokens=500) is not messages
+
+
+def test_condensed_messages_are_reused_between_rounds():
+    window = ContextWindow(max_tokens=100, condensed_tool_result_chars=100)
+    messages = [Message(role=Role.USER, content="find users"), *tool_round("a", "a" * 2000)]
+
+    first = window.fit(messages)[2]
+    first.to_json()
+
+    assert window.fit(messages)[2] is first
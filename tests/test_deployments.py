@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+
+from task.deployments import Deployment, DeploymentPool
+from task.resilience import HttpStatusError
+
+FIRST = Deployment("http://first", "model")
+SECOND = Deployment("http://second", "model")
+THIRD = Deployment("http://third", "model")
+
+
+def warmed_up_pool(hedge_percentile: float | None, max_hedge_workers: int = 8) -> DeploymentPool:
+    pool = DeploymentPool(
+        [FIRST, SECOND, THIRD],
+        hedge_percentile=hedge_percentile,
+        hedge_min_samples=2,
+        max_hedge_workers=max_hedge_workers
+    )
+    for deployment in (FIRST, SECOND, THIRD):
+        pool.record_success(deployment, 0.01)
+    return pool
+
+
+def test_failed_deployment_cools_down_and_goes_last():
+    pool = DeploymentPool([FIRST, SECOND], failure_cooldown=60)
+    pool.record_failure(FIRST)
+
+    assert pool.candidates() == [SECOND, FIRST]
+
+
+def test_call_fails_over_on_transient_errors_only():
+    pool = DeploymentPool([FIRST, SECOND])
+    sent = []
+
+    def send(deployment: Deployment) -> str:
+        sent.append(deployment)
+        if len(sent) == 1:
+            raise HttpStatusError("Error: 502", status_code=502)
+        return deployment.url
+
+    assert pool.call(send) == sent[1].url
+    assert len(sent) == 2
+
+    def bad_request(deployment: Deployment) -> str:
+        raise HttpStatusError("Error: 400", status_code=400)
+
+    with pytest.raises(HttpStatusError):
+        pool.call(bad_request)
+
+
+def test_hedging_is_off_by_default():
+    pool = warmed_up_pool(hedge_percentile=None)
+
+    assert pool.hedge_delay is None
+    assert warmed_up_pool(hedge_percentile=50).hedge_delay == pytest.approx(0.01)
+
+
+def test_hedged_call_does_not_send_queued_losers():
+    pool = warmed_up_pool(hedge_percentile=50, max_hedge_workers=1)
+    release = threading.Event()
+    sent = []
+
+    def send(deployment: Deployment) -> str:
+        sent.append(deployment)
+        release.wait(1)
+        return deployment.url
+
+    # the only worker is busy with the first request, so the hedges are queued
+    timer = threading.Timer(0.1, release.set)
+    timer.start()
+    try:
+        result = pool.call(send, hedge=True)
+    finally:
+        timer.cancel()
+        pool.close()
+
+    assert result == sent[0].url
+    assert len(sent) == 1
+    assert sum(stats.hedges for stats in pool.stats.values()) == 2
+
+
+def test_hedged_call_after_close_starts_new_workers():
+    pool = warmed_up_pool(hedge_percentile=50)
+    pool.call(lambda deployment: deployment.url, hedge=True)
+    pool.close()
+    pool.close()
+
+    assert pool.call(lambda deployment: deployment.url, hedge=True).startswith("http://")
+    pool.close()
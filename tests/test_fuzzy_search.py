@@ -0,0 +1,62 @@
+import pytest
+
+from benchmarks.stand_in_server import StandInServer
+from task.tools.users.fuzzy import TrigramIndex, trigrams
+from task.tools.users.fuzzy_search_users_tool import FuzzySearchUsersTool
+from task.tools.users.mirror import UserMirror
+from task.tools.users.user_client import UserClient
+from task.transport import HttpTransport
+
+
+def user(user_id: int, name: str, surname: str) -> dict:
+    return {"id": user_id, "name": name, "surname": surname, "email": f"{name}.{surname}@example.com".lower()}
+
+
+def test_trigrams_are_padded_and_case_folded():
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+    assert trigrams("AB, ab") == trigrams("ab")
+    assert trigrams("") == set()
+
+
+def test_search_tolerates_typos_and_ranks_by_similarity():
+    index = TrigramIndex()
+    for item in [user(1, "Andrej", "Karpathy"), user(2, "John", "Smith"), user(3, "Joan", "Smithers")]:
+        index.update(None, item)
+
+    (similarity, best), *_ = index.search("Andrei Karpaty")
+
+    assert best["id"] == 1 and 0.4 <= similarity < 1
+    assert [found["id"] for _, found in index.search("John Smith", limit=2)] == [2, 3]
+    assert index.search("zzzz") == []
+
+
+def test_update_replaces_and_removes_users():
+    index = TrigramIndex()
+    index.update(None, user(1, "John", "Smith"))
+    index.update(user(1, "John", "Smith"), user(1, "Mary", "Jones"))
+
+    assert index.search("John Smith") == []
+    assert index.search("Mary Jones")[0][1]["name"] == "Mary"
+
+    index.update(user(1, "Mary", "Jones"), None)
+    assert len(index) == 0 and index.search("Mary Jones") == []
+
+
+@pytest.fixture
+def server():
+    with StandInServer(user_count=20) as server:
+        yield server
+
+
+def test_tool_refuses_to_search_a_mirror_that_is_not_fresh(server):
+    with HttpTransport() as transport:
+        mirror = UserMirror(server.url, transport=transport, refresh_interval=None)
+        tool = FuzzySearchUsersTool(UserClient(server.url, transport=transport), mirror)
+        someone = next(iter(server.users.values()))
+
+        assert "mirror is not ready" in tool.execute({"query": someone["surname"]})
+
+        mirror.refresh()
+        result = tool.execute({"query": someone["surname"]})
+
+    assert result.startswith("Found") and someone["surname"] in result
@@ -0,0 +1,71 @@
+import threading
+
+from task.client import DialClient
+from task.tools.users.get_users_by_ids_tool import GetUsersByIdsTool
+from task.tools.users.rendering import BlockRenderer, JsonRenderer
+
+
+class FakeUserClient:
+    renderer = BlockRenderer()
+
+    def __init__(self):
+        self.requested: list[int] = []
+        self.threads: set[str] = set()
+
+    def get_user_info(self, user_id: int) -> dict:
+        self.requested.append(user_id)
+        self.threads.add(threading.current_thread().name)
+        if user_id == 404:
+            raise RuntimeError("HTTP 404: not found")
+        return {"id": user_id, "name": f"User{user_id}"}
+
+
+def test_schema_declares_integer_ids():
+    tool = GetUsersByIdsTool(FakeUserClient())
+
+    assert tool.input_schema["properties"]["ids"]["items"] == {"type": "integer"}
+
+
+def test_non_integral_ids_are_rejected():
+    client = FakeUserClient()
+    tool = GetUsersByIdsTool(client)
+
+    result = tool.execute({"ids": [1, 1.7, "2", True]})
+
+    assert result.startswith("Error while retrieving users by ids: IDs must be integers")
+    assert "1.7" in result and client.requested == []
+
+
+def test_fetches_unique_ids_and_reports_failures():
+    client = FakeUserClient()
+    tool = GetUsersByIdsTool(client, renderer=JsonRenderer())
+
+    result = tool.execute({"ids": [1, 2.0, 1, 404]})
+
+    assert sorted(client.requested) == [1, 2, 404]
+    assert result.startswith("Found 2 of 3 users:")
+    assert "id 404: HTTP 404: not found" in result
+
+
+def test_worker_threads_are_reused_between_calls():
+    client = FakeUserClient()
+    tool = GetUsersByIdsTool(client, max_workers=2)
+
+    for _ in range(5):
+        tool.execute({"ids": [1, 2, 3, 4]})
+
+    assert len(client.threads) <= 2
+
+
+def test_client_close_stops_worker_threads():
+    client = FakeUserClient()
+    tool = GetUsersByIdsTool(client)
+    dial_client = DialClient(endpoint="http://dial.invalid", deployment_name="test", api_key="key", tools=[tool])
+    tool.execute({"ids": [1, 2]})
+    workers = [thread for thread in threading.enumerate() if thread.name in client.threads]
+
+    dial_client.close()
+
+    for worker in workers:
+        worker.join(1)
+    assert workers and not any(worker.is_alive() for worker in workers)
@@ -0,0 +1,48 @@
+import dataclasses
+import json
+
+import pytest
+
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+
+TOOL_CALL = {"id": "call_1", "type": "function", "function": {"name": "get_user_by_id", "arguments": '{"id": 1}'}}
+
+MESSAGES = [
+    Message(role=Role.USER, content="Who is user 1? Ünïcödé"),
+    Message(role=Role.AI, content="", tool_calls=[TOOL_CALL]),
+    Message(role=Role.TOOL, content="John Smith", tool_call_id="call_1", name="get_user_by_id"),
+]
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_dict_and_json_round_trip(message):
+    assert Message.from_dict(message.to_dict()) == message
+    assert Message.from_json(message.to_json()) == message
+    assert json.loads(message.to_json()) == message.to_dict()
+
+
+@pytest.mark.parametrize("fast_json", [True, False])
+def test_wire_encoding_is_cached(fast_json):
+    message = Message(role=Role.AI, content="", tool_calls=[TOOL_CALL])
+
+    wire = message.to_json(fast_json)
+
+    assert message.to_json(fast_json) is wire
+    assert json.loads(wire)["tool_calls"] == [TOOL_CALL]
+
+
+def test_tool_calls_are_stored_as_tool_call_records():
+    message = Message.from_dict({"role": "assistant", "content": "", "tool_calls": [TOOL_CALL]})
+
+    assert message.role is Role.AI
+    assert message.tool_calls == (ToolCall(id="call_1", name="get_user_by_id", arguments='{"id": 1}'),)
+    assert Message(role=Role.AI, content="", tool_calls=[]).tool_calls is None
+
+
+def test_message_is_frozen_and_slotted():
+    message = MESSAGES[0]
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        message.content = "changed"
+    assert not hasattr(message, "__dict__")
@@ -0,0 +1,98 @@
+from typing import Any
+
+from task.tools.users.mirror import UserMirror
+
+USERS = [
+    {"id": 1, "name": "John", "surname": "Smith", "email": "john.smith@example.com", "gender": "male"},
+    {"id": 2, "name": "Johanna", "surname": "Adams", "email": "jo.adams@example.com", "gender": "female"},
+    {"id": 3, "name": "Peter", "surname": "Johnson", "email": "peter@example.com", "gender": "male"},
+]
+
+
+class FakeResponse:
+
+    def __init__(self, payload: Any):
+        self.__payload = payload
+
+    def raise_for_status(self) -> None:
+        pass
+
+    def json(self) -> Any:
+        return self.__payload
+
+
+class UsersTransport:
+    """Answers the bulk load with `users`, calling `during_fetch` first (e.g. to apply a concurrent mutation)"""
+
+    def __init__(self, users: list[dict[str, Any]]):
+        self.users = users
+        self.during_fetch = None
+
+    def get(self, url: str, headers: dict[str, str]) -> FakeResponse:
+        if self.during_fetch is not None:
+            self.during_fetch()
+        return FakeResponse([dict(user) for user in self.users])
+
+
+def loaded_mirror(users: list[dict[str, Any]] = USERS) -> tuple[UserMirror, UsersTransport]:
+    transport = UsersTransport(users)
+    mirror = UserMirror("http://users.invalid", transport=transport, refresh_interval=None).start()
+    return mirror, transport
+
+
+def ids(users: list[dict[str, Any]]) -> list[int]:
+    return [user["id"] for user in users]
+
+
+def test_prefix_and_infix_matches():
+    mirror, _ = loaded_mirror()
+
+    assert ids(mirror.search({"name": "joh"})) == [1, 2]
+    assert ids(mirror.search({"surname": "son"})) == [3]
+    assert ids(mirror.search({"email": "example"})) == [1, 2, 3]
+    assert ids(mirror.search({"name": "joh", "surname": "adams"})) == [2]
+    assert mirror.search({"name": "nobody"}) == []
+
+
+def test_gender_matches_exactly():
+    mirror, _ = loaded_mirror()
+
+    assert ids(mirror.search({"gender": "male"})) == [1, 3]
+    assert ids(mirror.search({"gender": "female"})) == [2]
+    assert mirror.search({"gender": "mal"}) == []
+
+
+def test_upsert_and_remove_keep_indexes_in_step():
+    mirror, _ = loaded_mirror()
+
+    mirror.upsert({**USERS[0], "name": "Jack"})
+    assert ids(mirror.search({"name": "joh"})) == [2]
+    assert ids(mirror.search({"name": "jack"})) == [1]
+
+    mirror.remove(2)
+    assert mirror.search({"name": "joh"}) == []
+    assert ids(mirror.search({"gender": "female"})) == []
+    assert len(mirror) == 2
+
+    mirror.upsert({"id": 4, "name": "Johnny", "surname": "Bravo", "email": "j@example.com", "gender": "male"})
+    assert ids(mirror.search({"name": "john"})) == [4]
+
+
+def test_refresh_applies_changes_and_removals():
+    mirror, transport = loaded_mirror()
+    transport.users = [{**USERS[0], "surname": "Doe"}, USERS[2]]
+
+    assert mirror.refresh()
+    assert ids(mirror.search({"surname": "smith"})) == []
+    assert ids(mirror.search({"surname": "doe"})) == [1]
+    assert ids(mirror.search({})) == [1, 3]
+
+
+def test_refresh_racing_with_a_mutation_keeps_the_mutation():
+    mirror, transport = loaded_mirror()
+    # the bulk load is answered with data from before the update applied while it was in flight
+    transport.during_fetch = lambda: mirror.upsert({**USERS[0], "name": "Jack"})
+
+    assert not mirror.refresh()
+    assert ids(mirror.search({"name": "jack"})) == [1]
+    assert mirror.is_fresh
@@ -0,0 +1,45 @@
+import json
+
+from task.tools.users.rendering import BlockRenderer, JsonRenderer, TableRenderer, flatten, mask
+
+USER = {
+    "id": 1,
+    "name": "Ann",
+    "address": {"city": "Kyiv", "country": "UA"},
+    "credit_card": {"num": "1234-5678-9012-3456", "cvv": "123", "exp_date": "01/30"}
+}
+
+
+def test_block_renderer_keeps_original_unmasked_format():
+    assert BlockRenderer().render_one(USER) == (
+        "```\n"
+        "  id: 1\n"
+        "  name: Ann\n"
+        "  address: {'city': 'Kyiv', 'country': 'UA'}\n"
+        "  credit_card: {'num': '1234-5678-9012-3456', 'cvv': '123', 'exp_date': '01/30'}\n"
+        "```\n"
+    )
+    assert BlockRenderer().render([USER, USER]) == BlockRenderer().render_one(USER) * 2 + "\n"
+
+
+def test_masking_is_opt_in():
+    assert "1234-5678-9012-3456" in TableRenderer().render([USER])
+    assert json.loads(JsonRenderer().render_one(USER))["credit_card"]["cvv"] == "123"
+
+    masked = json.loads(JsonRenderer(mask=True).render_one(USER))["credit_card"]
+    assert masked == {"num": "**** 3456", "cvv": "***", "exp_date": "01/30"}
+
+
+def test_mask_and_flatten_do_not_modify_input():
+    original = json.dumps(USER)
+
+    assert flatten(mask(USER))["credit_card.num"] == "**** 3456"
+    assert flatten(USER)["address.city"] == "Kyiv"
+    assert json.dumps(USER) == original
+    assert mask({"id": 2}) == {"id": 2}
+
+
+def test_table_renderer_unions_columns_and_escapes_separators():
+    table = TableRenderer().render([{"id": 1, "name": "A\tB"}, {"id": 2, "email": "b@example.com"}])
+
+    assert table.splitlines() == ["id\tname\temail", "1\tA B\t", "2\t\tb@example.com"]
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from task.resilience import CircuitBreaker, CircuitOpenError, Resilience, RetryPolicy, parse_retry_after
+
+
+def test_retry_policy_backoff_is_capped_and_respects_retry_after():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+
+    assert all(0 <= policy.delay(attempt) <= min(5.0, 2 ** (attempt - 1)) for attempt in range(1, 8))
+    assert policy.delay(1, retry_after=2.5) == 2.5
+    assert policy.delay(1, retry_after=60) == 5.0
+    assert RetryPolicy(respect_retry_after=False, base_delay=0.001).delay(1, retry_after=60) <= 0.001
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+@pytest.mark.parametrize("method, retry, expected", [
+    ("GET", None, True),
+    ("put", None, True),
+    ("POST", None, False),
+    ("POST", True, True),
+    ("DELETE", None, False),
+    ("GET", False, False),
+])
+def test_should_retry(method, retry, expected):
+    assert Resilience().should_retry(method, retry) is expected
+
+
+def test_retry_delay_stops_at_max_attempts_and_deadline():
+    resilience = Resilience(RetryPolicy(max_attempts=2, base_delay=0.01))
+
+    assert resilience.retry_delay(1, deadline=None) is not None
+    assert resilience.retry_delay(2, deadline=None) is None
+    assert resilience.retry_delay(1, deadline=time.monotonic(), retry_after=1.0) is None
+
+
+def test_endpoint_key_collapses_ids():
+    assert Resilience.endpoint_key("GET", "http://users/v1/users/42?x=1") == "GET http://users/v1/users/{id}"
+
+
+def test_circuit_breaker_opens_and_lets_one_probe_through():
+    breaker = CircuitBreaker("endpoint", failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.06)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.before_call()
+
+
+def test_failed_probe_opens_circuit_again():
+    breaker = CircuitBreaker("endpoint", failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
@@ -0,0 +1,108 @@
+from typing import Any
+
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+from task.tools.base import ToolDefinition
+from task.cache import CompletionCache
+from task.tools.routing import KeywordToolRouter, keywords
+from tests.fakes import StreamedResponse, completion_chunks, final_chunks, make_client
+
+
+class Tool(ToolDefinition):
+
+    def __init__(self, name: str, description: str):
+        self.__name = name
+        self.__description = description
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def description(self) -> str:
+        return self.__description
+
+    @property
+    def input_schema(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+
+TOOLS = [
+    Tool("web_search_tool", "Searches the web for current information about people or topics"),
+    Tool("get_user_by_id", "Retrieves full user information by user ID"),
+    Tool("search_users", "Searches users by name, surname, email or gender"),
+    Tool("add_user", "Creates a new user in the system"),
+    Tool("update_user", "Updates information of an existing user"),
+    Tool("delete_user", "Deletes a user from the system"),
+]
+
+
+def names(tools: list[Tool]) -> list[str]:
+    return [tool.name for tool in tools]
+
+
+def tool_round(name: str, result: str) -> list[Message]:
+    return [
+        Message(role=Role.AI, content="", tool_calls=[ToolCall(id="call", name=name, arguments="{}")]),
+        Message(role=Role.TOOL, content=result, tool_call_id="call", name=name)
+    ]
+
+
+def test_keywords_merge_synonyms_and_plurals():
+    assert keywords("Please remove the users") == ["delete", "user"]
+    assert keywords("Find people living in Kyiv") == ["search", "user", "liv", "kyiv"]
+
+
+def test_selects_tools_matching_last_user_message():
+    selected = names(KeywordToolRouter().select([Message(role=Role.USER, content="delete user 5")], TOOLS))
+
+    assert "delete_user" in selected
+    assert "web_search_tool" not in selected and "add_user" not in selected
+
+
+def test_offers_all_tools_without_any_match():
+    messages = [Message(role=Role.USER, content="hello there")]
+
+    assert KeywordToolRouter().select(messages, TOOLS) == TOOLS
+
+
+def test_keeps_tools_called_earlier_in_the_turn():
+    messages = [Message(role=Role.USER, content="delete user 5"), *tool_round("get_user_by_id", "{...}")]
+
+    assert "get_user_by_id" in names(KeywordToolRouter().select(messages, TOOLS))
+
+
+def test_offers_all_tools_after_failed_tool_call():
+    messages = [
+        Message(role=Role.USER, content="update his email"),
+        *tool_round("update_user", "Error while updating user: HTTP 404")
+    ]
+
+    assert KeywordToolRouter().select(messages, TOOLS) == TOOLS
+
+
+def test_offers_all_tools_after_round_without_tool_calls():
+    messages = [Message(role=Role.USER, content="update his email"), Message(role=Role.AI, content="Which user?")]
+
+    assert KeywordToolRouter().select(messages, TOOLS) == TOOLS
+
+
+class CountingRouter(KeywordToolRouter):
+
+    def __init__(self):
+        super().__init__()
+        self.selections = 0
+
+    def select(self, messages, tools):
+        self.selections += 1
+        return super().select(messages, tools)
+
+
+def test_client_routes_once_per_round(calls):
+    router = CountingRouter()
+    responses = [StreamedResponse(completion_chunks("tool_calls", ["read"])), StreamedResponse(final_chunks())]
+    client = make_client(calls, responses, tool_router=router, completion_cache=CompletionCache())
+
+    client.get_completion([Message(role=Role.USER, content="read it")], stream=True)
+
+    assert router.selections == 2
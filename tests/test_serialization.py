@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from task.models.context_window import ContextWindow
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+from task.serialization import RequestEncoder
+
+TOOLS = [
+    {"type": "function", "function": {"name": name, "description": f"{name} tool", "parameters": {"type": "object"}}}
+    for name in ("get_user_by_id", "search_users", "web_search_tool")
+]
+
+
+def full_request(messages: list[Message], tools: list[dict] | None = TOOLS, stream: bool = False) -> dict:
+    request = {"messages": [message.to_dict() for message in messages]}
+    if tools:
+        request["tools"] = tools
+    if stream:
+        request.update(stream=True, stream_options={"include_usage": True})
+    return request
+
+
+def conversation_turn(number: int) -> list[Message]:
+    call_id = f"call_{number}"
+    return [
+        Message(role=Role.USER, content=f"Find user {number} — ünïcödé " + "details " * 100),
+        Message(role=Role.AI, content="", tool_calls=[ToolCall(id=call_id, name="get_user_by_id", arguments="{}")]),
+        Message(role=Role.TOOL, content="user " * 200, tool_call_id=call_id, name="get_user_by_id"),
+        Message(role=Role.AI, content=f"Here is user {number}"),
+    ]
+
+
+@pytest.mark.parametrize("fast_json", [True, False])
+def test_incremental_encoding_matches_full_encoding(fast_json):
+    encoder = RequestEncoder(TOOLS, fast_json=fast_json)
+    messages = [Message(role=Role.SYSTEM, content="system")]
+
+    for number in range(5):
+        messages += conversation_turn(number)
+        assert json.loads(encoder.encode(messages)) == full_request(messages)
+    assert json.loads(encoder.encode(messages, stream=True)) == full_request(messages, stream=True)
+
+
+def test_encoding_is_byte_identical_to_json_dumps():
+    encoder = RequestEncoder(TOOLS, fast_json=False)
+    messages = [Message(role=Role.SYSTEM, content="system"), *conversation_turn(1)]
+    encoder.encode(messages[:2])
+
+    expected = json.dumps(full_request(messages, stream=True), separators=(",", ":"), ensure_ascii=False)
+    assert encoder.encode(messages, stream=True) == expected.encode("utf-8")
+
+
+def test_encoding_after_context_window_drops_turns():
+    encoder = RequestEncoder(TOOLS)
+    window = ContextWindow(max_tokens=1500)
+    messages = [Message(role=Role.SYSTEM, content="system")]
+
+    for number in range(5):
+        messages += conversation_turn(number)
+        fitted = window.fit(messages)
+        assert json.loads(encoder.encode(fitted)) == full_request(fitted)
+    assert len(fitted) < len(messages)
+
+
+def test_tool_subsets():
+    encoder = RequestEncoder(TOOLS)
+    messages = [Message(role=Role.USER, content="hi")]
+
+    assert json.loads(encoder.encode(messages, tool_names=["search_users"])) == full_request(messages, TOOLS[1:2])
+    assert json.loads(encoder.encode(messages, tool_names=[])) == full_request(messages, None)
+    assert json.loads(RequestEncoder([]).encode(messages)) == full_request(messages, None)
@@ -0,0 +1,103 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from task.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_with_same_key_run_once():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return "user"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.do("key", call)))
+    leader.start()
+    started.wait()
+    followers = [threading.Thread(target=lambda: results.append(flights.do("key", call))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert results == ["user"] * 5
+    assert len(calls) == 1
+    assert flights.stats.calls == 1 and flights.stats.coalesced == 4
+
+
+def test_exception_reaches_caller_and_key_is_released():
+    flights = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flights.do("key", fail)
+    assert flights.do("key", lambda: "ok") == "ok"
+
+
+def test_async_calls_with_same_key_run_once():
+    async def main():
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "user"
+
+        results = await asyncio.gather(*(flights.do("key", call) for _ in range(5)))
+        return results, calls, flights.stats
+
+    results, calls, stats = asyncio.run(main())
+
+    assert results == ["user"] * 5
+    assert len(calls) == 1
+    assert stats.calls == 1 and stats.coalesced == 4
+
+
+def test_async_cancelled_leader_does_not_cancel_followers():
+    async def main():
+        flights = AsyncSingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.02)
+            return "user"
+
+        leader = asyncio.create_task(flights.do("key", call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("key", call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await follower, leader.cancelled()
+
+    assert asyncio.run(main()) == ("user", True)
+
+
+def test_async_exception_reaches_every_caller_and_key_is_released():
+    async def main():
+        flights = AsyncSingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(flights.do("key", fail), flights.do("key", fail), return_exceptions=True)
+
+        async def succeed():
+            return "ok"
+
+        return results, await flights.do("key", succeed)
+
+    results, retried = asyncio.run(main())
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert retried == "ok"
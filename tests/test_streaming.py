@@ -0,0 +1,41 @@
+from task.models.message import ToolCall
+from task.streaming import ToolCallAssembler, iter_sse_events
+
+
+def test_tool_call_is_complete_when_next_index_starts():
+    assembler = ToolCallAssembler()
+
+    assert assembler.add([{"index": 0, "id": "call_1", "function": {"name": "search_", "arguments": ""}}]) == []
+    assert assembler.add([{"index": 0, "function": {"name": "users", "arguments": '{"name": '}}]) == []
+    assert assembler.add([{"index": 0, "function": {"arguments": '"John"}'}}]) == []
+
+    completed = assembler.add([{"index": 1, "id": "call_2", "function": {"name": "get_user_by_id"}}])
+    assert completed == [ToolCall(id="call_1", name="search_users", arguments='{"name": "John"}')]
+
+    assembler.add([{"index": 1, "function": {"arguments": '{"id": 1}'}}])
+    assert assembler.finish() == [ToolCall(id="call_2", name="get_user_by_id", arguments='{"id": 1}')]
+    assert assembler.finish() == []
+    assert [tool_call.id for tool_call in assembler.tool_calls] == ["call_1", "call_2"]
+
+
+def test_several_calls_in_one_chunk():
+    assembler = ToolCallAssembler()
+
+    completed = assembler.add([
+        {"index": 0, "id": "call_1", "function": {"name": "a", "arguments": "{}"}},
+        {"index": 1, "id": "call_2", "function": {"name": "b", "arguments": "{}"}},
+    ])
+
+    assert [tool_call.name for tool_call in completed] == ["a"]
+    assert [tool_call.name for tool_call in assembler.finish()] == ["b"]
+
+
+def test_finish_without_tool_calls():
+    assert ToolCallAssembler().finish() == []
+    assert ToolCallAssembler().tool_calls == []
+
+
+def test_iter_sse_events_stops_at_done():
+    lines = ["", ": keep-alive", 'data: {"a": 1}', "data:{\"b\": 2}", "data: [DONE]", 'data: {"c": 3}']
+
+    assert list(iter_sse_events(lines)) == [{"a": 1}, {"b": 2}]
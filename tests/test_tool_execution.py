@@ -0,0 +1,68 @@
+import pytest
+
+from task.client import DialClient, group_tool_calls
+from task.models.message import Message, ToolCall
+from task.models.role import Role
+from tests.fakes import SlowTool, StreamedResponse, completion_chunks, final_chunks
+
+
+def tool_calls(*names: str) -> list[ToolCall]:
+    return [ToolCall(id=f"call_{i}", name=name, arguments="{}") for i, name in enumerate(names)]
+
+
+def make_client(tools: list[SlowTool], **options) -> DialClient:
+    return DialClient(endpoint="http://dial.invalid", deployment_name="test", api_key="key", tools=tools, **options)
+
+
+def test_group_tool_calls_splits_stages_at_writes():
+    calls = tool_calls("read", "read", "write", "read", "write", "write", "read")
+
+    assert group_tool_calls(calls) == [[0, 1, 2, 3, 4, 5, 6]]
+    assert group_tool_calls(calls, lambda call: call.name == "write") == [[0, 1], [2], [3], [4], [5], [6]]
+
+
+def test_reads_after_a_write_wait_for_it():
+    events = []
+    client = make_client([SlowTool("read", False, events), SlowTool("write", True, events)])
+
+    messages = client._process_tool_calls(tool_calls("read", "write", "read"))
+
+    assert events == ["start:read", "end:read", "start:write", "end:write", "start:read", "end:read"]
+    assert [message.tool_call_id for message in messages] == ["call_0", "call_1", "call_2"]
+
+
+def test_reads_around_writes_run_concurrently_without_serialization():
+    events = []
+    client = make_client(
+        [SlowTool("read", False, events), SlowTool("write", True, events)], serialize_mutating_tools=False
+    )
+
+    client._process_tool_calls(tool_calls("read", "write", "read"))
+
+    assert sorted(events[:3]) == ["start:read", "start:read", "start:write"]
+
+
+def test_streamed_reads_after_a_write_wait_for_it():
+    events = []
+    client = make_client([SlowTool("read", False, events), SlowTool("write", True, events)])
+    responses = [
+        StreamedResponse(completion_chunks("tool_calls", ["read", "write", "read"])),
+        StreamedResponse(final_chunks())
+    ]
+    client._post_completion = lambda messages, deadline, **kwargs: responses.pop(0)
+    messages = [Message(role=Role.USER, content="go")]
+
+    client.get_completion(messages, stream=True)
+
+    assert events == ["start:read", "end:read", "start:write", "end:write", "start:read", "end:read"]
+    assert [message.tool_call_id for message in messages[2:]] == ["call_0", "call_1", "call_2"]
+
+
+@pytest.mark.parametrize("limit", [1, 2])
+def test_tool_concurrency_limits_cap_parallel_executions(limit):
+    tool = SlowTool("read", False, [], delay=0.02)
+    client = make_client([tool], tool_concurrency_limits={"read": limit})
+
+    client._process_tool_calls(tool_calls(*["read"] * 6))
+
+    assert tool.peak_concurrency == limit
@@ -0,0 +1,22 @@
+import re
+
+import pytest
+
+from task.prompts import SYSTEM_PROMPT
+from task.tools.toolset import build_tools
+from task.tools.users.mirror import UserMirror
+from task.tools.users.user_client import UserClient
+
+PROMPT_TOOLS = set(re.findall(r"^\d+\. \*\*(\w+)\*\*", SYSTEM_PROMPT, flags=re.MULTILINE))
+
+
+@pytest.mark.parametrize("with_mirror", [False, True])
+def test_built_tools_match_the_system_prompt(with_mirror):
+    mirror = UserMirror("http://users.invalid", refresh_interval=None) if with_mirror else None
+
+    tools = build_tools(UserClient("http://users.invalid", mirror=mirror), mirror, "key", "http://dial.invalid")
+
+    expected = PROMPT_TOOLS if with_mirror else PROMPT_TOOLS - {"fuzzy_search_users"}
+    assert sorted(tool.name for tool in tools) == sorted(expected)
+    for tool in tools:
+        tool.close()
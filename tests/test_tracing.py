@@ -0,0 +1,61 @@
+from task.models.message import Message
+from task.models.role import Role
+from task.tracing import InMemoryExporter, Tracer, summarize, tool_error
+from tests.fakes import StreamedResponse, completion_chunks, final_chunks, make_client
+
+
+def test_child_spans_share_trace_and_parent():
+    exporter = InMemoryExporter()
+    tracer = Tracer([exporter])
+
+    with tracer.span("turn", conversation_id="c1"):
+        with tracer.span("llm_round") as llm_round:
+            llm_round.set(prompt_tokens=10)
+
+    llm_round, turn = exporter.spans
+    assert llm_round.trace_id == turn.trace_id and llm_round.parent_id == turn.span_id
+    assert turn.attributes == {"conversation_id": "c1"}
+
+
+def test_tool_error_recognizes_error_results():
+    assert tool_error("Error while searching users: timeout\ndetails") == "Error while searching users: timeout"
+    assert tool_error("Unknown function: nope") == "Unknown function: nope"
+    assert tool_error("Found 2 users") is None
+
+
+def test_summarize_does_not_count_streamed_tool_time_twice():
+    spans = [
+        {"name": "turn", "trace_id": "t", "span_id": "1", "parent_id": None, "duration": 3.0, "attributes": {}},
+        {"name": "llm_round", "trace_id": "t", "span_id": "2", "parent_id": "1", "duration": 2.0, "attributes": {}},
+        {"name": "tool_call", "trace_id": "t", "span_id": "3", "parent_id": "2", "duration": 1.5, "error": None},
+        {"name": "tool_call", "trace_id": "t", "span_id": "4", "parent_id": "1", "duration": 0.5, "error": "Error: 500"},
+    ]
+
+    turn, = summarize(spans)
+
+    assert turn["llm_time"] == 2.0
+    assert turn["tool_time"] == 0.5 and turn["overlapped_tool_time"] == 1.5
+    assert turn["tool_calls"] == 2 and turn["tool_errors"] == 1
+
+
+def test_turn_accepts_trace_attributes_named_like_client_ones(calls):
+    exporter = InMemoryExporter()
+    client = make_client(calls, [StreamedResponse(final_chunks())], tracer=Tracer([exporter]))
+
+    client.get_completion(
+        [Message(role=Role.USER, content="hi")], stream=True, trace_attributes={"stream": "x", "conversation_id": "c"}
+    )
+
+    turn = next(span for span in exporter.spans if span.name == "turn")
+    assert turn.attributes["stream"] is True and turn.attributes["conversation_id"] == "c"
+
+
+def test_tool_error_results_are_recorded_on_span(calls):
+    exporter = InMemoryExporter()
+    responses = [StreamedResponse(completion_chunks("tool_calls", ["missing"])), StreamedResponse(final_chunks())]
+    client = make_client(calls, responses, tracer=Tracer([exporter]))
+
+    client.get_completion([Message(role=Role.USER, content="hi")], stream=True)
+
+    tool_span = next(span for span in exporter.spans if span.name == "tool_call")
+    assert tool_span.error == "Unknown function: missing"
@@ -0,0 +1,59 @@
+import pytest
+
+from benchmarks.stand_in_server import StandInServer
+from task.client import DialClient, TurnBudgetExceeded
+from task.models.message import Message
+from task.models.role import Role
+from task.transport import HttpTransport
+from tests.fakes import RecordingTool
+
+
+def assert_complete_rounds(messages: list[Message], rounds: int) -> None:
+    """History holds the user message and every finished round: assistant tool calls followed by their results"""
+    assert [message.role for message in messages] == [Role.USER] + [Role.AI, Role.TOOL] * rounds
+    for assistant, tool in zip(messages[1::2], messages[2::2]):
+        assert tool.tool_call_id == assistant.tool_calls[0].id
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_round_cap_raises_with_partial_history(calls, stream):
+    with StandInServer(tool_rounds=5) as server, HttpTransport() as transport:
+        client = DialClient(
+            endpoint=server.url,
+            deployment_name="gpt-4o",
+            api_key="key",
+            tools=[RecordingTool("get_user_by_id", False, calls)],
+            transport=transport,
+            max_tool_rounds=2
+        )
+        messages = [Message(role=Role.USER, content="go")]
+
+        with pytest.raises(TurnBudgetExceeded, match="more than 2 tool rounds") as exc_info:
+            client.get_completion(messages, print_request=False, stream=stream)
+        client.close()
+
+    assert exc_info.value.rounds == 2
+    assert calls == ["get_user_by_id"] * 2
+    assert_complete_rounds(messages, 2)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_deadline_raises_with_partial_history(calls, stream):
+    with StandInServer(tool_rounds=50, latency=0.05) as server, HttpTransport() as transport:
+        client = DialClient(
+            endpoint=server.url,
+            deployment_name="gpt-4o",
+            api_key="key",
+            tools=[RecordingTool("get_user_by_id", False, calls)],
+            transport=transport,
+            turn_timeout=0.3
+        )
+        messages = [Message(role=Role.USER, content="go")]
+
+        with pytest.raises(TurnBudgetExceeded, match="deadline") as exc_info:
+            client.get_completion(messages, print_request=False, stream=stream)
+        client.close()
+
+    assert 1 <= exc_info.value.rounds < 50
+    assert exc_info.value.elapsed >= 0.3
+    assert_complete_rounds(messages, exc_info.value.rounds)
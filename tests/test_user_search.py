@@ -0,0 +1,72 @@
+from typing import Any
+
+from task.tools.users.rendering import TableRenderer
+from task.tools.users.user_client import UserClient, UserSearchCache, render_search_page
+
+USERS = [{"id": number, "name": f"User{number}", "email": f"user{number}@example.com"} for number in range(1, 6)]
+
+
+class FakeResponse:
+
+    def __init__(self, status_code: int, payload: Any):
+        self.status_code = status_code
+        self.__payload = payload
+        self.text = str(payload)
+
+    def json(self) -> Any:
+        return self.__payload
+
+
+class RecordingTransport:
+
+    def __init__(self):
+        self.searches: list[dict[str, str]] = []
+
+    def get(self, url: str, headers: dict[str, str], params: dict[str, str] | None = None) -> FakeResponse:
+        self.searches.append(params)
+        return FakeResponse(200, USERS[:2])
+
+
+def test_cache_key_ignores_case_whitespace_and_empty_params():
+    assert UserSearchCache.key({"name": " John ", "email": None}) == UserSearchCache.key({"name": "john", "email": ""})
+    assert UserSearchCache.key({"name": "John"}) != UserSearchCache.key({"surname": "John"})
+
+
+def test_search_sends_original_values_and_caches_by_normalized_key():
+    transport = RecordingTransport()
+    client = UserClient(endpoint="http://users.invalid", transport=transport)
+
+    client.search_users(name="John", gender=None)
+    client.search_users(name=" john")
+
+    assert transport.searches == [{"name": "John"}]
+    assert client.search_cache.stats.hits == 1
+
+
+def test_mutation_invalidates_cached_searches():
+    cache = UserSearchCache()
+    generation = cache.generation
+    cache.set({"name": "John"}, USERS, generation)
+    cache.invalidate()
+    cache.set({"name": "Mary"}, USERS, generation)
+
+    assert cache.get({"name": "John"}) is None
+    assert cache.get({"name": "Mary"}) is None
+
+
+def test_render_search_page_headers():
+    renderer = TableRenderer()
+
+    assert render_search_page(USERS, None, 0, None, renderer).startswith("Found 5 users:\n")
+    assert render_search_page(USERS, 2, 0, None, renderer).startswith(
+        "Found 5 users, showing 1-2 (pass offset=2 for more):\n"
+    )
+    assert render_search_page(USERS, 2, 4, None, renderer).startswith("Found 5 users, showing 5-5:\n")
+    assert render_search_page(USERS, 2, 9, None, renderer) == "Found 5 users, none at offset 9\n"
+    assert render_search_page([], 2, 0, None, renderer) == "Found 0 users\n"
+
+
+def test_render_search_page_projects_fields_with_id():
+    page = render_search_page(USERS, 1, 0, ["email"], TableRenderer())
+
+    assert page.splitlines()[1:] == ["id\temail", "1\tuser1@example.com"]
@@ -0,0 +1,25 @@
+import pytest
+import requests
+
+from task.resilience import CircuitOpenError
+from task.tools.web_search import WebSearchTool
+
+
+class FailingTransport:
+
+    def __init__(self, error: Exception):
+        self.__error = error
+
+    def post(self, **kwargs):
+        raise self.__error
+
+
+@pytest.mark.parametrize("error", [
+    CircuitOpenError("http://dial", retry_in=5.0),
+    requests.ConnectionError("connection refused"),
+    requests.Timeout("read timed out"),
+])
+def test_transport_errors_are_returned_as_tool_errors(error):
+    tool = WebSearchTool(api_key="key", endpoint="http://dial", transport=FailingTransport(error))
+
+    assert tool.execute({"request": "Andrej Karpathy"}) == f"Error: {error}"